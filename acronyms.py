@@ -0,0 +1,202 @@
+"""
+Пошук вимовних акронімів.
+
+Фрази можна переставляти, а для кожної фрази — брати першу літеру будь-якого
+її змістовного слова. Перебір у глибину з відсіканням (branch and bound):
+гілка живе, поки рядок є початком слова зі словника або лишається вимовним
+(без трьох приголосних чи трьох голосних поспіль), і відкидається, якщо вже
+не може перевершити знайдений варіант. Спершу перебираються префікси, з
+яких починається найбільше слів. Перебір обмежено кількістю вузлів
+(кроків і звернень до словника), а не часом, тож результат не залежить від
+навантаження машини; переставляється не більше MAX_PHRASES фраз.
+Результати кешуються за мультимножиною літер, тож однакові набори фраз у
+будь-якому порядку рахуються один раз.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from lexicon import Lexicon
+
+VOWELS = frozenset('аеєиіїоуюя')
+
+# Оцінки варіантів: слово зі словника > вимовний рядок (+ довжина збігу з початком слова)
+WORD_SCORE = 1000
+PRONOUNCEABLE_SCORE = 100
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+@lru_cache(maxsize=8192)
+def phrase_letters(phrase: str, max_options: int = 3) -> Tuple[str, ...]:
+    """Можливі перші літери фрази: від перших слів (довших за дві літери), без повторів"""
+    words = _WORD_RE.findall(phrase.lower())
+    letters: List[str] = []
+    for word in [word for word in words if len(word) > 2] or words:
+        if word[0] not in letters:
+            letters.append(word[0])
+            if len(letters) == max_options:
+                break
+    return tuple(letters)
+
+
+def _run_ok(text: str) -> bool:
+    """Кінець рядка вимовний: останні три літери не всі приголосні й не всі голосні"""
+    tail = text[-3:]
+    if len(tail) < 3:
+        return True
+    vowels = sum(char in VOWELS for char in tail)
+    return 0 < vowels < 3
+
+
+def is_pronounceable(text: str) -> bool:
+    return all(_run_ok(text[:end]) for end in range(3, len(text) + 1))
+
+
+# Більше фраз акронім не охоплює: і перебір, і запам'ятовування ростуть з довжиною
+MAX_PHRASES = 6
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class AcronymSearch:
+    """Пошук акроніма з перестановками фраз у межах бюджету вузлів, з кешем за набором літер"""
+
+    def __init__(self, lexicon: Lexicon, max_nodes: int = 250, max_phrases: int = MAX_PHRASES,
+                 cache_size: int = 2048):
+        self.lexicon = lexicon
+        self.max_nodes = max_nodes
+        self.max_phrases = max_phrases
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: 'OrderedDict[Tuple[Tuple[str, ...], ...], Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(self, phrases: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Найкращий акронім для фраз: {'acronym', 'letters', 'order', 'is_word',
+        'pronounceable', 'complete'}, де order — індекси фраз у порядку літер,
+        а complete=False означає, що перебір зупинив бюджет вузлів. Переставляються
+        лише перші max_phrases фраз з літерами: кількість порядків росте як n!.
+        """
+        options = [(i, phrase_letters(phrase)) for i, phrase in enumerate(phrases)]
+        options = [item for item in options if item[1]][:self.max_phrases]
+        if len(options) < 2:
+            return None
+
+        # Канонічний порядок: той самий набір літер дає той самий ключ кешу
+        options.sort(key=lambda item: item[1])
+        key = tuple(letters for _, letters in options)
+        with self._lock:
+            found = self._cache.get(key)
+            if found is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if found is None:
+            found = self._search(key)
+            with self._lock:
+                self._cache[key] = found
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        result = dict(found)
+        result['order'] = [options[position][0] for position in found['order']]
+        result['letters'] = list(found['letters'])
+        return result
+
+    def _search(self, options: Tuple[Tuple[str, ...], ...]) -> Dict[str, Any]:
+        lexicon = self.lexicon
+        count = len(options)
+        # Бюджет рахує і відвідані вузли, і звернення до словника — найдорожчу частину перебору
+        nodes = 0
+        prefix_ranges: Dict[str, Tuple[int, int]] = {'': (0, len(lexicon))}
+
+        def spend() -> None:
+            nonlocal nodes
+            nodes += 1
+            if nodes > self.max_nodes:
+                raise _BudgetExceeded
+
+        def words_with_prefix(prefix: str) -> int:
+            # Той самий префікс дають різні порядки фраз — словник питаємо один раз,
+            # і лише в межах діапазону префікса, коротшого на літеру
+            found = prefix_ranges.get(prefix)
+            if found is None:
+                spend()
+                within = prefix_ranges[prefix[:-1]] if len(prefix) > 1 else None
+                found = prefix_ranges[prefix] = lexicon.prefix_range(prefix, within)
+            return found[1] - found[0]
+
+        # Початковий варіант — перші літери в канонічному порядку; він є завжди
+        plain = ''.join(letters[0] for letters in options)
+        best_score = self._score(plain, plain in lexicon)
+        best: Tuple[str, Tuple[int, ...]] = (plain, tuple(range(count)))
+
+        def visit(text: str, used: int, order: Tuple[int, ...], alive: bool, matched: int) -> None:
+            nonlocal best, best_score
+            spend()
+            if len(order) == count:
+                score = self._score(text, alive and text in lexicon, matched)
+                if score > best_score:
+                    best_score, best = score, (text, order)
+                return
+            # Межа: живий префікс ще може стати словом, інакше оцінка вже не зросте
+            if (WORD_SCORE if alive else PRONOUNCEABLE_SCORE + matched) <= best_score:
+                return
+
+            branches = []
+            for position in range(count):
+                if used & (1 << position):
+                    continue
+                # Однакові набори літер взаємозамінні — беремо перший вільний
+                if position > 0 and options[position] == options[position - 1] and not used & (1 << (position - 1)):
+                    continue
+                for letter in options[position]:
+                    candidate = text + letter
+                    frequency = words_with_prefix(candidate) if alive else 0
+                    if not frequency and not _run_ok(candidate):
+                        continue
+                    alternates = not text or ((text[-1] in VOWELS) != (letter in VOWELS))
+                    branches.append((-frequency, not alternates, position, candidate))
+            # Спершу префікси, з яких починається найбільше слів: добрий варіант знаходиться рано
+            branches.sort()
+            for negative_frequency, _, position, candidate in branches:
+                candidate_alive = negative_frequency < 0
+                visit(candidate, used | (1 << position), order + (position,), candidate_alive,
+                      len(candidate) if candidate_alive else matched)
+
+        complete = True
+        try:
+            visit('', 0, (), True, 0)
+        except _BudgetExceeded:
+            complete = False
+
+        text, order = best
+        return {
+            'acronym': text.upper(),
+            'letters': tuple(char.upper() for char in text),
+            'order': order,
+            'is_word': text in lexicon,
+            'pronounceable': is_pronounceable(text),
+            'complete': complete,
+        }
+
+    @staticmethod
+    def _score(text: str, is_word: bool, matched: int = 0) -> int:
+        if is_word:
+            return WORD_SCORE
+        if is_pronounceable(text):
+            return PRONOUNCEABLE_SCORE + matched
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
@@ -3,13 +3,33 @@
 Підтримує: акроніми, акростихи, рими, історії, метод локуса, візуалізацію та багато інших
 """
 
+import logging
+import os
 import random
 import re
-from typing import List, Dict, Any, Tuple
+import threading
+from typing import List, Dict, Any, Callable, Hashable, Iterable, Iterator, Mapping, Optional, Tuple
 import json
 from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache, partial
+from types import MappingProxyType
+
+from acronyms import MAX_PHRASES as MAX_ACRONYM_PHRASES, AcronymSearch
+from lexicon import Lexicon, LexiconFile
+import mnemonic_templates as templates
+from mnemonic_templates import compile_templates
+from phonetics import PhoneticIndex, syllables
+from phrase_memo import PhraseMemo
+from rhymes import RhymeIndex
+
+
+# Версія генератора: входить у ключі кешів, тож її треба змінювати разом
+# з будь-якою зміною, що впливає на результат
+GENERATOR_VERSION = '2.7'
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -34,6 +54,7 @@ class MnemonicTechnique(Enum):
     PHONETIC = "phonetic"
     METAPHOR = "metaphor"
     ALLITERATION = "alliteration"
+    POEM = "poem"
     CHUNKING = "chunking"
     SUBSTITUTION = "substitution"
     CIPHER = "cipher"
@@ -41,275 +62,498 @@ class MnemonicTechnique(Enum):
     PALINDROME = "palindrome"
 
 
-class MnemonicGenerator:
-    def __init__(self):
-        print("🧠 Ініціалізація потужного генератора мнемонік...")
-        
-        self.mnemonic_techniques = {
-            'acronym': {'name': 'Акроніми', 'description': 'Слово з перших літер'},
-            'acrostic': {'name': 'Акростихи', 'description': 'Вірш для запам\'ятовування'},
-            'rhyme': {'name': 'Рими', 'description': 'Римовані правила'},
-            'story': {'name': 'Асоціативні історії', 'description': 'Яскраві історії'},
-            'loci': {'name': 'Палац пам\'яті', 'description': 'Метод локуса'},
-            'visual': {'name': 'Візуалізація', 'description': 'Ментальні образи'},
-            'number': {'name': 'Числові асоціації', 'description': 'Число-образ зв\'язок'},
-            'phonetic': {'name': 'Фонетична мнеміка', 'description': 'Звукові аналогії'},
-            'metaphor': {'name': 'Метафори', 'description': 'Образні порівняння'},
-            'alliteration': {'name': 'Алітерація', 'description': 'Однакові звуки'},
-            'chunking': {'name': 'Групування', 'description': 'Розбиття на групи'},
-            'substitution': {'name': 'Заміна', 'description': 'Заміна на образи'},
-            'cipher': {'name': 'Шифр', 'description': 'Шифровані коди'},
-            'association': {'name': 'Асоціація', 'description': 'Зв\'язок понять'},
-            'palindrome': {'name': 'Паліндромія', 'description': 'Дзеркальні слова'},
-        }
-        
-        self.word_base = self._load_word_base()
-        self.rhyme_patterns = self._load_rhyme_patterns()
-        self.story_templates = self._load_story_templates()
-        self.metaphor_base = self._load_metaphor_base()
-        self.poem_templates = self._load_poem_templates()
-        self.alliteration_words = self._load_alliteration_words()
-        self.cipher_rules = self._load_cipher_rules()
-        
-        print("✅ Генератор успішно ініціалізовано! 15+ техник готові до роботи")
-    
-    def _load_word_base(self):
-        """Розширена база слів"""
-        return {
-            'nouns': [
-                'сонце', 'місяць', 'зірка', 'хмара', 'дощ', 'вітер', 'гора',
-                'ріка', 'ліс', 'поле', 'квітка', 'дерево', 'будинок', 'кімната',
-                'стіл', 'стілець', 'книга', 'олівець', 'папір', 'світло', 'озеро',
-                'берег', 'острів', 'море', 'хвиля', 'пісок', 'скала', 'печера',
-                'замок', 'міст', 'сходи', 'ворота', 'вікно', 'двері', 'дах',
-                'стіна', 'коридор', 'сад', 'парк', 'площа', 'вулиця', 'місто',
-                'село', 'долина', 'схил', 'вершина', 'ущелина', 'грот', 'бурлива',
-                'ручей', 'водопад', 'джерело', 'колодець', 'криниця', 'басейн'
-            ],
-            'verbs': [
-                'біжить', 'летить', 'пливе', 'стоїть', 'лежить', 'спить',
-                'говорить', 'чує', 'бачить', 'знає', 'розуміє', 'вчить',
-                'пам\'ятає', 'згадує', 'думає', 'уявляє', 'створює', 'будує',
-                'танцює', 'співає', 'сміється', 'плаче', 'кричить', 'шепоче',
-                'стрибає', 'падає', 'піднімається', 'сідає', 'встає', 'йде',
-                'їжджає', 'їзде', 'їсть', 'пиває', 'грає', 'праці', 'записує',
-                'читає', 'слухає', 'дивиться', 'показує', 'учить', 'питає'
-            ],
-            'adjectives': [
-                'великий', 'маленький', 'яскравий', 'темний', 'швидкий',
-                'повільний', 'мудрий', 'цікавий', 'важливий', 'основний',
-                'головний', 'перший', 'останній', 'середній', 'спеціальний',
-                'гарний', 'потворний', 'приємний', 'гидкий', 'смачний',
-                'товстий', 'тонкий', 'довгий', 'короткий', 'широкий',
-                'вузький', 'високий', 'низький', 'гарячий', 'холодний',
-                'теплий', 'сухий', 'вологий', 'гладкий', 'шорсткий',
-                'гарний', 'потворний', 'сильний', 'слабий', 'чорний', 'білий'
-            ],
-            'acronym_words': [
-                'СОНЦЕ', 'ВІТЕР', 'ГРАФІК', 'МОДУЛЬ', 'СИСТЕМА', 'ФОРМУЛА',
-                'ТЕМП', 'РИТМ', 'КОД', 'ЗНАК', 'СИМВОЛ', 'ОБРАЗ', 'ПЛАН',
-                'МРІЯ', 'УСПІХ', 'ВЕРШИНА', 'ДОРОГА', 'ЛІС', 'РЕКА', 'ФЕРМА'
-            ],
-            'emotions': [
-                'радість', 'смуток', 'гнів', 'страх', 'любов', 'ненависть',
-                'захоплення', 'розчарування', 'сподівання', 'відчай', 'гордість'
-            ],
-            'actions': [
-                'вибухає', 'тріскає', 'блискає', 'ґвалтує', 'переливається',
-                'розкошає', 'роздирає', 'тягне', 'штовхає', 'хапає', 'кидає'
-            ]
-        }
-    
-    def _load_rhyme_patterns(self):
-        """Розширені шаблони рим"""
-        return [
-            "Щоб запам'ятати {word}, треба знати: {rhyme}",
-            "{word} - це ключ, {rhyme} - замок",
-            "Правило: {word} зв'язано з {rhyme}",
-            "Дивне але истинне: {word} → {rhyme}",
-            "{word} завжди йде з {rhyme}",
-            "Запам'ятайте: {word} і {rhyme} - пара",
-            "Фокус у тому, що {word} означає {rhyme}",
-            "{word} неможливо запам'ятати без {rhyme}"
+@dataclass(frozen=True)
+class TechniqueSpec:
+    """Опис техніки в реєстрі: ключ у результаті і метод генератора"""
+    technique: MnemonicTechnique
+    key: str
+    method: str
+    # Якщо ключових фраз немає, техніка працює з основними темами
+    fallback_to_topics: bool = False
+
+
+# Реєстр технік у порядку виведення. CIPHER поки не має генератора, тому не зареєстрований
+TECHNIQUE_REGISTRY: Dict[MnemonicTechnique, TechniqueSpec] = {
+    spec.technique: spec for spec in (
+        TechniqueSpec(MnemonicTechnique.ACRONYM, 'acronyms', '_generate_acronyms', True),
+        TechniqueSpec(MnemonicTechnique.ACROSTIC, 'acrostics', '_generate_acrostics', True),
+        TechniqueSpec(MnemonicTechnique.RHYME, 'rhymes', '_generate_rhymes'),
+        TechniqueSpec(MnemonicTechnique.STORY, 'stories', '_generate_stories'),
+        TechniqueSpec(MnemonicTechnique.LOCI, 'loci_method', '_generate_loci_method'),
+        TechniqueSpec(MnemonicTechnique.VISUAL, 'visuals', '_generate_visual_associations'),
+        TechniqueSpec(MnemonicTechnique.NUMBER, 'number_associations', '_generate_number_associations'),
+        TechniqueSpec(MnemonicTechnique.PHONETIC, 'phonetic', '_generate_phonetic_mnemonics'),
+        TechniqueSpec(MnemonicTechnique.METAPHOR, 'metaphors', '_generate_metaphors'),
+        TechniqueSpec(MnemonicTechnique.ALLITERATION, 'alliteration', '_generate_alliteration'),
+        TechniqueSpec(MnemonicTechnique.POEM, 'poems', '_generate_poems'),
+        TechniqueSpec(MnemonicTechnique.CHUNKING, 'chunking', '_generate_chunking'),
+        TechniqueSpec(MnemonicTechnique.SUBSTITUTION, 'substitution', '_generate_substitution'),
+        TechniqueSpec(MnemonicTechnique.ASSOCIATION, 'associations', '_generate_associations'),
+        TechniqueSpec(MnemonicTechnique.PALINDROME, 'palindromes', '_generate_palindromes'),
+    )
+}
+
+
+def resolve_techniques(names: Optional[Iterable[str]]) -> List[TechniqueSpec]:
+    """
+    Техніки за назвами у порядку реєстру; None — усі зареєстровані.
+
+    Назва може бути значенням MnemonicTechnique ('acronym'), його ім'ям ('ACRONYM')
+    або ключем у результаті ('acronyms').
+    """
+    if names is None:
+        return list(TECHNIQUE_REGISTRY.values())
+    if isinstance(names, str):
+        names = [names]
+
+    lookup: Dict[str, TechniqueSpec] = {}
+    for technique, spec in TECHNIQUE_REGISTRY.items():
+        lookup[technique.value] = lookup[technique.name.lower()] = lookup[spec.key] = spec
+
+    selected = set()
+    for name in names:
+        spec = lookup.get(str(name).strip().lower())
+        if spec is None:
+            raise ValueError(f"Невідома техніка мнемоніки: {name}")
+        selected.add(spec.technique)
+    return [spec for technique, spec in TECHNIQUE_REGISTRY.items() if technique in selected]
+
+
+# Довідкові дані генератора: незмінні структури рівня модуля, які будуються один
+# раз на процес при першому зверненні. Під gunicorn з preload_app це відбувається
+# в головному процесі до fork, і воркери ділять сторінки пам'яті (copy-on-write).
+
+_MNEMONIC_TECHNIQUES = {
+    'acronym': {'name': 'Акроніми', 'description': 'Слово з перших літер'},
+    'acrostic': {'name': 'Акростихи', 'description': 'Вірш для запам\'ятовування'},
+    'rhyme': {'name': 'Рими', 'description': 'Римовані правила'},
+    'story': {'name': 'Асоціативні історії', 'description': 'Яскраві історії'},
+    'loci': {'name': 'Палац пам\'яті', 'description': 'Метод локуса'},
+    'visual': {'name': 'Візуалізація', 'description': 'Ментальні образи'},
+    'number': {'name': 'Числові асоціації', 'description': 'Число-образ зв\'язок'},
+    'phonetic': {'name': 'Фонетична мнеміка', 'description': 'Звукові аналогії'},
+    'metaphor': {'name': 'Метафори', 'description': 'Образні порівняння'},
+    'alliteration': {'name': 'Алітерація', 'description': 'Однакові звуки'},
+    'poem': {'name': 'Вірші', 'description': 'Короткі вірші для запам\'ятовування'},
+    'chunking': {'name': 'Групування', 'description': 'Розбиття на групи'},
+    'substitution': {'name': 'Заміна', 'description': 'Заміна на образи'},
+    'cipher': {'name': 'Шифр', 'description': 'Шифровані коди'},
+    'association': {'name': 'Асоціація', 'description': 'Зв\'язок понять'},
+    'palindrome': {'name': 'Паліндромія', 'description': 'Дзеркальні слова'},
+}
+
+
+def _load_word_base():
+    """Розширена база слів"""
+    return {
+        'nouns': [
+            'сонце', 'місяць', 'зірка', 'хмара', 'дощ', 'вітер', 'гора',
+            'ріка', 'ліс', 'поле', 'квітка', 'дерево', 'будинок', 'кімната',
+            'стіл', 'стілець', 'книга', 'олівець', 'папір', 'світло', 'озеро',
+            'берег', 'острів', 'море', 'хвиля', 'пісок', 'скала', 'печера',
+            'замок', 'міст', 'сходи', 'ворота', 'вікно', 'двері', 'дах',
+            'стіна', 'коридор', 'сад', 'парк', 'площа', 'вулиця', 'місто',
+            'село', 'долина', 'схил', 'вершина', 'ущелина', 'грот', 'бурлива',
+            'ручей', 'водопад', 'джерело', 'колодець', 'криниця', 'басейн'
+        ],
+        'verbs': [
+            'біжить', 'летить', 'пливе', 'стоїть', 'лежить', 'спить',
+            'говорить', 'чує', 'бачить', 'знає', 'розуміє', 'вчить',
+            'пам\'ятає', 'згадує', 'думає', 'уявляє', 'створює', 'будує',
+            'танцює', 'співає', 'сміється', 'плаче', 'кричить', 'шепоче',
+            'стрибає', 'падає', 'піднімається', 'сідає', 'встає', 'йде',
+            'їжджає', 'їзде', 'їсть', 'пиває', 'грає', 'праці', 'записує',
+            'читає', 'слухає', 'дивиться', 'показує', 'учить', 'питає'
+        ],
+        'adjectives': [
+            'великий', 'маленький', 'яскравий', 'темний', 'швидкий',
+            'повільний', 'мудрий', 'цікавий', 'важливий', 'основний',
+            'головний', 'перший', 'останній', 'середній', 'спеціальний',
+            'гарний', 'потворний', 'приємний', 'гидкий', 'смачний',
+            'товстий', 'тонкий', 'довгий', 'короткий', 'широкий',
+            'вузький', 'високий', 'низький', 'гарячий', 'холодний',
+            'теплий', 'сухий', 'вологий', 'гладкий', 'шорсткий',
+            'гарний', 'потворний', 'сильний', 'слабий', 'чорний', 'білий'
+        ],
+        'acronym_words': [
+            'СОНЦЕ', 'ВІТЕР', 'ГРАФІК', 'МОДУЛЬ', 'СИСТЕМА', 'ФОРМУЛА',
+            'ТЕМП', 'РИТМ', 'КОД', 'ЗНАК', 'СИМВОЛ', 'ОБРАЗ', 'ПЛАН',
+            'МРІЯ', 'УСПІХ', 'ВЕРШИНА', 'ДОРОГА', 'ЛІС', 'РЕКА', 'ФЕРМА'
+        ],
+        'emotions': [
+            'радість', 'смуток', 'гнів', 'страх', 'любов', 'ненависть',
+            'захоплення', 'розчарування', 'сподівання', 'відчай', 'гордість'
+        ],
+        'actions': [
+            'вибухає', 'тріскає', 'блискає', 'ґвалтує', 'переливається',
+            'розкошає', 'роздирає', 'тягне', 'штовхає', 'хапає', 'кидає'
         ]
-    
-    def _load_story_templates(self):
-        """Розширені шаблони історій"""
-        return [
-            "Уявіть собі, що {items}. Це допоможе запам'ятати ключові моменти.",
-            "Одного разу {items}. Ця напол яскава історія символізує основні ідеї.",
-            "Представте світ, де {items}. Така драматична асоціація полегшує запам'ятування.",
-            "В чарівному царстві {items}. Запам'ятайте цю фантастичну історію.",
-            "Уявіть неймовірну сцену: {items}. Така емоційна картина залишиться в пам'яті.",
-            "Давайте розповідь про {items}. Ця жахлива/смішна історія завжди запам'ятається.",
-            "Переносимось у світ, де {items}. Ця експресивна історія - ваш ключ до пам'яті."
+    }
+
+
+def _load_rhyme_patterns():
+    """Розширені шаблони рим"""
+    return [
+        "Щоб запам'ятати {word}, треба знати: {rhyme}",
+        "{word} - це ключ, {rhyme} - замок",
+        "Правило: {word} зв'язано з {rhyme}",
+        "Дивне але истинне: {word} → {rhyme}",
+        "{word} завжди йде з {rhyme}",
+        "Запам'ятайте: {word} і {rhyme} - пара",
+        "Фокус у тому, що {word} означає {rhyme}",
+        "{word} неможливо запам'ятати без {rhyme}"
+    ]
+
+
+def _load_story_templates():
+    """Розширені шаблони історій"""
+    return [
+        "Уявіть собі, що {items}. Це допоможе запам'ятати ключові моменти.",
+        "Одного разу {items}. Ця напол яскава історія символізує основні ідеї.",
+        "Представте світ, де {items}. Така драматична асоціація полегшує запам'ятування.",
+        "В чарівному царстві {items}. Запам'ятайте цю фантастичну історію.",
+        "Уявіть неймовірну сцену: {items}. Така емоційна картина залишиться в пам'яті.",
+        "Давайте розповідь про {items}. Ця жахлива/смішна історія завжди запам'ятається.",
+        "Переносимось у світ, де {items}. Ця експресивна історія - ваш ключ до пам'яті."
+    ]
+
+
+def _load_metaphor_base():
+    """База метафор для образних порівнянь"""
+    return {
+        'nature': [
+            {'from': 'знання', 'to': 'яскраве сонце', 'reason': 'освітлює темноту'},
+            {'from': 'пам\'ять', 'to': 'міцний дуб', 'reason': 'сильна і стійка'},
+            {'from': 'ідея', 'to': 'летючий орел', 'reason': 'підіймає вгору'},
+            {'from': 'проблема', 'to': 'важкий камінь', 'reason': 'потребує зусилля'},
+            {'from': 'успіх', 'to': 'гірська вершина', 'reason': 'можна досягнути'},
+            {'from': 'час', 'to': 'текуча вода', 'reason': 'не зупиняється'},
+            {'from': 'любов', 'to': 'палаючий вогонь', 'reason': 'гріє душу'},
+            {'from': 'смуток', 'to': 'сірий дощ', 'reason': 'охолоджує і знеособлює'},
+            {'from': 'надія', 'to': 'перша зірка', 'reason': 'світить в темноті'},
+            {'from': 'хаос', 'to': 'бурхлива хвиля', 'reason': 'неконтрольована енергія'}
+        ],
+        'body': [
+            {'from': 'розум', 'to': 'мозок', 'reason': 'центр управління'},
+            {'from': 'сердце', 'to': 'емоції', 'reason': 'почуття'},
+            {'from': 'руки', 'to': 'дія', 'reason': 'реалізація'},
+            {'from': 'очі', 'to': 'бачення', 'reason': 'розуміння'},
+            {'from': 'вуха', 'to': 'слухання', 'reason': 'прислухання'},
+        ],
+        'abstract': [
+            {'from': 'свобода', 'to': 'простір', 'reason': 'без кордонів'},
+            {'from': 'істина', 'to': 'світло', 'reason': 'ясність'},
+            {'from': 'брехня', 'to': 'тінь', 'reason': 'прихована'},
         ]
-    
-    def _load_metaphor_base(self):
-        """База метафор для образних порівнянь"""
-        return {
-            'nature': [
-                {'from': 'знання', 'to': 'яскраве сонце', 'reason': 'освітлює темноту'},
-                {'from': 'пам\'ять', 'to': 'міцний дуб', 'reason': 'сильна і стійка'},
-                {'from': 'ідея', 'to': 'летючий орел', 'reason': 'підіймає вгору'},
-                {'from': 'проблема', 'to': 'важкий камінь', 'reason': 'потребує зусилля'},
-                {'from': 'успіх', 'to': 'гірська вершина', 'reason': 'можна досягнути'},
-                {'from': 'час', 'to': 'текуча вода', 'reason': 'не зупиняється'},
-                {'from': 'любов', 'to': 'палаючий вогонь', 'reason': 'гріє душу'},
-                {'from': 'смуток', 'to': 'сірий дощ', 'reason': 'охолоджує і знеособлює'},
-                {'from': 'надія', 'to': 'перша зірка', 'reason': 'світить в темноті'},
-                {'from': 'хаос', 'to': 'бурхлива хвиля', 'reason': 'неконтрольована енергія'}
-            ],
-            'body': [
-                {'from': 'розум', 'to': 'мозок', 'reason': 'центр управління'},
-                {'from': 'сердце', 'to': 'емоції', 'reason': 'почуття'},
-                {'from': 'руки', 'to': 'дія', 'reason': 'реалізація'},
-                {'from': 'очі', 'to': 'бачення', 'reason': 'розуміння'},
-                {'from': 'вуха', 'to': 'слухання', 'reason': 'прислухання'},
-            ],
-            'abstract': [
-                {'from': 'свобода', 'to': 'простір', 'reason': 'без кордонів'},
-                {'from': 'істина', 'to': 'світло', 'reason': 'ясність'},
-                {'from': 'брехня', 'to': 'тінь', 'reason': 'прихована'},
+    }
+
+
+def _load_poem_templates():
+    """Шаблони для стихів"""
+    return [
+        {
+            'name': 'Куплет 4/4',
+            'structure': 'ААББ',
+            'template': [
+                '{phrase1} в природі, яка мила,',
+                '{phrase2} була б дивна й смила,',
+                '{phrase3} приносить радість нам,',
+                '{phrase4} помагает знайти стан.'
+            ]
+        },
+        {
+            'name': 'Трьохрядка',
+            'structure': 'АБА',
+            'template': [
+                '{phrase1} в світі чарівному живе,',
+                '{phrase2} знання сердцю дає,',
+                '{phrase1} в пам\'яті завжди співає.'
+            ]
+        },
+        {
+            'name': 'Катрен',
+            'structure': 'АБАБ',
+            'template': [
+                '{phrase1} приходить раз на рік,',
+                '{phrase2} тріумфує в серці,',
+                '{phrase3} як яскрава та гарна,',
+                '{phrase4} важлива для нас перлина.'
+            ]
+        },
+        {
+            'name': 'Куплет 5/5',
+            'structure': 'ААБББ',
+            'template': [
+                '{phrase1} зійшла на вершину,',
+                '{phrase2} вийшла на видину,',
+                '{phrase3} летить як орлиця,',
+                '{phrase4} сяє як зірниця,',
+                '{phrase5} в пам\'яті ген запалаця.'
             ]
         }
-    
-    def _load_poem_templates(self):
-        """Шаблони для стихів"""
-        return [
-            {
-                'name': 'Куплет 4/4',
-                'structure': 'ААББ',
-                'template': [
-                    '{phrase1} в природі, яка мила,',
-                    '{phrase2} була б дивна й смила,',
-                    '{phrase3} приносить радість нам,',
-                    '{phrase4} помагает знайти стан.'
-                ]
-            },
-            {
-                'name': 'Трьохрядка',
-                'structure': 'АБА',
-                'template': [
-                    '{phrase1} в світі чарівному живе,',
-                    '{phrase2} знання сердцю дає,',
-                    '{phrase1} в пам\'яті завжди співає.'
-                ]
-            },
-            {
-                'name': 'Катрен',
-                'structure': 'АБАБ',
-                'template': [
-                    '{phrase1} приходить раз на рік,',
-                    '{phrase2} тріумфує в серці,',
-                    '{phrase3} як яскрава та гарна,',
-                    '{phrase4} важлива для нас перлина.'
-                ]
-            },
-            {
-                'name': 'Куплет 5/5',
-                'structure': 'ААБББ',
-                'template': [
-                    '{phrase1} зійшла на вершину,',
-                    '{phrase2} вийшла на видину,',
-                    '{phrase3} летить як орлиця,',
-                    '{phrase4} сяє як зірниця,',
-                    '{phrase5} в пам\'яті ген запалаця.'
-                ]
-            }
-        ]
-    
-    def _load_alliteration_words(self):
-        """Слова для алітерації (однакові звуки на початку)"""
-        return {
-            'В': ['вітер', 'вода', 'велич', 'вершина', 'вогонь', 'вибух', 'видіння'],
-            'Г': ['гора', 'гра', 'голос', 'гнів', 'герой', 'гріх', 'грім'],
-            'Д': ['дорога', 'дерево', 'дивовижа', 'дитина', 'дім', 'день', 'дума'],
-            'К': ['камень', 'корова', 'король', 'крайина', 'каша', 'кінець'],
-            'Л': ['ліс', 'луг', 'лев', 'лань', 'лампа', 'любов', 'лячек'],
-            'М': ['місяць', 'море', 'мрія', 'мудрість', 'мати', 'межа', 'монах'],
-            'П': ['поле', 'птиця', 'палац', 'повинь', 'переклад', 'подорож'],
-            'Р': ['ріка', 'розум', 'радість', 'рай', 'рожева', 'роса', 'рой'],
-            'С': ['сонце', 'снег', 'сип', 'сила', 'сад', 'совість', 'скарб'],
-            'Ш': ['школа', 'шум', 'шик', 'шлях', 'шелест', 'штиль', 'шанда'],
-            'Ч': ['човен', 'число', 'чаша', 'чудо', 'честь', 'чистота', 'чужій'],
-            'Ц': ['царство', 'циль', 'центр', 'цінність', 'ціна', 'цар'],
-            'Ю': ['юнак', 'юнь', 'юність'],
-            'З': ['зірка', 'золото', 'знання', 'загадка', 'земля', 'засіб']
+    ]
+
+
+def _load_alliteration_words():
+    """Слова для алітерації (однакові звуки на початку)"""
+    return {
+        'В': ['вітер', 'вода', 'велич', 'вершина', 'вогонь', 'вибух', 'видіння'],
+        'Г': ['гора', 'гра', 'голос', 'гнів', 'герой', 'гріх', 'грім'],
+        'Д': ['дорога', 'дерево', 'дивовижа', 'дитина', 'дім', 'день', 'дума'],
+        'К': ['камень', 'корова', 'король', 'крайина', 'каша', 'кінець'],
+        'Л': ['ліс', 'луг', 'лев', 'лань', 'лампа', 'любов', 'лячек'],
+        'М': ['місяць', 'море', 'мрія', 'мудрість', 'мати', 'межа', 'монах'],
+        'П': ['поле', 'птиця', 'палац', 'повинь', 'переклад', 'подорож'],
+        'Р': ['ріка', 'розум', 'радість', 'рай', 'рожева', 'роса', 'рой'],
+        'С': ['сонце', 'снег', 'сип', 'сила', 'сад', 'совість', 'скарб'],
+        'Ш': ['школа', 'шум', 'шик', 'шлях', 'шелест', 'штиль', 'шанда'],
+        'Ч': ['човен', 'число', 'чаша', 'чудо', 'честь', 'чистота', 'чужій'],
+        'Ц': ['царство', 'циль', 'центр', 'цінність', 'ціна', 'цар'],
+        'Ю': ['юнак', 'юнь', 'юність'],
+        'З': ['зірка', 'золото', 'знання', 'загадка', 'земля', 'засіб']
+    }
+
+
+def _load_cipher_rules():
+    """Правила для шифрів"""
+    return {
+        'numeric': {
+            'name': 'Числовий шифр',
+            'mapping': {'а': '1', 'б': '2', 'в': '3', 'г': '4', 'д': '5', 'е': '6'}
+        },
+        'substitution': {
+            'name': 'Заміна',
+            'rules': 'Замінити букви на символи'
+        },
+        'atbash': {
+            'name': 'Атбаш',
+            'rules': 'Дзеркальна заміна букв'
         }
+    }
+
+
+def _freeze(value: Any) -> Any:
+    """Незмінна копія: списки → кортежі, словники → MappingProxyType"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def static_data() -> Mapping[str, Any]:
+    """Усі довідкові дані генератора (будуються при першому виклику)"""
+    data = _freeze({
+        'mnemonic_techniques': _MNEMONIC_TECHNIQUES,
+        'word_base': _load_word_base(),
+        'rhyme_patterns': _load_rhyme_patterns(),
+        'story_templates': _load_story_templates(),
+        'metaphor_base': _load_metaphor_base(),
+        'poem_templates': _load_poem_templates(),
+        'alliteration_words': _load_alliteration_words(),
+        'cipher_rules': _load_cipher_rules(),
+    })
+    logger.info("Довідкові дані генератора мнемонік завантажено")
+    return data
+
+
+@lru_cache(maxsize=None)
+def compiled_templates() -> Mapping[str, Any]:
+    """Шаблони з довідкових даних, скомпільовані в Template один раз на процес"""
+    data = static_data()
+    return MappingProxyType({
+        'rhyme_patterns': compile_templates(data['rhyme_patterns']),
+        'poem_templates': tuple(
+            MappingProxyType(dict(poem, template=compile_templates(poem['template'])))
+            for poem in data['poem_templates']
+        ),
+    })
+
+
+# Великий словник (python lexicon.py build ...) задається шляхом у MNEMONIC_LEXICON;
+# файл відкривається через mmap і підміняється без перезапуску
+_lexicon_path = os.environ.get('MNEMONIC_LEXICON')
+_lexicon_file = LexiconFile(_lexicon_path) if _lexicon_path else None
+_lexicon_error: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def _builtin_lexicon() -> Lexicon:
+    """Словник із вбудованих слів — коли файл словника не задано або недоступний"""
+    data = static_data()
+    words = [word for group in data['word_base'].values() for word in group]
+    words.extend(word for group in data['alliteration_words'].values() for word in group)
+    return Lexicon.from_words(words)
+
+
+def lexicon() -> Lexicon:
+    """Поточний словник генератора"""
+    global _lexicon_error
+    if _lexicon_file is not None:
+        try:
+            return _lexicon_file.current()
+        except (OSError, ValueError) as e:
+            if str(e) != _lexicon_error:
+                _lexicon_error = str(e)
+                logger.warning("Словник %s недоступний, використовуємо вбудований: %s", _lexicon_path, e)
+    return _builtin_lexicon()
+
+
+# Словник рим — той самий формат, побудований з --reverse (MNEMONIC_RHYME_LEXICON)
+_rhyme_path = os.environ.get('MNEMONIC_RHYME_LEXICON')
+_rhyme_file = LexiconFile(_rhyme_path) if _rhyme_path else None
+_rhyme_error: Optional[str] = None
+_rhyme_index: Optional[RhymeIndex] = None
+
+
+@lru_cache(maxsize=None)
+def _builtin_rhyme_index() -> RhymeIndex:
+    """Індекс рим на словах вбудованого словника"""
+    builtin = _builtin_lexicon()
+    return RhymeIndex.from_words(builtin.word(i) for i in range(len(builtin)))
+
+
+def rhyme_index() -> RhymeIndex:
+    """Поточний індекс рим; після заміни файлу словника кеш закінчень починається заново"""
+    global _rhyme_error, _rhyme_index
+    if _rhyme_file is not None:
+        try:
+            reversed_lexicon = _rhyme_file.current()
+        except (OSError, ValueError) as e:
+            if str(e) != _rhyme_error:
+                _rhyme_error = str(e)
+                logger.warning("Словник рим %s недоступний, використовуємо вбудований: %s", _rhyme_path, e)
+        else:
+            index = _rhyme_index
+            if index is None or index.lexicon is not reversed_lexicon:
+                index = _rhyme_index = RhymeIndex(reversed_lexicon)
+            return index
+    return _builtin_rhyme_index()
+
+
+_phonetic_index: Optional[PhoneticIndex] = None
+_phonetic_lock = threading.Lock()
+
+
+def phonetic_index() -> PhoneticIndex:
+    """Фонетичний індекс поточного словника; перебудовується після заміни файлу словника"""
+    global _phonetic_index
+    current = lexicon()
+    index = _phonetic_index
+    if index is None or index.lexicon is not current:
+        with _phonetic_lock:
+            index = _phonetic_index
+            if index is None or index.lexicon is not current:
+                index = PhoneticIndex.from_lexicon(current)
+                _phonetic_index = index
+                logger.info("Фонетичний індекс: %d ключів", len(index))
+    return index
+
+
+_acronym_search: Optional[AcronymSearch] = None
+
+
+def acronym_search() -> AcronymSearch:
+    """Пошук акронімів по поточному словнику; кеш починається заново після заміни словника"""
+    global _acronym_search
+    current = lexicon()
+    search = _acronym_search
+    if search is None or search.lexicon is not current:
+        search = _acronym_search = AcronymSearch(current)
+    return search
+
+
+def preload() -> None:
+    """Завантаження довідкових даних наперед — у головному процесі до fork воркерів"""
+    static_data()
+    compiled_templates()
+    lexicon()
+    rhyme_index()
+    # BK-дерева і пошук акронімів теж створюються тут, а не під час першого запиту у воркері
+    phonetic_index().build_trees()
+    acronym_search()
+
+
+class _StaticField:
+    """Атрибут генератора, що читає спільні довідкові дані модуля"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        return static_data()[self.name]
+
+
+class MnemonicGenerator:
+    """Генератор мнемонік; довідкові дані спільні для всіх екземплярів процесу"""
+
+    mnemonic_techniques = _StaticField()
+    word_base = _StaticField()
+    rhyme_patterns = _StaticField()
+    story_templates = _StaticField()
+    metaphor_base = _StaticField()
+    poem_templates = _StaticField()
+    alliteration_words = _StaticField()
+    cipher_rules = _StaticField()
     
-    def _load_cipher_rules(self):
-        """Правила для шифрів"""
-        return {
-            'numeric': {
-                'name': 'Числовий шифр',
-                'mapping': {'а': '1', 'б': '2', 'в': '3', 'г': '4', 'д': '5', 'е': '6'}
-            },
-            'substitution': {
-                'name': 'Заміна',
-                'rules': 'Замінити букви на символи'
-            },
-            'atbash': {
-                'name': 'Атбаш',
-                'rules': 'Дзеркальна заміна букв'
-            }
-        }
+    # Результати технік для окремих фраз, спільні для всіх запитів процесу
+    memo = PhraseMemo(int(os.environ.get('MNEMONIC_MEMO_ENTRIES', 50000)), GENERATOR_VERSION)
+    _memo_lexicon: Optional[Lexicon] = None
     
+    def __init__(self, seed: Optional[int] = None):
+        # Із зерном однакові вхідні дані дають однаковий результат (і його можна кешувати)
+        self.seed = seed
     
-    def generate_mnemonics(self, key_phrases: List[str], main_topics: List[str]) -> Dict[str, Any]:
-        """Генерація всіх типів мнемонік"""
+    def _rng(self, *parts: Hashable):
+        """
+        Джерело випадковості для одного виклику. Із зерном — random.Random, що
+        залежить лише від зерна і parts, тож результат не залежить від порядку
+        і набору інших викликів; без зерна — глобальний модуль random.
+        """
+        if self.seed is None:
+            return random
+        return random.Random(':'.join(map(str, (self.seed,) + parts)))
+    
+    def _memoized(self, key: Tuple[Hashable, ...], build: Callable[[Any], Dict],
+                  randomized: bool = False) -> Dict:
+        """
+        Результат техніки для однієї фрази через спільний memo; build(rng)
+        отримує генератор випадкових чисел. Для випадкових технік він залежить
+        лише від зерна і ключа, тож збережений результат збігається з тим, що
+        дав би новий виклик. Без зерна випадкові техніки не кешуються.
+        """
+        if randomized and self.seed is None:
+            return build(random)
+        
+        current = lexicon()
+        if MnemonicGenerator._memo_lexicon is not current:
+            # Після заміни словника співзвучні слова можуть бути іншими
+            self.memo.clear()
+            MnemonicGenerator._memo_lexicon = current
+        
+        rng = random
+        if randomized:
+            rng = self._rng(*key)
+            key = key + (self.seed,)
+        return dict(self.memo.get_or_compute(key, lambda: build(rng)))
+
+    def generate_mnemonics(self, key_phrases: List[str], main_topics: List[str],
+                           techniques: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Генерація мнемонік: усіх зареєстрованих технік або лише вибраних"""
+        return dict(self.iter_mnemonics(key_phrases, main_topics, techniques))
+
+    def iter_mnemonics(self, key_phrases: List[str], main_topics: List[str],
+                       techniques: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """Генерація мнемонік по одній техніці: (ключ, результат) одразу після обчислення"""
         # ВАЖЛИВО:
         # Тепер всі мнемоніки максимально базуються на реальних фразах з тексту.
         # Якщо ключові фрази порожні, пробуємо підстрахуватися основними темами.
         base_phrases = key_phrases or main_topics or []
-        mnemonics: Dict[str, Any] = {}
-        
-        # 1. Акроніми
-        mnemonics['acronyms'] = self._generate_acronyms(base_phrases)
-        
-        # 2. Акростихи
-        mnemonics['acrostics'] = self._generate_acrostics(base_phrases)
-        
-        # 3. Рими
-        mnemonics['rhymes'] = self._generate_rhymes(key_phrases)
-        
-        # 4. Історії
-        mnemonics['stories'] = self._generate_stories(key_phrases)
-        
-        # 5. Палац пам'яті (метод локуса)
-        mnemonics['loci_method'] = self._generate_loci_method(key_phrases)
-        
-        # 6. Візуальні асоціації
-        mnemonics['visuals'] = self._generate_visual_associations(key_phrases)
-        
-        # 7. Числові асоціації
-        mnemonics['number_associations'] = self._generate_number_associations(key_phrases)
-        
-        # 8. Фонетичні мнемоніки
-        mnemonics['phonetic'] = self._generate_phonetic_mnemonics(key_phrases)
-        
-        # 9. Метафори
-        mnemonics['metaphors'] = self._generate_metaphors(key_phrases)
-        
-        # 10. Алітерація
-        mnemonics['alliteration'] = self._generate_alliteration(key_phrases)
-        
-        # 11. Стихи для запам'ятовування
-        mnemonics['poems'] = self._generate_poems(key_phrases)
-        
-        # 12. Групування (Chunking)
-        mnemonics['chunking'] = self._generate_chunking(key_phrases)
-        
-        # 13. Заміни (Substitution)
-        mnemonics['substitution'] = self._generate_substitution(key_phrases)
-        
-        # 14. Асоціативні ланцюги
-        mnemonics['associations'] = self._generate_associations(key_phrases)
-        
-        # 15. Паліндромія
-        mnemonics['palindromes'] = self._generate_palindromes(key_phrases)
-        
-        return mnemonics
+
+        for spec in resolve_techniques(techniques):
+            phrases = base_phrases if spec.fallback_to_topics else key_phrases
+            yield spec.key, getattr(self, spec.method)(phrases)
     
     def _generate_acronyms(self, phrases: List[str]) -> List[Dict]:
         """Генерація акронімів, які реально відповідають фразам тексту."""
@@ -318,25 +562,22 @@ class MnemonicGenerator:
         if not phrases:
             return results
         
-        # Беремо 3‑7 найважливіших фраз
-        selected = phrases[:7]
+        # Беремо найважливіші фрази — не більше, ніж пошук акроніма переставляє
+        selected = phrases[:MAX_ACRONYM_PHRASES]
         
-        # Для кожної фрази беремо першу змістовну літеру (першого слова)
-        letters: List[str] = []
-        mapping = []
-        for phrase in selected:
-            cleaned = phrase.strip()
-            if not cleaned:
-                continue
-            first_word = cleaned.split()[0]
-            letter = first_word[0].upper()
-            letters.append(letter)
-            mapping.append({'letter': letter, 'phrase': phrase})
-        
-        if len(letters) < 2:
+        # Шукаємо порядок фраз і перші літери їхніх слів, за яких акронім
+        # стає словом зі словника або хоча б читається як слово
+        found = acronym_search().search(selected)
+        if found is None:
             return results
         
-        acronym = ''.join(letters)
+        letters = found['letters']
+        acronym = found['acronym']
+        is_word = found['is_word']
+        mapping = [
+            {'letter': letter, 'phrase': selected[index]}
+            for letter, index in zip(letters, found['order'])
+        ]
         
         # Люди краще запам'ятовують, коли акронім читається як слово.
         # Тому додаємо просту підказку по вимові.
@@ -351,6 +592,8 @@ class MnemonicGenerator:
             'acronym': acronym,
             'letters': letters,
             'mapping': mapping,
+            'is_word': is_word,
+            'pronounceable': found['pronounceable'],
             'explanation': f'Кожна літера акроніму відповідає ключовій фразі: {sentence}.',
             'memorization_method': (
                 f'Чітко вимовляйте акронім «{acronym}» (по літерах: {pronounce_hint}) '
@@ -412,6 +655,16 @@ class MnemonicGenerator:
             return results
         
         selected = phrases[:min(4, len(phrases))]
+        index = rhyme_index()
+        
+        # Справжні рими до останнього слова кожної фрази
+        rhymes: Dict[str, List[str]] = {}
+        for phrase in selected:
+            words = re.findall(r"[\w'’]+", phrase)
+            if words:
+                found = index.rhymes(words[-1], limit=3)
+                if found:
+                    rhymes[phrase] = found
         
         if len(selected) >= 2:
             # Простий чотиривірш, де кожен рядок містить реальну фразу
@@ -439,6 +692,20 @@ class MnemonicGenerator:
                 )
             })
         
+        for phrase, found in rhymes.items():
+            pattern = self._rng('rhyme', phrase).choice(compiled_templates()['rhyme_patterns'])
+            results.append({
+                'phrases': [phrase],
+                'poem': pattern.render(word=phrase, rhyme=found[0]),
+                'rhymes': found,
+                'type': 'Римована пара',
+                'rhyme_scheme': 'точна',
+                'explanation': (
+                    f'«{found[0]}» римується з останнім словом фрази «{phrase}». '
+                    'Згадавши риму, легше відновити і саму фразу.'
+                )
+            })
+        
         return results
     
     def _generate_stories(self, phrases: List[str]) -> List[Dict]:
@@ -489,113 +756,87 @@ class MnemonicGenerator:
     
     def _generate_loci_method(self, phrases: List[str]) -> List[Dict]:
         """Генерація методом локуса - Палац пам'яті"""
-        locations = [
-            "вхідні двері", "вікно в вітальні", "обідній стіл", "комп'ютерний стіл",
-            "книжкова шафа", "кухонна плита", "ванна кімната", "балкон",
-            "спальне ліжко", "телевізор", "холодильник", "дзеркало",
-            "диван", "полиця з книгами", "робочий стіл", "підвіконня",
-            "камін", "світильник", "килим", "стільниця"
-        ]
-        
+        locations = templates.LOCI_LOCATIONS
         results = []
         
         # Зв'язуємо фрази з місцями в "Палаці пам'яті"
-        for i, phrase in enumerate(phrases[:15]):
-            if i < len(locations):
-                # Спрощуємо фразу
-                simple_phrase = phrase.split()[0] if phrase.split() else phrase[:20]
-                
-                results.append({
-                    'phrase': simple_phrase,
-                    'location': locations[i],
-                    'position': i + 1,
-                    'association': f"Уявіть '{simple_phrase}' біля {locations[i]}",
-                    'visualization': f"Як виглядає {simple_phrase} на {locations[i]}?",
-                    'sensory_description': f"Дотик: м'яка, зір: яскрава, звук: гучна біля {locations[i]}",
-                    'memorization_journey': f"Прогуляйтесь від {locations[0]} до {locations[min(i, len(locations)-1)]}"
-                })
+        for i, phrase in enumerate(phrases[:min(15, len(locations))]):
+            results.append(self._memoized(('loci', phrase, i), partial(self._loci_item, phrase, i)))
         
         return results
     
+    def _loci_item(self, phrase: str, i: int, rng) -> Dict:
+        locations = templates.LOCI_LOCATIONS
+        # Спрощуємо фразу
+        simple_phrase = phrase.split()[0] if phrase.split() else phrase[:20]
+        
+        return {
+            'phrase': simple_phrase,
+            'location': locations[i],
+            'position': i + 1,
+            'association': f"Уявіть '{simple_phrase}' біля {locations[i]}",
+            'visualization': f"Як виглядає {simple_phrase} на {locations[i]}?",
+            'sensory_description': f"Дотик: м'яка, зір: яскрава, звук: гучна біля {locations[i]}",
+            'memorization_journey': f"Прогуляйтесь від {locations[0]} до {locations[min(i, len(locations)-1)]}"
+        }
+    
     def _generate_visual_associations(self, phrases: List[str]) -> List[Dict]:
         """Генерація візуальних асоціацій - образні зв'язки"""
-        visual_templates = [
-            "Уявіть {phrase} у вигляді {image}",
-            "{phrase} нагадує {association}",
-            "Порівняйте {phrase} з {comparison}",
-            "Зобразіть {phrase} як {visual}",
-            "Я бачу {phrase} як {image}",
-            "Уявіть, що {phrase} це {association}"
-        ]
-        
-        common_images = [
-            "яскравого сонця", "великої гори", "швидкої річки",
-            "квітучого дерева", "мудрої сови", "сильного ведмедя",
-            "швидкого поїзда", "високого будинку", "глибокого моря",
-            "яскравої зірки", "теплого вогню", "свіжого вітру",
-            "метелика", "золотого льву", "діамантового кристалу"
-        ]
-        
-        colors = [
-            "червоного", "синього", "зеленого", "жовтого", "фіолетового",
-            "помаранчевого", "рожевого", "білого", "чорного", "золотого",
-            "срібного", "бірюзового", "малинового"
-        ]
-        
         results = []
         
-        for i, phrase in enumerate(phrases[:10]):
-            template = random.choice(visual_templates)
-            image = random.choice(common_images)
-            color = random.choice(colors)
-            
+        for phrase in phrases[:10]:
             # Спрощуємо фразу
             simple_phrase = phrase.split()[0] if phrase.split() else phrase[:15]
-            
-            visualization = template.format(
-                phrase=simple_phrase,
-                image=f"{color} {image}",
-                association=f"{color} {image}",
-                comparison=f"{color} {image}",
-                visual=f"{color} {image}"
-            )
-            
-            results.append({
-                'phrase': simple_phrase,
-                'visualization': visualization,
-                'suggested_image': f"{color} {image}",
-                'explanation': 'Створіть яскравий ментальний образ',
-                'color': color,
-                'image': image,
-                'visual_strength': 'дуже висока'
-            })
+            results.append(self._memoized(
+                ('visual', simple_phrase), partial(self._visual_item, simple_phrase), randomized=True
+            ))
         
         return results
     
+    def _visual_item(self, simple_phrase: str, rng) -> Dict:
+        template = rng.choice(templates.VISUAL_TEMPLATES)
+        image = rng.choice(templates.VISUAL_IMAGES)
+        color = rng.choice(templates.VISUAL_COLORS)
+        
+        colored_image = f"{color} {image}"
+        visualization = template.render(
+            phrase=simple_phrase,
+            image=colored_image,
+            association=colored_image,
+            comparison=colored_image,
+            visual=colored_image
+        )
+        
+        return {
+            'phrase': simple_phrase,
+            'visualization': visualization,
+            'suggested_image': colored_image,
+            'explanation': 'Створіть яскравий ментальний образ',
+            'color': color,
+            'image': image,
+            'visual_strength': 'дуже висока'
+        }
+    
     def _generate_number_associations(self, phrases: List[str]) -> List[Dict]:
         """Генерація числових асоціацій - число-образ метод"""
-        number_images = {
-            1: "стовп", 2: "лебідь", 3: "тризуб", 4: "човен", 5: "гачок",
-            6: "вишня", 7: "коса", 8: "очки", 9: "куля", 10: "пальці",
-            11: "близнюки", 12: "годинник", 13: "чорт", 14: "кілт", 15: "пенал",
-            20: "гуска", 30: "трійка", 40: "сорок", 50: "полтинник", 100: "сотня"
-        }
+        number_images = templates.NUMBER_IMAGES
         
         results = []
         
         for i, phrase in enumerate(phrases[:15]):
             num = i + 1
-            if num in number_images:
+            image = number_images.get(num)
+            if image is not None:
                 simple_phrase = phrase.split()[0] if phrase.split() else phrase[:15]
                 
                 results.append({
                     'number': num,
                     'phrase': simple_phrase,
-                    'image': number_images[num],
-                    'association': f"{num} = {number_images[num]} → асоціюйте з '{simple_phrase}'",
-                    'explanation': f'Зв\'яжіть число {num} з образом "{number_images[num]}" для запам\'ятовування',
+                    'image': image,
+                    'association': f"{num} = {image} → асоціюйте з '{simple_phrase}'",
+                    'explanation': f'Зв\'яжіть число {num} з образом "{image}" для запам\'ятовування',
                     'position': i + 1,
-                    'visual_connection': f'Уявіть {number_images[num]} разом з {simple_phrase}'
+                    'visual_connection': f'Уявіть {image} разом з {simple_phrase}'
                 })
         
         return results
@@ -605,65 +846,90 @@ class MnemonicGenerator:
         results = []
         for phrase in phrases[:5]:
             words = phrase.split()
-            if words:
-                main_word = words[0]
-                # Знаходимо звукові аналогії
-                phonetic_pair = self._find_phonetic_pair(main_word)
-                
-                results.append({
-                    'word': main_word,
-                    'sound_alike': phonetic_pair,
-                    'mnemonic': f"'{main_word}' звучить як '{phonetic_pair}' - запам'ятайте асоціацію",
-                    'technique': 'Фонетична подібність'
-                })
+            # Перше слово фрази, для якого є співзвучна пара
+            for main_word in words:
+                item = self._memoized(('phonetic', main_word), partial(self._phonetic_item, main_word))
+                if item:
+                    results.append(item)
+                    break
+            else:
+                # Пари немає (малий словник) — пропонуємо проговорити слово по складах
+                item = self._syllable_item(words)
+                if item:
+                    results.append(item)
         return results
     
-    def _find_phonetic_pair(self, word: str) -> str:
-        """Знаходить фонетичні пари для слова"""
-        phonetic_map = {
-            'да': 'два', 'ва': 'вода', 'ка': 'каша', 'па': 'папа',
-            'та': 'танець', 'ра': 'рада', 'ла': 'ласка', 'ма': 'мама',
-            'са': 'сад', 'на': 'навіть', 'ба': 'батько', 'га': 'гармонія'
+    def _syllable_item(self, words: List[str]) -> Optional[Dict]:
+        main_word = next((word for word in words if len(syllables(word)) > 1), None)
+        if main_word is None:
+            return None
+        parts = syllables(main_word)
+        return {
+            'word': main_word,
+            'sound_alike': None,
+            'alternatives': [],
+            'syllables': parts,
+            'mnemonic': f"Проговоріть '{main_word}' по складах: {'-'.join(parts)} - ритм допомагає запам'ятати звучання",
+            'technique': 'Ритм складів'
         }
+    
+    def _phonetic_item(self, main_word: str, rng) -> Dict:
+        # Знаходимо звукові аналогії; порожній результат — пари немає
+        phonetic_pair = self._find_phonetic_pair(main_word)
+        if phonetic_pair is None:
+            return {}
         
-        for key, value in phonetic_map.items():
-            if word.startswith(key):
-                return value
-        return f"звучить як '{word}'"
+        return {
+            'word': main_word,
+            'sound_alike': phonetic_pair,
+            'alternatives': list(phonetic_index().sound_alikes(main_word)[1:]),
+            'mnemonic': f"'{main_word}' звучить як '{phonetic_pair}' - запам'ятайте асоціацію",
+            'technique': 'Фонетична подібність'
+        }
+    
+    def _find_phonetic_pair(self, word: str) -> Optional[str]:
+        """Найближче за звучанням слово зі словника (фонетичний ключ + BK-дерево) або None"""
+        sound_alikes = phonetic_index().sound_alikes(word)
+        return sound_alikes[0] if sound_alikes else None
     
     def _generate_metaphors(self, phrases: List[str]) -> List[Dict]:
         """Генерація метафор для образних порівнянь"""
         results = []
         
+        # Вибираємо мета фори з різних категорій
+        if not self.metaphor_base['nature']:
+            return results
+        
         for phrase in phrases[:min(6, len(phrases))]:
             simple_phrase = phrase.split()[0] if phrase.split() else phrase[:20]
-            
-            # Вибираємо мета фори з різних категорій
-            nature_metaphors = self.metaphor_base['nature']
-            if nature_metaphors:
-                metaphor = random.choice(nature_metaphors)
-                
-                results.append({
-                    'original': simple_phrase,
-                    'metaphor': metaphor['to'],
-                    'reason': metaphor['reason'],
-                    'full_description': f"Уявіть '{simple_phrase}' як {metaphor['to']}, тому що {metaphor['reason']}",
-                    'memorization_score': 8.5
-                })
+            results.append(self._memoized(
+                ('metaphor', simple_phrase), partial(self._metaphor_item, simple_phrase), randomized=True
+            ))
         
         return results
     
+    def _metaphor_item(self, simple_phrase: str, rng) -> Dict:
+        metaphor = rng.choice(self.metaphor_base['nature'])
+        
+        return {
+            'original': simple_phrase,
+            'metaphor': metaphor['to'],
+            'reason': metaphor['reason'],
+            'full_description': f"Уявіть '{simple_phrase}' як {metaphor['to']}, тому що {metaphor['reason']}",
+            'memorization_score': 8.5
+        }
+    
     def _generate_alliteration(self, phrases: List[str]) -> List[Dict]:
         """Генерація алітерації - однакові звуки на початку слів"""
         results = []
+        lex = lexicon()
         
         for phrase in phrases[:min(5, len(phrases))]:
             first_letter = phrase[0].upper() if phrase else 'В'
             
-            # Отримуємо слова на однакову букву
-            if first_letter in self.alliteration_words:
-                words = self.alliteration_words[first_letter][:4]
-                
+            # Отримуємо слова на однакову букву: діапазон словника за префіксом
+            words = lex.sample_with_prefix(first_letter, 4, self._rng('alliteration', phrase))
+            if words:
                 # Створюємо алітерацію
                 alliteration_text = ' '.join(words)
                 
@@ -685,14 +951,16 @@ class MnemonicGenerator:
         if len(selected_phrases) < 2:
             return results
         
-        for poem_template in self.poem_templates[:3]:
-            poem_lines = []
-            
-            for i, line_template in enumerate(poem_template['template']):
-                if i < len(selected_phrases):
-                    phrase = selected_phrases[i].split()[0] if selected_phrases[i].split() else selected_phrases[i][:15]
-                    filled_line = line_template.replace(f'{{phrase{i+1}}}', phrase)
-                    poem_lines.append(filled_line)
+        values = {
+            f'phrase{i + 1}': phrase.split()[0] if phrase.split() else phrase[:15]
+            for i, phrase in enumerate(selected_phrases)
+        }
+        
+        for poem_template in compiled_templates()['poem_templates'][:3]:
+            poem_lines = [
+                line_template.render(**values)
+                for line_template in poem_template['template'][:len(selected_phrases)]
+            ]
             
             results.append({
                 'title': poem_template['name'],
@@ -740,27 +1008,31 @@ class MnemonicGenerator:
         
         for phrase in phrases[:min(7, len(phrases))]:
             simple_phrase = phrase.split()[0] if phrase.split() else phrase[:20]
-            
-            # Створюємо образну заміну
-            emoji_map = {
-                'час': '⏰', 'знання': '📚', 'успіх': '🏆', 'дерево': '🌳',
-                'вода': '💧', 'вогонь': '🔥', 'гора': '⛰️', 'ліс': '🌲',
-                'книга': '📖', 'світло': '💡', 'розум': '🧠', 'серце': '❤️'
-            }
-            
-            # Вибираємо емодзі
-            emoji = emoji_map.get(simple_phrase, '🎯')
-            
-            results.append({
-                'original': simple_phrase,
-                'replacement': emoji,
-                'visual_code': f'{emoji} = {simple_phrase}',
-                'description': f'Уявіть символ {emoji} як представника ідеї "{simple_phrase}"',
-                'memory_strength': 'висока'
-            })
+            results.append(self._memoized(
+                ('substitution', simple_phrase), partial(self._substitution_item, simple_phrase)
+            ))
         
         return results
     
+    def _substitution_item(self, simple_phrase: str, rng) -> Dict:
+        # Співзвучне слово словника з найдовшим спільним початком
+        sound_alike = lexicon().nearest(simple_phrase)
+        
+        # Створюємо образну заміну: вибираємо емодзі
+        emoji = templates.EMOJI_MAP.get(simple_phrase, '🎯')
+        
+        return {
+            'original': simple_phrase,
+            'replacement': emoji,
+            'visual_code': f'{emoji} = {simple_phrase}',
+            'sound_alike': sound_alike,
+            'description': (
+                f'Уявіть символ {emoji} як представника ідеї "{simple_phrase}"'
+                + (f', а співзвучне слово "{sound_alike}" — як його образ' if sound_alike else '')
+            ),
+            'memory_strength': 'висока'
+        }
+    
     def _generate_associations(self, phrases: List[str]) -> List[Dict]:
         """Генерація асоціативних ланцюгів"""
         results = []
@@ -788,61 +1060,39 @@ class MnemonicGenerator:
     
     def _generate_connection(self, word1: str, word2: str) -> str:
         """Генеруємо розповідь про зв'язок між словами"""
-        connections = [
-            f'{word1} приводить до {word2}',
-            f'{word1} трансформується в {word2}',
-            f'{word1} дружить з {word2}',
-            f'{word1} створює {word2}',
-            f'{word1} знаходить {word2}',
-            f'{word1} зв\'язується з {word2}',
-            f'{word1} перетворюється на {word2}',
-            f'{word1} нагадує про {word2}'
-        ]
-        return random.choice(connections)
+        template = self._rng('connection', word1, word2).choice(templates.CONNECTION_TEMPLATES)
+        return template.render(word1=word1, word2=word2)
     
     def _generate_palindromes(self, phrases: List[str]) -> List[Dict]:
         """Генерація паліндромів - дзеркальних слів"""
         results = []
         
-        palindrome_words = ['радар', 'уж', 'як', 'рівневи', 'закуска', 'спокійнеск']
-        
-        for i, phrase in enumerate(phrases[:5]):
+        for phrase in phrases[:5]:
             simple_phrase = phrase.split()[0] if phrase.split() else phrase[:10]
             
             # Намагаємось створити дзеркальну фразу
             if len(simple_phrase) >= 3:
-                reversed_phrase = simple_phrase[::-1]
-                
-                results.append({
-                    'original': simple_phrase,
-                    'reversed': reversed_phrase,
-                    'palindrome_tip': f'"{simple_phrase}" читається як "{reversed_phrase}" у зворотному напрямку',
-                    'memory_technique': 'Звертайте увагу на розміщення букв'
-                })
+                results.append(self._memoized(('palindrome', simple_phrase), partial(self._palindrome_item, simple_phrase)))
         
         return results
     
+    def _palindrome_item(self, simple_phrase: str, rng) -> Dict:
+        reversed_phrase = simple_phrase[::-1]
+        
+        return {
+            'original': simple_phrase,
+            'reversed': reversed_phrase,
+            'palindrome_tip': f'"{simple_phrase}" читається як "{reversed_phrase}" у зворотному напрямку',
+            'memory_technique': 'Звертайте увагу на розміщення букв'
+        }
+    
     def generate_story(self, keywords: List[str]) -> str:
         """Генерація складної історії на основі ключових слів"""
         if not keywords:
             return "Будь ласка, введіть ключові слова для генерації історії."
         
-        story_intros = [
-            "Уявіть собі неймовірну пригоду, де ",
-            "Колись давно в чарівному світі ",
-            "Одного разу трапилася дивовижна історія: ",
-            "У світі знань та пам'яті існує таємниця: ",
-            "Представте себе у місці, де ",
-            "В древні часи сталося чудо: "
-        ]
-        
-        connectors = [
-            " потім ", " аж раптом ", " несподівано ", " і тоді ",
-            " одночасно ", " через деякий час ", " між тим ", " далі ",
-            " вдруге ", " врешті решт ", " в результаті "
-        ]
-        
-        intro = random.choice(story_intros)
+        rng = self._rng('story', *keywords)
+        intro = rng.choice(templates.STORY_INTROS)
         story = intro
         
         for i, keyword in enumerate(keywords):
@@ -850,12 +1100,12 @@ class MnemonicGenerator:
             simple_keyword = keyword.split()[0] if keyword.split() else keyword
             
             # Додаємо дію
-            action = random.choice(self.word_base['verbs'])
-            emotion = random.choice(self.word_base['emotions'])
+            action = rng.choice(self.word_base['verbs'])
+            emotion = rng.choice(self.word_base['emotions'])
             story += f"'{simple_keyword}' {action} із {emotion}"
             
             if i < len(keywords) - 1:
-                story += random.choice(connectors)
+                story += rng.choice(templates.STORY_CONNECTORS)
             else:
                 story += ". Ця драматична історія навічно залишиться в вашій пам'яті!"
         
@@ -899,6 +1149,8 @@ class MnemonicGenerator:
         if not text or len(text) < 50:
             return questions
         
+        rng = self._rng('quiz', text)
+        
         # Простий алгоритм для генерації питань
         sentences = [s.strip() for s in text.split('.') if len(s.strip()) > 20]
         
@@ -922,7 +1174,7 @@ class MnemonicGenerator:
                 
                 # Додаємо інші слова з речення (крім стоп-слів)
                 other_words = [w.strip('.,!?') for w in words if w.strip('.,!?') != key_word and len(w) > 3]
-                random.shuffle(other_words)
+                rng.shuffle(other_words)
                 
                 # Додаємо 3 неправильні варіанти
                 for wrong_word in other_words[:3]:
@@ -934,7 +1186,7 @@ class MnemonicGenerator:
                     fake_word = f"варіант{len(options)}"
                     options.append(fake_word)
                 
-                random.shuffle(options)
+                rng.shuffle(options)
                 
                 questions.append({
                     'id': i + 1,
@@ -949,36 +1201,8 @@ class MnemonicGenerator:
     
     def get_memory_tips(self) -> List[str]:
         """Розширені поради для покращення пам'яті"""
-        tips = [
-            "📚 Вивчайте матеріал дрібними порціями по 25-30 хвилин (техніка Помодоро)",
-            "🔄 Повторюйте інформацію через зростаючі інтервали: 1 день, 3 дні, тиждень, місяць",
-            "🎨 Використовуйте візуалізацію та кольорові маркери для виділення ключових моментів",
-            "🔗 Створюйте асоціації з уже відомою інформацією - це ваш найкращий інструмент",
-            "🗣️ Навчайте інших - це найкращий спосіб запам'ятати матеріал",
-            "🎵 Створюйте ритмічні або мелодійні мнемоніки - музика дуже допомагає",
-            "📍 Використовуйте метод локуса (палац пам'яті) для складних послідовностей",
-            "💤 Спіть достатньо - 7-9 годин для консолідації пам'яті",
-            "🧠 Тренуйте пам'ять регулярно, як м'яз - це робить її сильнішою",
-            "🎯 Фокусуйтеся на одному завданні за раз - багатозадачність руйнує пам'ять",
-            "✍️ Конспектуйте своїми словами - письмо активує різні області мозку",
-            "🕰️ Використовуйте техніку Помодоро: 25 хв навчання, 5 хв відпочинку",
-            "🧩 Розбивайте складну інформацію на дрібні логічні частини",
-            "🎭 Використовуйте емоції - емоційно забарвлена інформація краще запам'ятовується",
-            "🏃 Займайтесь спортом - фізична активність дуже покращує мозкову діяльність",
-            "🌳 Гуляйте на свіжому повітрі - кисень необхідний для мозку",
-            "🍎 Вживайте здорову їжу: горіхи, ягоди, рибу для підтримки мозку",
-            "💧 Пийте достатньо води - навіть 2% дегідратація погіршує концентрацію",
-            "🎯 Встановлюйте чіткі цілі запам'ятовування",
-            "🔊 Вимовляйте інформацію вголос - це удвічі ефективніше за мовчазне читання",
-            "🧘 Практикуйте медитацію для поліпшення концентрації та уваги",
-            "📖 Читайте активно - задавайте питання тексту, передбачайте продовження",
-            "🎪 Грайте в словесні ігри - кросворди, Scrabble покращують словниковий запас",
-            "👥 Займайтесь груповим навчанням - обговорення матеріалу дуже ефективне",
-            "⏱️ Тестуйте себе регулярно - тестування краще вправ для фіксації знань"
-        ]
-        
         # Повертаємо 8 випадкових порад
-        return random.sample(tips, min(8, len(tips)))
+        return self._rng('tips').sample(templates.MEMORY_TIPS, min(8, len(templates.MEMORY_TIPS)))
     
     def analyze_text_complexity(self, text: str) -> Dict[str, Any]:
         """Розширений аналіз складності тексту"""
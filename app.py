@@ -2,7 +2,7 @@
 Мнемонічний тренер з ШІ - Flask веб-додаток
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file, stream_with_context
 import os
 import sys
 from werkzeug.utils import secure_filename
@@ -10,28 +10,489 @@ from werkzeug.utils import secure_filename
 # Add current directory to path to ensure imports work
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from ai_model import MnemonicGenerator
+from ai_model import MnemonicGenerator, GENERATOR_VERSION, preload as preload_generator_data, resolve_techniques
 from utils import TextProcessor
+from result_cache import ResultCache, content_key, content_seed
+from singleflight import SingleFlight
+from jobs import JobManager, SQLiteJobStore
+from session_store import SessionEvictor, WriteBehindSessionStore, create_session_store, new_session_id
+import atexit
+import copy
 import json
-import uuid
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 from gemini_client import get_gemini_client
+from gemini_service import CircuitBreaker, GeminiQuotaExceeded, GeminiService, GeminiUnavailable, TokenBucket
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB
 app.config['ALLOWED_EXTENSIONS'] = {'txt', 'pdf', 'docx', 'md'}
+# Кеш результатів: LRU у пам'яті + опційний каталог на диску, спільний для воркерів
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESULT_CACHE_DIR'] = os.environ.get('RESULT_CACHE_DIR') or None
+# Фонові задачі (async=true): потоки пулу, скільки пам'ятати завершені задачі, пульс SSE,
+# найдовше з'єднання SSE і спільна для воркерів база станів задач
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 4))
+app.config['JOB_TTL_SECONDS'] = float(os.environ.get('JOB_TTL_SECONDS', 900))
+app.config['JOB_SSE_HEARTBEAT'] = float(os.environ.get('JOB_SSE_HEARTBEAT', 15))
+app.config['JOB_SSE_MAX_SECONDS'] = float(os.environ.get('JOB_SSE_MAX_SECONDS', 10))
+app.config['JOB_DB_PATH'] = os.environ.get('JOB_DB_PATH', 'static/user_data/jobs.db')
+# Файлові блокування, через які воркери не рахують той самий текст одночасно
+app.config['SINGLE_FLIGHT_LOCK_DIR'] = os.environ.get('SINGLE_FLIGHT_LOCK_DIR', 'static/user_data/locks')
+# Сховище сесій: 'sqlite' (одна база з індексами) або 'json' (файл на сесію)
+app.config['SESSION_STORE'] = os.environ.get('SESSION_STORE', 'sqlite')
+app.config['SESSION_DB_PATH'] = os.environ.get('SESSION_DB_PATH', 'static/user_data/sessions.db')
+app.config['SESSION_DATA_DIR'] = 'static/user_data'
+# Сесії, які фоновий запис не зміг зберегти після повторів (python session_store.py replay ...)
+app.config['SESSION_DEAD_LETTER_PATH'] = os.environ.get(
+    'SESSION_DEAD_LETTER_PATH', 'static/user_data/sessions.deadletter.jsonl'
+)
+# Сесії старші за TTL і найстаріші понад ліміт розміру видаляються у фоні
+app.config['SESSION_TTL_SECONDS'] = float(os.environ.get('SESSION_TTL_SECONDS', 30 * 24 * 3600))
+app.config['SESSION_MAX_BYTES'] = int(os.environ.get('SESSION_MAX_BYTES', 2 * 1024 ** 3))
+app.config['SESSION_EVICTION_INTERVAL'] = float(os.environ.get('SESSION_EVICTION_INTERVAL', 300))
+# Файлове блокування, яке визначає єдиний воркер, що очищує сесії
+app.config['SESSION_EVICTION_LOCK'] = os.environ.get('SESSION_EVICTION_LOCK', 'static/user_data/session_evictor.lock')
+# Глибокий режим: скільки секунд чекати Gemini, поки локальна генерація вже йде паралельно
+app.config['DEEP_MODE_DEADLINE'] = float(os.environ.get('DEEP_MODE_DEADLINE', 20))
+app.config['DEEP_MODE_WORKERS'] = int(os.environ.get('DEEP_MODE_WORKERS', 8))
+# Скільки викликів Gemini (разом із покинутими після дедлайну) може йти одночасно в процесі
+app.config['DEEP_MODE_MAX_INFLIGHT'] = int(os.environ.get('DEEP_MODE_MAX_INFLIGHT', app.config['DEEP_MODE_WORKERS']))
+# Скільки секунд кешується локальний результат, яким глибокий режим замінив Gemini
+app.config['DEEP_MODE_FALLBACK_TTL'] = float(os.environ.get('DEEP_MODE_FALLBACK_TTL', 60))
+# Кеш відповідей Gemini: свіжі — GEMINI_CACHE_TTL секунд, потім ще GEMINI_CACHE_STALE секунд
+# віддаються застарілими з оновленням у фоні
+app.config['GEMINI_CACHE_TTL'] = float(os.environ.get('GEMINI_CACHE_TTL', 24 * 3600))
+app.config['GEMINI_CACHE_STALE'] = float(os.environ.get('GEMINI_CACHE_STALE', 7 * 24 * 3600))
+app.config['GEMINI_CACHE_MAX_BYTES'] = int(os.environ.get('GEMINI_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+app.config['GEMINI_CACHE_DIR'] = os.environ.get('GEMINI_CACHE_DIR', 'static/user_data/gemini_cache')
+# Ліміт розміру дискового кешу Gemini; файли, старші за TTL + stale, прибираються і без читання
+app.config['GEMINI_CACHE_DISK_MAX_BYTES'] = int(os.environ.get('GEMINI_CACHE_DISK_MAX_BYTES', 256 * 1024 * 1024))
+# Модель Gemini входить у ключ кешу відповідей (та сама змінна, що й у gemini_client)
+app.config['GEMINI_MODEL'] = os.environ.get('GEMINI_MODEL', 'gemini-1.5-flash')
+# Бюджет запитів до Gemini на процес: GEMINI_RATE_PER_MINUTE на хвилину, до GEMINI_BURST поспіль.
+# При кількох воркерах квоту API ділимо між ними
+app.config['GEMINI_RATE_PER_MINUTE'] = float(os.environ.get('GEMINI_RATE_PER_MINUTE', 15))
+app.config['GEMINI_BURST'] = int(os.environ.get('GEMINI_BURST', 15))
+# Запобіжник: після GEMINI_BREAKER_FAILURES помилок поспіль Gemini не викликається
+# GEMINI_BREAKER_COOLDOWN секунд, далі — один пробний запит
+app.config['GEMINI_BREAKER_FAILURES'] = int(os.environ.get('GEMINI_BREAKER_FAILURES', 5))
+app.config['GEMINI_BREAKER_COOLDOWN'] = float(os.environ.get('GEMINI_BREAKER_COOLDOWN', 30))
+# Процеси для аналізу текстів від TEXT_PARALLEL_THRESHOLD символів (0 — без паралельного режиму)
+app.config['TEXT_PARALLEL_WORKERS'] = int(os.environ.get('TEXT_PARALLEL_WORKERS', 0))
+app.config['TEXT_PARALLEL_THRESHOLD'] = int(os.environ.get('TEXT_PARALLEL_THRESHOLD', 1_000_000))
 
 # Створюємо папки
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs('static/user_data', exist_ok=True)
+os.makedirs(app.config['SESSION_DATA_DIR'], exist_ok=True)
 
-# Ініціалізуємо модель ШІ
-generator = MnemonicGenerator()
+# Ініціалізуємо модель ШІ. Довідкові дані генератора будуються один раз на імпорті:
+# під gunicorn з preload_app — у головному процесі, спільно для всіх воркерів.
+# Сам генератор легкий і створюється на кожен запит зі своїм зерном (_generator_for)
+preload_generator_data()
 
-# Ініціалізуємо обробник тексту
-text_processor = TextProcessor()
+# Ініціалізуємо обробник тексту. Паралельна обробка великих текстів вимкнена за
+# замовчуванням: пул процесів є в кожному воркері gunicorn, тож разом їх
+# TEXT_PARALLEL_WORKERS × GUNICORN_WORKERS
+text_processor = TextProcessor(
+    parallel_threshold=app.config['TEXT_PARALLEL_THRESHOLD'],
+    parallel_workers=app.config['TEXT_PARALLEL_WORKERS'] or None,
+)
+
+# Сховище результатів сесій; старі JSON-файли залишаються доступними для читання
+if app.config['SESSION_STORE'] == 'json':
+    session_store = create_session_store('json', app.config['SESSION_DATA_DIR'])
+else:
+    session_store = create_session_store(
+        app.config['SESSION_STORE'],
+        app.config['SESSION_DB_PATH'],
+        legacy_dir=app.config['SESSION_DATA_DIR'],
+    )
+# Запис на диск відбувається у фоновому потоці, поза обробкою запиту;
+# при зупинці процесу черга дописується
+session_store = WriteBehindSessionStore(session_store, dead_letter_path=app.config['SESSION_DEAD_LETTER_PATH'])
+atexit.register(session_store.close)
+
+# Потік очищення запускається у воркерах (start_worker_tasks), а не на імпорті: під gunicorn
+# з preload_app імпорт відбувається в головному процесі. Очищує один воркер — власник блокування
+session_evictor = SessionEvictor(
+    session_store,
+    ttl_seconds=app.config['SESSION_TTL_SECONDS'],
+    max_total_bytes=app.config['SESSION_MAX_BYTES'],
+    interval=app.config['SESSION_EVICTION_INTERVAL'],
+    lock_path=app.config['SESSION_EVICTION_LOCK'],
+)
+
+# Потоки для спекулятивного глибокого режиму. Gemini і локальна генерація мають окремі пули:
+# виклики Gemini, покинуті після дедлайну, не займають потоки локального шляху.
+# Пули створюються в процесі, що обробляє запит (_deep_mode_pools), а не на імпорті
+_deep_mode_pools_state = {'pid': None, 'gemini': None, 'local': None}
+_deep_mode_pools_lock = threading.Lock()
+# Місця для викликів Gemini; місце звільняється, коли виклик справді завершився
+gemini_slots = threading.BoundedSemaphore(app.config['DEEP_MODE_MAX_INFLIGHT'])
+
+# Кеш готових результатів для повторних текстів
+result_cache = ResultCache(
+    max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    disk_dir=app.config['RESULT_CACHE_DIR'],
+)
+
+# Фонова обробка тексту: запит отримує id задачі і не тримає воркер до кінця обчислення
+job_manager = JobManager(
+    max_workers=app.config['JOB_WORKERS'],
+    ttl_seconds=app.config['JOB_TTL_SECONDS'],
+    store=SQLiteJobStore(app.config['JOB_DB_PATH']),
+)
+atexit.register(job_manager.close)
+
+# Дописування ледачих технік у збережені сесії
+session_update_lock = threading.Lock()
+
+# Однакові одночасні запити чекають на одне обчислення. Між воркерами — лише зі спільним
+# дисковим кешем: без нього воркер після чекання не побачить чужого результату і порахує знову
+single_flight = SingleFlight(
+    lock_dir=app.config['SINGLE_FLIGHT_LOCK_DIR'] if app.config['RESULT_CACHE_DIR'] else None,
+    lock_timeout=app.config['DEEP_MODE_DEADLINE'] + 30,
+)
+
+# Виклики Gemini через кеш відповідей (пам'ять + диск, спільний для воркерів)
+gemini_service = GeminiService(
+    get_gemini_client,
+    ResultCache(
+        max_bytes=app.config['GEMINI_CACHE_MAX_BYTES'],
+        disk_dir=app.config['GEMINI_CACHE_DIR'],
+        disk_max_bytes=app.config['GEMINI_CACHE_DISK_MAX_BYTES'],
+        disk_max_age=app.config['GEMINI_CACHE_TTL'] + app.config['GEMINI_CACHE_STALE'],
+    ),
+    ttl_seconds=app.config['GEMINI_CACHE_TTL'],
+    stale_seconds=app.config['GEMINI_CACHE_STALE'],
+    rate_limiter=TokenBucket(app.config['GEMINI_RATE_PER_MINUTE'], app.config['GEMINI_BURST']),
+    breaker=CircuitBreaker(
+        failure_threshold=app.config['GEMINI_BREAKER_FAILURES'],
+        cooldown_seconds=app.config['GEMINI_BREAKER_COOLDOWN'],
+    ),
+    model=app.config['GEMINI_MODEL'],
+)
+atexit.register(gemini_service.close)
+
+
+def start_worker_tasks():
+    """
+    Фонові потоки процесу, що обробляє запити. Gunicorn викликає це з post_fork;
+    інші сервери — з першим запитом процесу. Повторні виклики нічого не роблять.
+    """
+    session_evictor.start()
+
+
+@app.before_request
+def _ensure_worker_tasks():
+    start_worker_tasks()
+
+
+def _request_seed(value):
+    """Параметр seed: ціле число або None (тоді зерно береться з вмісту тексту)"""
+    if value is None or value == '':
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError('Параметр seed має бути цілим числом')
+
+
+def _effective_seed(text, seed=None):
+    return content_seed(text) if seed is None else seed
+
+
+def _generator_for(text, seed=None):
+    """Генератор для запиту: однаковий текст і seed дають однаковий результат"""
+    return MnemonicGenerator(seed=_effective_seed(text, seed))
+
+
+def _local_ai_memory(text, processed_data, generator):
+    """План/поради локально"""
+    try:
+        plan = generator.create_comprehensive_plan(text, processed_data.get('key_phrases', []))
+        study_lines = []
+        for phase in plan.get('phases', []):
+            name = phase.get('name', 'Фаза')
+            dur = phase.get('duration', '-')
+            study_lines.append(f"{name} ({dur})")
+            for a in phase.get('actions', []):
+                study_lines.append(f" - {a}")
+        return {
+            "study_plan": "\n".join(study_lines) if study_lines else "План не вдалося згенерувати.",
+            "tips": plan.get('memory_tips', generator.get_memory_tips()),
+            "mnemonics": []
+        }
+    except Exception:
+        return {
+            "study_plan": "План не вдалося згенерувати.",
+            "tips": generator.get_memory_tips(),
+            "mnemonics": []
+        }
+
+
+def _iter_local_payload(text, techniques=None, seed=None):
+    """
+    ЗВИЧАЙНЕ МИСЛЕННЯ по частинах: (частина, техніка, значення) одразу після обчислення.
+
+    Спершу аналіз тексту, далі мнемоніки по одній техніці, наприкінці резюме і план.
+    """
+    generator = _generator_for(text, seed)
+    processed_data = text_processor.process(text)
+    yield 'processed_data', None, processed_data
+
+    for technique, result in generator.iter_mnemonics(
+        processed_data['key_phrases'],
+        processed_data['main_topics'],
+        techniques
+    ):
+        yield 'mnemonics', technique, result
+
+    yield 'summary', None, generator.generate_summary(processed_data)
+    yield 'ai_memory', None, _local_ai_memory(text, processed_data, generator)
+
+
+def _iter_payload_parts(payload):
+    """Готовий payload (наприклад, з кешу) у тому ж порядку, що й _iter_local_payload"""
+    yield 'processed_data', None, payload['processed_data']
+    for technique, result in payload['mnemonics'].items():
+        yield 'mnemonics', technique, result
+    yield 'summary', None, payload['summary']
+    yield 'ai_memory', None, payload['ai_memory']
+
+
+def _collect_payload(parts):
+    """Збирання payload із частин"""
+    payload = {'mnemonics': {}, 'ai_full': None}
+    for part, technique, value in parts:
+        if part == 'mnemonics':
+            payload['mnemonics'][technique] = value
+        else:
+            payload[part] = value
+    return payload
+
+
+def _local_payload(text, techniques=None, seed=None):
+    """ЗВИЧАЙНЕ МИСЛЕННЯ: аналіз, мнемоніки, план і резюме локальною моделлю"""
+    return _collect_payload(_iter_local_payload(text, techniques, seed))
+
+
+def _deep_payload(text):
+    """ГЛИБОКЕ МИСЛЕННЯ: усе робить нейромережа"""
+    ai_full = gemini_service.generate_full_mnemonics(text)
+    
+    # Відладочна інформація (можна видалити після тестування)
+    tips_from_gemini = ai_full.get('tips', [])
+    if not tips_from_gemini or len(tips_from_gemini) == 0:
+        print(f"⚠️ УВАГА: Gemini не повернула поради або повернула порожній масив. ai_full.keys() = {list(ai_full.keys())}")
+    else:
+        print(f"✅ Gemini повернула {len(tips_from_gemini)} порад")
+    
+    # Якщо успішно отримали дані від нейромережі
+    analysis = ai_full.get('analysis', {})
+    processed_data = {
+        'cleaned_text': text,
+        'sentences_count': analysis.get('sentence_count', 0),
+        'words_count': analysis.get('word_count', 0),
+        'key_words': analysis.get('keywords', []),
+        'key_phrases': [],
+        'main_topics': [],
+        'complexity': {
+            'level': analysis.get('complexity_level', 'Невідомий')
+        },
+        'readability': 0,
+    }
+
+    # Усі мнемоніки – рядки від нейромережі
+    mnemonics = {
+        'acronyms': ai_full.get('acronyms', []),
+        'acrostics': ai_full.get('acrostics', []),
+        'stories': ai_full.get('stories', []),
+        'rhymes': ai_full.get('rhymes', []),
+        'visuals': ai_full.get('visuals', []),
+    }
+
+    # Беремо поради від Gemini, якщо вони є і не пусті
+    gemini_tips = ai_full.get('tips', [])
+    if not gemini_tips or (isinstance(gemini_tips, list) and len(gemini_tips) == 0):
+        # Якщо Gemini не повернула поради - використовуємо порожній список
+        # (не будемо підміняти локальними, щоб було видно що Gemini не дала порад)
+        gemini_tips = []
+
+    return {
+        'processed_data': processed_data,
+        'mnemonics': mnemonics,
+        'summary': "Глибоке мислення: повний аналіз та мнемоніки створені нейромережею.",
+        'ai_memory': {
+            "study_plan": ai_full.get('study_plan', ''),
+            "tips": gemini_tips,  # Тільки поради від Gemini
+            "mnemonics": [],
+        },
+        'ai_full': ai_full,
+    }
+
+
+def _deep_mode_pools():
+    """Пули глибокого режиму (Gemini, локальний) поточного процесу; після fork — нові"""
+    state = _deep_mode_pools_state
+    with _deep_mode_pools_lock:
+        if state['pid'] != os.getpid():
+            for name, prefix in (('gemini', 'deep-mode'), ('local', 'deep-local')):
+                state[name] = ThreadPoolExecutor(
+                    max_workers=app.config['DEEP_MODE_WORKERS'],
+                    thread_name_prefix=prefix,
+                )
+                atexit.register(state[name].shutdown, wait=False)
+            state['pid'] = os.getpid()
+        return state['gemini'], state['local']
+
+
+class _GeminiBusy(Exception):
+    """Усі місця для викликів Gemini зайняті"""
+
+
+def _submit_gemini(text):
+    """Виклик Gemini у пулі глибокого режиму або None, якщо місць немає"""
+    if not gemini_slots.acquire(blocking=False):
+        return None
+    try:
+        future = _deep_mode_pools()[0].submit(_deep_payload, text)
+    except BaseException:
+        gemini_slots.release()
+        raise
+    future.add_done_callback(lambda _: gemini_slots.release())
+    return future
+
+
+def _race_deep_payload(text, techniques=None, seed=None):
+    """
+    Спекулятивний глибокий режим: Gemini і локальна генерація стартують одночасно.
+
+    Якщо Gemini не встигла до дедлайну або впала, одразу повертається локальний
+    результат. Коли всі місця для викликів Gemini зайняті, Gemini не викликається.
+    Повертає (payload, фактичний режим, інформація про переможця).
+    """
+    started = time.perf_counter()
+    local_future = _deep_mode_pools()[1].submit(_local_payload, text, techniques, seed)
+    deep_future = _submit_gemini(text)
+
+    try:
+        if deep_future is None:
+            raise _GeminiBusy
+        payload = deep_future.result(timeout=app.config['DEEP_MODE_DEADLINE'])
+        # Локальний результат уже не потрібен; якщо він ще в черзі — не запускаємо
+        local_future.cancel()
+        winner = {'path': 'gemini', 'reason': None}
+        used_mode = 'deep'
+    except _GeminiBusy:
+        winner = {'path': 'local', 'reason': 'busy'}
+    except FutureTimeoutError:
+        # Gemini дорахує у фоні, але її відповідь уже ніхто не чекає
+        winner = {'path': 'local', 'reason': 'timeout'}
+    except GeminiUnavailable as e:
+        winner = {'path': 'local', 'reason': 'circuit_open', 'error': str(e)}
+    except RuntimeError as e:
+        error_msg = str(e).lower()
+        reason = 'quota' if "квот" in error_msg or "quota" in error_msg else 'error'
+        winner = {'path': 'local', 'reason': reason, 'error': str(e)}
+    except Exception as e:
+        winner = {'path': 'local', 'reason': 'error', 'error': str(e)}
+
+    if winner['path'] == 'local':
+        # Якщо локальна генерація ще чекає на потік, рахуємо її тут, а не стоїмо в черзі
+        if local_future.cancel():
+            payload = _local_payload(text, techniques, seed)
+        else:
+            payload = local_future.result()
+        used_mode = 'normal'
+
+    winner['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return payload, used_mode, winner
+
+
+def _compute_payload(text, mode, techniques=None, seed=None):
+    """Обчислення результату; повертає (payload, фактичний режим, інформація про переможця)"""
+    if mode == 'deep':
+        return _race_deep_payload(text, techniques, seed)
+    return _local_payload(text, techniques, seed), 'normal', None
+
+
+def _requested_techniques(value):
+    """
+    Техніки з параметра techniques (список або рядок через кому) як ключі результату;
+    None — усі техніки.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = [name for name in value.split(',') if name.strip()]
+    return [spec.key for spec in resolve_techniques(value)]
+
+
+def _cache_mode(mode, techniques, seed=None):
+    """
+    Набір технік і явний seed входять у ключ кешу разом із режимом; зерно
+    за замовчуванням — функція тексту, тож окремо його враховувати не треба
+    """
+    key = mode if techniques is None else f"{mode}:{','.join(techniques)}"
+    return key if seed is None else f"{key};seed={seed}"
+
+
+def _compute_and_store(key, text, mode, techniques=None, seed=None):
+    """
+    Обчислення під single-flight; повертає (запис кешу, рівень кешу, переможець глибокого режиму).
+
+    Виконується з блокуванням між воркерами, тож спершу перевіряємо, чи інший
+    воркер уже не поклав результат у спільний кеш.
+    """
+    cached, tier = _cache_get(key, record=False)
+    if cached is not None:
+        return cached, tier, None
+
+    payload, used_mode, deep_path = _compute_payload(text, mode, techniques, seed)
+    entry = {'payload': payload, 'mode': used_mode}
+    if mode == 'deep' and used_mode != 'deep':
+        # Fallback із глибокого режиму кешуємо ненадовго: воркери, що чекали на блокуванні,
+        # беруть його, а після DEEP_MODE_FALLBACK_TTL запит знову спробує Gemini
+        entry['expires_at'] = time.time() + app.config['DEEP_MODE_FALLBACK_TTL']
+    result_cache.put(key, entry)
+    return entry, None, deep_path
+
+
+def _cache_get(key, record=True):
+    """Запис кешу результатів, якщо він не прострочений; повертає (запис, рівень кешу)"""
+    cached, tier = result_cache.get(key, record=record)
+    if cached is not None and cached.get('expires_at', float('inf')) <= time.time():
+        result_cache.delete(key)
+        return None, None
+    return cached, tier
+
+
+def _cached_payload(text, mode, techniques=None, seed=None):
+    """
+    Результат з кешу або нове обчислення.
+
+    Однакові одночасні запити чекають на одне обчислення (single-flight).
+    Повертає (payload, фактичний режим, метадані кешу, переможець глибокого режиму).
+    """
+    key = content_key(text, _cache_mode(mode, techniques, seed), GENERATOR_VERSION)
+    cached, tier = _cache_get(key)
+    coalesced = False
+    if cached is not None:
+        deep_path = {'path': 'cache', 'reason': None} if mode == 'deep' else None
+    else:
+        (cached, tier, deep_path), coalesced = single_flight.do(
+            key, lambda: _compute_and_store(key, text, mode, techniques, seed)
+        )
+        if deep_path is None and mode == 'deep':
+            # Результат узяли з кешу, який заповнив інший воркер
+            deep_path = {'path': 'cache', 'reason': None}
+
+    cache_meta = dict(result_cache.stats(), hit=tier is not None, tier=tier, coalesced=coalesced)
+    return cached['payload'], cached['mode'], cache_meta, deep_path
 
 
 @app.route('/api/gemini_help', methods=['POST'])
@@ -48,20 +509,43 @@ def gemini_help():
                 'error': 'Текст занадто короткий для покращення. Мінімум 10 символів.'
             }), 400
 
-        client = get_gemini_client()
-        improved_text = client.improve_text(text, language=language)
+        improved_text = gemini_service.improve_text(text, language=language)
 
         return jsonify({
             'success': True,
             'improved_text': improved_text
         })
 
+    except GeminiQuotaExceeded as e:
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = str(int(gemini_service.rate_limiter.stats()['retry_after']) + 1)
+        return response, 429
+    except GeminiUnavailable as e:
+        response = jsonify({
+            'success': False,
+            'error': str(e)
+        })
+        response.headers['Retry-After'] = str(int(gemini_service.breaker.retry_after()) + 1)
+        return response, 503
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'Помилка Gemini: {str(e)}'
         }), 500
 
+@app.route('/api/gemini_status')
+def gemini_status():
+    """API зі станом доступу до Gemini: запобіжник, залишок бюджету запитів і кеш відповідей"""
+    return jsonify(dict(gemini_service.stats(), success=True))
+
+@app.route('/api/generator_status')
+def generator_status():
+    """API зі станом генератора мнемонік: кеш результатів технік для окремих фраз"""
+    return jsonify({'success': True, 'version': GENERATOR_VERSION, 'memo': MnemonicGenerator.memo.stats()})
+
 @app.route('/')
 def index():
     """Головна сторінка"""
@@ -72,9 +556,105 @@ def upload_page():
     """Сторінка завантаження"""
     return render_template('upload.html')
 
+def _save_session(text, payload, mode, deep_path, session_id=None, seed=None):
+    """Збереження результатів сесії; повертає дані сесії"""
+    # Створюємо унікальний ID для сесії
+    session_id = session_id or new_session_id()
+    
+    # Зберігаємо результати
+    result_data = {
+        'session_id': session_id,
+        'timestamp': datetime.now().isoformat(),
+        'original_text': text[:500] + '...' if len(text) > 500 else text,
+        'processed_data': payload['processed_data'],
+        # Копія: ледачі техніки дописуються в сесію, а payload лежить у кеші результатів
+        'mnemonics': dict(payload['mnemonics']),
+        'summary': payload['summary'],
+        'ai_memory': payload['ai_memory'],
+        'ai_full': payload['ai_full'] if mode == 'deep' else None,
+        'deep_path': deep_path,
+        # Зерно, з яким згенеровано мнемоніки: ледачі техніки сесії беруть його ж
+        'seed': _effective_seed(text, seed),
+    }
+    
+    session_store.save(session_id, result_data)
+    return result_data
+
+
+def _build_session(text, mode, session_id=None, techniques=None, seed=None):
+    """Обробка тексту і збереження результатів сесії; повертає тіло відповіді API"""
+    payload, mode, cache_meta, deep_path = _cached_payload(text, mode, techniques, seed)
+    result_data = _save_session(text, payload, mode, deep_path, session_id, seed)
+    
+    return {
+        'success': True,
+        'session_id': result_data['session_id'],
+        'data': result_data,
+        'meta': {'cache': cache_meta, 'deep_path': deep_path}
+    }
+
+
+def _ndjson(record):
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def _stream_session(text, techniques=None, seed=None):
+    """
+    Рядки NDJSON для потокової обробки: processed_data, далі кожна техніка окремо,
+    потім summary і ai_memory; останній рядок — done з id сесії (або error).
+    """
+    key = content_key(text, _cache_mode('normal', techniques, seed), GENERATOR_VERSION)
+    cached, tier = result_cache.get(key)
+    if cached is not None:
+        parts = _iter_payload_parts(cached['payload'])
+    else:
+        parts = _iter_local_payload(text, techniques, seed)
+    collected = []
+    
+    try:
+        for part, technique, value in parts:
+            collected.append((part, technique, value))
+            record = {'type': part, 'data': value}
+            if technique is not None:
+                record['technique'] = technique
+            yield _ndjson(record)
+        
+        payload = _collect_payload(collected)
+        if cached is None:
+            result_cache.put(key, {'payload': payload, 'mode': 'normal'})
+        result_data = _save_session(text, payload, 'normal', None, seed=seed)
+        
+        yield _ndjson({
+            'type': 'done',
+            'session_id': result_data['session_id'],
+            'meta': {'cache': dict(result_cache.stats(), hit=cached is not None, tier=tier)},
+        })
+    except Exception as e:
+        yield _ndjson({'type': 'error', 'error': str(e)})
+
+
+def _is_async_request(value):
+    """Прапорець async приходить як bool у JSON або як рядок у формі"""
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def _submit_job(text, mode, techniques=None, seed=None):
+    """Фонова обробка: id задачі збігається з id майбутньої сесії"""
+    job_id = new_session_id()
+    job = job_manager.submit(job_id, _build_session, text, mode, job_id, techniques, seed)
+    return jsonify(dict(
+        job.to_dict(include_result=False),
+        success=True,
+        poll_url=f'/api/jobs/{job_id}',
+        events_url=f'/api/jobs/{job_id}/events',
+    )), 202
+
+
 @app.route('/api/process_text', methods=['POST'])
 def process_text():
-    """API для обробки тексту"""
+    """API для обробки тексту (з async=true — фоновою задачею)"""
     try:
         data = request.json
         text = data.get('text', '')
@@ -86,129 +666,13 @@ def process_text():
                 'error': 'Текст занадто короткий. Мінімум 10 символів.'
             })
         
-        ai_full = None
-        if mode == 'deep':
-            # ГЛИБОКЕ МИСЛЕННЯ: усе робить нейромережа
-            try:
-                client = get_gemini_client()
-                ai_full = client.generate_full_mnemonics(text)
-                
-                # Відладочна інформація (можна видалити після тестування)
-                tips_from_gemini = ai_full.get('tips', [])
-                if not tips_from_gemini or len(tips_from_gemini) == 0:
-                    print(f"⚠️ УВАГА: Gemini не повернула поради або повернула порожній масив. ai_full.keys() = {list(ai_full.keys())}")
-                else:
-                    print(f"✅ Gemini повернула {len(tips_from_gemini)} порад")
-                
-                # Якщо успішно отримали дані від нейромережі
-                analysis = ai_full.get('analysis', {})
-                processed_data = {
-                    'cleaned_text': text,
-                    'sentences_count': analysis.get('sentence_count', 0),
-                    'words_count': analysis.get('word_count', 0),
-                    'key_words': analysis.get('keywords', []),
-                    'key_phrases': [],
-                    'main_topics': [],
-                    'complexity': {
-                        'level': analysis.get('complexity_level', 'Невідомий')
-                    },
-                    'readability': 0,
-                }
-
-                # Усі мнемоніки – рядки від нейромережі
-                mnemonics = {
-                    'acronyms': ai_full.get('acronyms', []),
-                    'acrostics': ai_full.get('acrostics', []),
-                    'stories': ai_full.get('stories', []),
-                    'rhymes': ai_full.get('rhymes', []),
-                    'visuals': ai_full.get('visuals', []),
-                }
-
-                summary_text = "Глибоке мислення: повний аналіз та мнемоніки створені нейромережею."
-                # Беремо поради від Gemini, якщо вони є і не пусті
-                gemini_tips = ai_full.get('tips', [])
-                if not gemini_tips or (isinstance(gemini_tips, list) and len(gemini_tips) == 0):
-                    # Якщо Gemini не повернула поради - використовуємо порожній список
-                    # (не будемо підміняти локальними, щоб було видно що Gemini не дала порад)
-                    gemini_tips = []
-                
-                ai_memory = {
-                    "study_plan": ai_full.get('study_plan', ''),
-                    "tips": gemini_tips,  # Тільки поради від Gemini
-                    "mnemonics": [],
-                }
-            except RuntimeError as e:
-                # Якщо помилка квоти - fallback на локальну генерацію
-                error_msg = str(e)
-                if "квот" in error_msg.lower() or "quota" in error_msg.lower():
-                    # Переходимо на звичайний режим
-                    mode = 'normal'
-                else:
-                    # Інша помилка - прокидаємо далі
-                    raise
-            except Exception:
-                # Будь-яка інша помилка - fallback на локальну генерацію
-                mode = 'normal'
-        
-        if mode != 'deep' or ai_full is None:
-            # ЗВИЧАЙНЕ МИСЛЕННЯ: локальна модель (або fallback з глибокого)
-            # ЗВИЧАЙНЕ МИСЛЕННЯ: локальна модель
-            processed_data = text_processor.process(text)
-
-            mnemonics = generator.generate_mnemonics(
-                processed_data['key_phrases'],
-                processed_data['main_topics']
-            )
-
-            # План/поради локально
-            try:
-                plan = generator.create_comprehensive_plan(text, processed_data.get('key_phrases', []))
-                study_lines = []
-                for phase in plan.get('phases', []):
-                    name = phase.get('name', 'Фаза')
-                    dur = phase.get('duration', '-')
-                    study_lines.append(f"{name} ({dur})")
-                    for a in phase.get('actions', []):
-                        study_lines.append(f" - {a}")
-                ai_memory = {
-                    "study_plan": "\n".join(study_lines) if study_lines else "План не вдалося згенерувати.",
-                    "tips": plan.get('memory_tips', generator.get_memory_tips()),
-                    "mnemonics": []
-                }
-            except Exception:
-                ai_memory = {
-                    "study_plan": "План не вдалося згенерувати.",
-                    "tips": generator.get_memory_tips(),
-                    "mnemonics": []
-                }
-
-            summary_text = generator.generate_summary(processed_data)
+        techniques = _requested_techniques(data.get('techniques'))
+        seed = _request_seed(data.get('seed'))
         
-        # Створюємо унікальний ID для сесії
-        session_id = str(uuid.uuid4())[:8]
+        if _is_async_request(data.get('async')):
+            return _submit_job(text, mode, techniques, seed)
         
-        # Зберігаємо результати
-        result_data = {
-            'session_id': session_id,
-            'timestamp': datetime.now().isoformat(),
-            'original_text': text[:500] + '...' if len(text) > 500 else text,
-            'processed_data': processed_data,
-            'mnemonics': mnemonics,
-            'summary': summary_text if mode == 'deep' else summary_text,
-            'ai_memory': ai_memory,
-            'ai_full': ai_full if mode == 'deep' else None,
-        }
-        
-        # Зберігаємо у файл
-        filename = f"static/user_data/session_{session_id}.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
-        
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'data': result_data
-        })
+        return jsonify(_build_session(text, mode, techniques=techniques, seed=seed))
         
     except Exception as e:
         return jsonify({
@@ -245,59 +709,16 @@ def upload_file():
             else:
                 return jsonify({'success': False, 'error': 'Формат файлу не підтримується'})
             
-            # Обробляємо текст
-            processed_data = text_processor.process(text)
-            
-            # Генеруємо мнемоніки класичним генератором (локальний ШІ)
-            mnemonics = generator.generate_mnemonics(
-                processed_data['key_phrases'],
-                processed_data['main_topics']
-            )
-
+            # Обробляємо текст класичним генератором (локальний ШІ).
             # Для завантажених файлів використовуємо лише локальний план (без Gemini),
             # щоб "глибоке мислення" було лише для тексту з форми.
-            try:
-                plan = generator.create_comprehensive_plan(text, processed_data.get('key_phrases', []))
-                study_lines = []
-                for phase in plan.get('phases', []):
-                    name = phase.get('name', 'Фаза')
-                    dur = phase.get('duration', '-')
-                    study_lines.append(f"{name} ({dur})")
-                    for a in phase.get('actions', []):
-                        study_lines.append(f" - {a}")
-                ai_memory = {
-                    "study_plan": "\n".join(study_lines) if study_lines else "План не вдалося згенерувати.",
-                    "tips": plan.get('memory_tips', generator.get_memory_tips()),
-                    "mnemonics": []
-                }
-            except Exception:
-                ai_memory = {
-                    "study_plan": "План не вдалося згенерувати.",
-                    "tips": generator.get_memory_tips(),
-                    "mnemonics": []
-                }
-            
-            session_id = str(uuid.uuid4())[:8]
+            techniques = _requested_techniques(request.form.get('techniques'))
+            seed = _request_seed(request.form.get('seed'))
             
-            result_data = {
-                'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
-                'original_text': text[:500] + '...' if len(text) > 500 else text,
-                'processed_data': processed_data,
-                'mnemonics': mnemonics,
-                'summary': generator.generate_summary(processed_data),
-                'ai_memory': ai_memory,
-            }
+            if _is_async_request(request.form.get('async')):
+                return _submit_job(text, 'normal', techniques, seed)
             
-            filename = f"static/user_data/session_{session_id}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
-            
-            return jsonify({
-                'success': True,
-                'session_id': session_id,
-                'data': result_data
-            })
+            return jsonify(_build_session(text, 'normal', techniques=techniques, seed=seed))
             
     except Exception as e:
         return jsonify({
@@ -305,6 +726,95 @@ def upload_file():
             'error': f'Помилка обробки файлу: {str(e)}'
         })
 
+@app.route('/api/process_text_stream', methods=['POST'])
+def process_text_stream():
+    """API для потокової обробки тексту (NDJSON): кожна частина результату — окремий рядок"""
+    data = request.json or {}
+    text = data.get('text', '') or ''
+    
+    if len(text.strip()) < 10:
+        return jsonify({
+            'success': False,
+            'error': 'Текст занадто короткий. Мінімум 10 символів.'
+        })
+    
+    try:
+        techniques = _requested_techniques(data.get('techniques'))
+        seed = _request_seed(data.get('seed'))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    return Response(
+        stream_with_context(_stream_session(text, techniques, seed)),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+def _finished_job_from_store(job_id):
+    """Задача з іншого воркера чи після перезапуску: результат шукаємо серед сесій"""
+    data = session_store.load(job_id)
+    if data is None:
+        return None
+    return {
+        'job_id': job_id,
+        'status': 'done',
+        'result': {'success': True, 'session_id': job_id, 'data': data, 'meta': {}},
+    }
+
+def _job_state(job_id):
+    """
+    Стан задачі незалежно від воркера, що її виконує. Результат задачі з
+    іншого воркера береться зі сховища сесій; поки він туди не записаний,
+    задача вважається ще не завершеною.
+    """
+    state = job_manager.state(job_id)
+    if state is None:
+        return _finished_job_from_store(job_id)
+    if state['status'] == 'done' and 'result' not in state:
+        finished = _finished_job_from_store(job_id)
+        if finished is None:
+            return dict(state, status='running')
+        state['result'] = finished['result']
+    return state
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """API для опитування стану фонової задачі"""
+    state = _job_state(job_id)
+    if state is None:
+        return jsonify({
+            'success': False,
+            'error': 'Задача не знайдена'
+        }), 404
+    return jsonify(dict(state, success=True))
+
+@app.route('/api/jobs/<job_id>/events')
+def api_job_events(job_id):
+    """
+    Потік подій (SSE) про стан фонової задачі; остання подія — done. Потік
+    закривається через JOB_SSE_MAX_SECONDS, далі клієнт опитує /api/jobs/<id>.
+    """
+    if _job_state(job_id) is None:
+        return jsonify({
+            'success': False,
+            'error': 'Задача не знайдена'
+        }), 404
+    
+    events = job_manager.events(
+        job_id,
+        _job_state,
+        heartbeat=app.config['JOB_SSE_HEARTBEAT'],
+        max_seconds=app.config['JOB_SSE_MAX_SECONDS'],
+    )
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 @app.route('/result/<session_id>')
 def show_result(session_id):
     """Сторінка результатів"""
@@ -314,30 +824,84 @@ def show_result(session_id):
 def api_get_result(session_id):
     """API для отримання результатів сесії"""
     try:
-        filename = f"static/user_data/session_{session_id}.json"
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = session_store.load(session_id)
+        if data is None:
+            return jsonify({
+                'success': False,
+                'error': 'Сесія не знайдена'
+            }), 404
         
         return jsonify({
             'success': True,
             'data': data
         })
         
-    except FileNotFoundError:
-        return jsonify({
-            'success': False,
-            'error': 'Сесія не знайдена'
-        }), 404
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/mnemonics/<session_id>/<technique>')
+def api_get_technique(session_id, technique):
+    """API для ледачої генерації однієї техніки для збереженої сесії"""
+    try:
+        key = resolve_techniques([technique])[0].key
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    data = session_store.load(session_id)
+    if data is None:
+        return jsonify({
+            'success': False,
+            'error': 'Сесія не знайдена'
+        }), 404
+    
+    cached = key in (data.get('mnemonics') or {})
+    if cached:
+        result = data['mnemonics'][key]
+    else:
+        try:
+            processed = data.get('processed_data') or {}
+            # Старі сесії без зерна генеруються як раніше, без відтворюваності
+            generator = MnemonicGenerator(seed=data.get('seed'))
+            # У глибокому режимі фраз немає — беремо ключові слова від Gemini
+            result = generator.generate_mnemonics(
+                processed.get('key_phrases') or processed.get('key_words') or [],
+                processed.get('main_topics') or [],
+                [key]
+            )[key]
+            
+            # Дописуємо техніку в сесію; читання і запис не перетинаються з іншими техніками
+            with session_update_lock:
+                # Змінюємо копію: сховище чи кеш результатів можуть віддавати спільний об'єкт
+                data = copy.deepcopy(session_store.load(session_id) or data)
+                data.setdefault('mnemonics', {})[key] = result
+                session_store.save(session_id, data)
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    return jsonify({
+        'success': True,
+        'technique': key,
+        'data': result,
+        'cached': cached
+    })
+
 @app.route('/api/get_memory_tips')
 def get_memory_tips():
-    """API для отримання порад щодо пам'яті"""
-    tips = generator.get_memory_tips()
+    """API для отримання порад щодо пам'яті (з ?seed= — відтворюваний набір)"""
+    try:
+        seed = _request_seed(request.args.get('seed'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    tips = MnemonicGenerator(seed=seed).get_memory_tips()
     return jsonify({'tips': tips})
 
 @app.route('/api/generate_story', methods=['POST'])
@@ -350,7 +914,8 @@ def generate_story():
         if not keywords:
             return jsonify({'success': False, 'error': 'Немає ключових слів'})
         
-        story = generator.generate_story(keywords)
+        seed = _request_seed(data.get('seed'))
+        story = _generator_for(' '.join(map(str, keywords)), seed).generate_story(keywords)
         
         return jsonify({
             'success': True,
@@ -373,7 +938,7 @@ def generate_quiz():
         if not text:
             return jsonify({'success': False, 'error': 'Немає тексту'})
         
-        quiz = generator.generate_quiz(text)
+        quiz = _generator_for(text, _request_seed(data.get('seed'))).generate_quiz(text)
         
         return jsonify({
             'success': True,
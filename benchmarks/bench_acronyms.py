@@ -0,0 +1,70 @@
+"""
+Бенчмарк пошуку акронімів: затримка на 7 і 12 фразах.
+
+Кожен набір фраз шукається без кешу (холодний пошук), тож найгірший час
+показує, скільки коштує бюджет вузлів перебору, а частка повних — як часто
+його вистачає. Окремо заміряється повторний пошук тих самих фраз в іншому
+порядку — він має братися з кешу.
+
+Запуск: python benchmarks/bench_acronyms.py [кількість_наборів] [шлях_до_словника]
+Без шляху використовується MNEMONIC_LEXICON або вбудований словник.
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from acronyms import AcronymSearch
+from ai_model import lexicon
+from lexicon import Lexicon
+
+PHRASE_WORDS = (
+    "економічна функція підприємства соціальна відповідальність інноваційний розвиток "
+    "ресурсне забезпечення стратегічне планування конкурентоспроможність ринку етичне "
+    "ставлення працівників довкілля матеріальні людські фінансові ресурси довгострокові "
+    "цілі компанії аналіз витрат облік капітал оборот прибуток ризик управління якість"
+).split()
+
+
+def make_phrases(rng: random.Random, count: int):
+    return [' '.join(rng.sample(PHRASE_WORDS, rng.randint(1, 3))) for _ in range(count)]
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def main(sets: int, lexicon_path=None):
+    lex = Lexicon.open(lexicon_path) if lexicon_path else lexicon()
+    print(f"Слів у словнику: {len(lex)}, наборів фраз: {sets}")
+    print(f"{'фраз':>5} {'медіана, мс':>12} {'p99, мс':>9} {'макс, мс':>9} {'повних':>7} {'кеш, мкс':>9}")
+    for count in (7, 12):
+        rng = random.Random(count)
+        search = AcronymSearch(lex)
+        cold, cached, complete = [], [], 0
+        for _ in range(sets):
+            phrases = make_phrases(rng, count)
+            began = time.perf_counter()
+            result = search.search(phrases)
+            cold.append((time.perf_counter() - began) * 1000)
+            complete += bool(result and result['complete'])
+
+            # Переставляємо лише фрази, які пошук бере до уваги
+            head = phrases[:search.max_phrases]
+            rng.shuffle(head)
+            phrases = head + phrases[len(head):]
+            began = time.perf_counter()
+            search.search(phrases)
+            cached.append((time.perf_counter() - began) * 1_000_000)
+        print(f"{count:>5} {statistics.median(cold):>12.2f} {percentile(cold, 0.99):>9.2f} "
+              f"{max(cold):>9.2f} {complete / sets:>7.0%} {statistics.median(cached):>9.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+         sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,47 @@
+"""
+Бенчмарк паралельної (map-reduce) обробки великих текстів.
+
+Порівнює послідовний TextProcessor.process з process_parallel для різної
+кількості процесів і перевіряє, що результати однакові.
+
+Запуск: python benchmarks/bench_parallel.py [розмір_у_КБ]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_text_processor import make_text
+from utils import TextProcessor
+
+
+def main(size_kb: int):
+    text = make_text(size_kb)
+
+    serial = TextProcessor(parallel_threshold=None)
+    start = time.perf_counter()
+    expected = serial.process(text)
+    serial_time = time.perf_counter() - start
+    print(f"Текст {size_kb}КБ, ядер: {os.cpu_count()}")
+    print(f"{'процесів':>9} {'час, с':>8} {'прискорення':>12}")
+    print(f"{'серійно':>9} {serial_time:>8.3f} {1:>11.2f}x")
+
+    workers = 2
+    while workers <= max(2, os.cpu_count() or 1):
+        processor = TextProcessor(parallel_workers=workers)
+        processor.process_parallel(text[:10_000])  # прогрів пулу процесів
+        start = time.perf_counter()
+        result = processor.process_parallel(text)
+        elapsed = time.perf_counter() - start
+        processor.close()
+        assert result['key_words'] == expected['key_words']
+        assert result['key_phrases'] == expected['key_phrases']
+        print(f"{workers:>9} {elapsed:>8.3f} {serial_time / elapsed:>11.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8192)
@@ -0,0 +1,63 @@
+"""
+Бенчмарк старту застосунку: час імпорту app і перших запитів.
+
+Кожен замір — окремий процес Python у тимчасовому каталозі (сесії та кеші
+пишуться туди), тож вимірюється саме холодний старт воркера.
+
+Запуск: python benchmarks/bench_startup.py [кількість_запусків]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r'''
+import json
+import time
+
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+client = app.app.test_client()
+text = (
+    "Економічна функція підприємства виражає його роль у задоволенні потреб суспільства. "
+    "Соціальна відповідальність вимагає етичного ставлення до працівників і довкілля. "
+) * 20
+timings = {'import': imported - start}
+for name, body in (('first_request', text), ('second_request', text + ' Нове речення.')):
+    began = time.perf_counter()
+    response = client.post('/api/process_text', json={'text': body})
+    assert response.get_json()['success'], response.get_json()
+    timings[name] = time.perf_counter() - began
+print(json.dumps(timings))
+'''
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    with tempfile.TemporaryDirectory() as workdir:
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD],
+            cwd=workdir, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs: int):
+    samples = [run_once() for _ in range(runs)]
+    print(f"Запусків: {runs}")
+    print(f"{'етап':>16} {'медіана, мс':>12} {'мін, мс':>9}")
+    for name in ('import', 'first_request', 'second_request'):
+        values = [sample[name] * 1000 for sample in samples]
+        print(f"{name:>16} {statistics.median(values):>12.1f} {min(values):>9.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
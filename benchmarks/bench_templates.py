@@ -0,0 +1,167 @@
+"""
+Бенчмарк шаблонів тексту мнемонік: час, пікова пам'ять і кількість
+виділень на виклик.
+
+Порівнює попередню схему, де списки шаблонів і таблиці будувалися заново в
+кожному виклику, а текст збирався через str.format, з шаблонами й таблицями
+з mnemonic_templates (str.format_map). Обидві сторони повертають той самий
+результат, що й відповідний метод генератора. Через tracemalloc рахуються
+пік пам'яті понад рівень перед викликом і кількість блоків, що лишаються
+виділеними після виклику (результат утримується).
+
+Запуск: python benchmarks/bench_templates.py [кількість_викликів]
+"""
+
+import os
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_model import MnemonicGenerator, compiled_templates
+
+PHRASES = [
+    "економічна функція", "соціальна відповідальність", "інноваційний розвиток",
+    "ресурсне забезпечення", "стратегічне планування", "конкурентоспроможність ринку",
+    "етичне ставлення", "матеріальні ресурси", "довгострокові цілі", "аналіз витрат",
+]
+
+
+def legacy_connection(rng: random.Random, word1: str, word2: str) -> str:
+    """Попередня схема: усі варіанти тексту форматуються на кожен виклик"""
+    connections = [
+        f"{word1} приводить до {word2}",
+        f"{word1} трансформується в {word2}",
+        f"{word1} дружить з {word2}",
+        f"{word1} створює {word2}",
+        f"{word1} знаходить {word2}",
+        f"{word1} зв'язується з {word2}",
+        f"{word1} перетворюється на {word2}",
+        f"{word1} нагадує про {word2}",
+    ]
+    return rng.choice(connections)
+
+
+def legacy_visual(rng: random.Random, simple_phrase: str) -> dict:
+    """Попередня схема: списки будуються в кожному виклику, текст — через str.format"""
+    visual_templates = [
+        "Уявіть {phrase} у вигляді {image}",
+        "{phrase} нагадує {association}",
+        "Порівняйте {phrase} з {comparison}",
+        "Зобразіть {phrase} як {visual}",
+        "Я бачу {phrase} як {image}",
+        "Уявіть, що {phrase} це {association}",
+    ]
+    common_images = [
+        "яскравого сонця", "великої гори", "швидкої річки",
+        "квітучого дерева", "мудрої сови", "сильного ведмедя",
+        "швидкого поїзда", "високого будинку", "глибокого моря",
+        "яскравої зірки", "теплого вогню", "свіжого вітру",
+        "метелика", "золотого льву", "діамантового кристалу",
+    ]
+    colors = [
+        "червоного", "синього", "зеленого", "жовтого", "фіолетового",
+        "помаранчевого", "рожевого", "білого", "чорного", "золотого",
+        "срібного", "бірюзового", "малинового",
+    ]
+    template = rng.choice(visual_templates)
+    image = rng.choice(common_images)
+    color = rng.choice(colors)
+    visualization = template.format(
+        phrase=simple_phrase, image=f"{color} {image}", association=f"{color} {image}",
+        comparison=f"{color} {image}", visual=f"{color} {image}"
+    )
+    return {
+        'phrase': simple_phrase,
+        'visualization': visualization,
+        'suggested_image': f"{color} {image}",
+        'explanation': 'Створіть яскравий ментальний образ',
+        'color': color,
+        'image': image,
+        'visual_strength': 'дуже висока'
+    }
+
+
+def legacy_numbers(phrases):
+    """Попередня схема: таблиця образів будується на кожен виклик"""
+    number_images = {
+        1: "стовп", 2: "лебідь", 3: "тризуб", 4: "човен", 5: "гачок",
+        6: "вишня", 7: "коса", 8: "очки", 9: "куля", 10: "пальці",
+        11: "близнюки", 12: "годинник", 13: "чорт", 14: "кілт", 15: "пенал",
+        20: "гуска", 30: "трійка", 40: "сорок", 50: "полтинник", 100: "сотня",
+    }
+    results = []
+    for i, phrase in enumerate(phrases[:15]):
+        num = i + 1
+        if num in number_images:
+            image = number_images[num]
+            simple_phrase = phrase.split()[0] if phrase.split() else phrase[:15]
+            results.append({
+                'number': num,
+                'phrase': simple_phrase,
+                'image': image,
+                'association': f"{num} = {image} → асоціюйте з '{simple_phrase}'",
+                'explanation': f"Зв'яжіть число {num} з образом \"{image}\" для запам'ятовування",
+                'position': num,
+                'visual_connection': f"Уявіть {image} разом з {simple_phrase}",
+            })
+    return results
+
+
+def measure(func, calls: int):
+    """Середні на виклик: час (мкс), пік пам'яті (байти) і утримані блоки"""
+    # Найкращий з п'яти прогонів: шум від інших процесів лише додає час
+    elapsed = min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1_000_000
+
+    tracemalloc.start()
+    peak_total = 0
+    for _ in range(calls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+
+    kept = []
+    before = tracemalloc.take_snapshot()
+    for _ in range(calls):
+        kept.append(func())
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    # Блоки самого списку kept не належать до виклику
+    blocks -= 1
+    return elapsed, peak_total / calls, blocks / calls
+
+
+def main(calls: int):
+    generator = MnemonicGenerator(seed=1)
+    rng = random.Random(1)
+    cases = [
+        ("римований шаблон",
+         lambda: rng.choice(generator.rhyme_patterns).format(word="знання", rhyme="вміння"),
+         lambda: rng.choice(compiled_templates()['rhyme_patterns']).render(word="знання", rhyme="вміння")),
+        ("зв'язок слів",
+         lambda: legacy_connection(generator._rng('connection', "знання", "успіх"), "знання", "успіх"),
+         lambda: generator._generate_connection("знання", "успіх")),
+        ("візуальний образ",
+         lambda: legacy_visual(rng, "економічна"),
+         lambda: generator._visual_item("економічна", rng)),
+        ("числа-образи",
+         lambda: legacy_numbers(PHRASES),
+         lambda: generator._generate_number_associations(PHRASES)),
+    ]
+    print(f"Викликів: {calls}")
+    print(f"{'випадок':<18} {'було, мкс':>10} {'стало, мкс':>11} {'було, Б':>9} {'стало, Б':>9} "
+          f"{'було, блоків':>13} {'стало, блоків':>14}")
+    for name, legacy, current in cases:
+        legacy_time, legacy_peak, legacy_blocks = measure(legacy, calls)
+        current_time, current_peak, current_blocks = measure(current, calls)
+        print(f"{name:<18} {legacy_time:>10.2f} {current_time:>11.2f} "
+              f"{legacy_peak:>9.0f} {current_peak:>9.0f} "
+              f"{legacy_blocks:>13.1f} {current_blocks:>14.1f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,122 @@
+"""
+Бенчмарк TextProcessor.process: вартість обробки залежно від розміру тексту.
+
+Порівнює поточний однопрохідний конвеєр з попередньою схемою, де речення
+і токени заново виділялися в кожному етапі аналізу.
+
+Запуск: python benchmarks/bench_text_processor.py [розмір_у_КБ ...]
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import TextProcessor
+
+SAMPLE_PARAGRAPH = (
+    "Економічна функція підприємства виражає його роль у задоволенні потреб суспільства. "
+    "Соціальна відповідальність вимагає етичного ставлення до працівників і партнерів! "
+    "Інноваційний розвиток забезпечує конкурентоспроможність на ринку та стабільність. "
+    "Ресурсне забезпечення включає матеріальні, людські та фінансові ресурси підприємства? "
+    "Стратегічне планування дозволяє досягти довгострокових цілей компанії у 2024 році.\n"
+)
+
+
+def make_text(size_kb: int) -> str:
+    """Текст потрібного розміру з повторюваних абзаців"""
+    target = size_kb * 1024
+    parts = []
+    length = 0
+    i = 0
+    while length < target:
+        # Невелика варіація, щоб словник ріс разом з текстом
+        paragraph = SAMPLE_PARAGRAPH.replace('ринку', f'ринку{chr(0x430 + i % 32)}')
+        parts.append(paragraph)
+        length += len(paragraph)
+        i += 1
+    return ''.join(parts)
+
+
+def legacy_split_sentences(text: str) -> list:
+    """Попереднє розбиття на речення (колишній TextProcessor._split_sentences)"""
+    sentences = re.split(r'[.!?]+', text)
+    return [s.strip() for s in sentences if len(s.strip()) > 5]
+
+
+def legacy_tokenize_words(text: str) -> list:
+    """Попередня токенізація слів (колишній TextProcessor._tokenize_words)"""
+    return re.findall(r'\b\w+\b', text)
+
+
+def legacy_process(tp: TextProcessor, text: str) -> dict:
+    """Попередня схема: речення і токени виділяються в кожному етапі окремо"""
+    cleaned_text = tp._clean_text(text)
+    sentences = legacy_split_sentences(cleaned_text)
+    words = legacy_tokenize_words(cleaned_text.lower())
+    filtered_words = [
+        w for w in words
+        if w not in tp.ukrainian_stopwords and len(w) > 2 and w.isalpha()
+    ]
+    key_words = tp._extract_keywords(Counter(filtered_words), len(filtered_words))
+
+    phrases = []
+    for sentence in sentences:
+        sentence_words = [
+            w for w in legacy_tokenize_words(sentence.lower()) if w.isalpha() and len(w) > 2
+        ]
+        for n in range(2, 5):
+            for i in range(len(sentence_words) - n + 1):
+                phrases.append(' '.join(sentence_words[i:i + n]))
+    Counter(phrases)
+
+    # Теми: підрядковий пошук по всіх реченнях для кожного ключового слова
+    main_topics = []
+    for keyword in [kw['word'] for kw in key_words[:5]]:
+        for sentence in sentences:
+            if keyword in sentence.lower():
+                words = sentence.split()
+                for i, word in enumerate(words):
+                    if keyword in word.lower():
+                        main_topics.append(' '.join(words[max(0, i - 2):i + 3]))
+                        break
+                break
+
+    def readability(t):
+        s = legacy_split_sentences(t)
+        w = legacy_tokenize_words(t)
+        return len(s) + len([x for x in w if len(x) > 6])
+
+    # _analyze_complexity: повторне розбиття + readability, і ще раз readability
+    legacy_split_sentences(cleaned_text)
+    legacy_tokenize_words(cleaned_text.lower())
+    readability(cleaned_text)
+    readability(cleaned_text)
+    return {'key_words': key_words, 'main_topics': main_topics}
+
+
+def measure(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes_kb):
+    tp = TextProcessor()
+    print(f"{'розмір':>10} {'до, с':>10} {'після, с':>10} {'прискорення':>12}")
+    for size_kb in sizes_kb:
+        text = make_text(size_kb)
+        before = measure(legacy_process, tp, text)
+        after = measure(tp.process, text)
+        assert legacy_process(tp, text)['key_words'] == tp.process(text)['key_words']
+        print(f"{size_kb:>8}КБ {before:>10.3f} {after:>10.3f} {before / after:>11.2f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [64, 256, 1024, 4096])
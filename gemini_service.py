@@ -0,0 +1,339 @@
+"""
+Обгортка над клієнтом Google Gemini з кешем відповідей.
+
+Ключ кешу — хеш методу, моделі, мови і нормалізованого тексту. Відповіді
+зберігаються в LRU у пам'яті та в каталозі на диску, спільному для всіх
+воркерів. Свіжа відповідь (молодша за TTL) повертається без мережі; застаріла,
+але ще в межах вікна stale-while-revalidate, повертається одразу, а оновлення
+запускається у фоні.
+
+Перед кожним мережевим викликом запит проходить через TokenBucket, розмір
+якого відповідає квоті: якщо бюджет вичерпано, GeminiQuotaExceeded виникає
+одразу, без звернення до API. Клієнт створюється один раз на процес, тож
+його HTTP-з'єднання (keep-alive) перевикористовуються між запитами.
+
+CircuitBreaker рахує помилки API: після серії невдач він розмикається, і
+виклики одразу отримують GeminiUnavailable, поки не мине період охолодження;
+потім один пробний запит вирішує, чи замкнути його знову.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from result_cache import ResultCache, normalize_text
+
+
+class GeminiQuotaExceeded(RuntimeError):
+    """Локальний бюджет запитів до Gemini вичерпано; мережевий виклик не виконувався"""
+
+
+class GeminiUnavailable(RuntimeError):
+    """Запобіжник розімкнений після серії помилок Gemini; мережевий виклик не виконувався"""
+
+
+class CircuitBreaker:
+    """
+    Запобіжник зі станами closed → open → half_open.
+
+    failure_threshold помилок поспіль розмикають його на cooldown_seconds;
+    після цього пропускається half_open_max_calls пробних запитів.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.short_circuited = 0
+        self.last_error: Optional[str] = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Чи можна зараз звертатися до API (у half_open займає слот пробного запиту)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_seconds:
+                    self.short_circuited += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probes = 0
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    self.short_circuited += 1
+                    return False
+                self._probes += 1
+            return True
+
+    def release(self) -> None:
+        """Повернення слоту пробного запиту, якщо запит так і не було надіслано"""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probes = 0
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, round(self.cooldown_seconds - (time.monotonic() - self.opened_at), 2))
+
+    def stats(self) -> Dict[str, Any]:
+        retry_after = self.retry_after()
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'failure_threshold': self.failure_threshold,
+            'cooldown_seconds': self.cooldown_seconds,
+            'retry_after': retry_after,
+            'trips': self.trips,
+            'short_circuited': self.short_circuited,
+            'last_error': self.last_error,
+        }
+
+
+class TokenBucket:
+    """
+    Потокобезпечне «відро токенів»: capacity запитів поспіль, далі
+    rate_per_minute запитів на хвилину.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.admitted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                self.admitted += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+    def stats(self) -> Dict[str, Any]:
+        available = self.available()
+        return {
+            'available': round(available, 2),
+            'capacity': self.capacity,
+            'rate_per_minute': self.rate * 60,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            # Через скільки секунд з'явиться наступний токен
+            'retry_after': 0.0 if available >= 1 or not self.rate
+            else round((1 - available) / self.rate, 2),
+        }
+
+
+def gemini_cache_key(method: str, model: str, language: str, text: str) -> str:
+    """Ключ кешу для виклику Gemini"""
+    digest = hashlib.sha256()
+    for part in (method, model, language, normalize_text(text)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class GeminiService:
+    """Кешований доступ до методів Gemini-клієнта"""
+
+    def __init__(self, client_factory: Callable[[], Any], cache: ResultCache,
+                 ttl_seconds: float = 24 * 3600, stale_seconds: float = 7 * 24 * 3600,
+                 refresh_workers: int = 2, rate_limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None, model: Optional[str] = None):
+        self.client_factory = client_factory
+        # Назва моделі з конфігурації входить у ключ кешу: влучання в кеш не
+        # потребує ні клієнта, ні ключа API
+        self.model = model
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        self._client = None
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.stale_hits = 0
+        self.refreshes = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.refresh_workers = refresh_workers
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refresh_pid: Optional[int] = None
+
+    def _refresh_pool(self) -> ThreadPoolExecutor:
+        """Пул фонових оновлень процесу; створюється з першим оновленням (і заново після fork)"""
+        with self._lock:
+            if self._refresh_pid != os.getpid():
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix='gemini-refresh',
+                )
+                self._refresh_pid = os.getpid()
+            return self._refresh_executor
+
+    def client(self) -> Any:
+        """Єдиний екземпляр клієнта на процес (і його пул з'єднань)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> Any:
+        # Невдале створення клієнта (немає ключа, мережа) запобіжник рахує як
+        # помилку Gemini, і поки він розімкнений, повторних спроб немає
+        if self.breaker is not None and not self.breaker.allow():
+            raise self._unavailable()
+        try:
+            client = self.client_factory()
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure(e)
+            raise
+        if self.breaker is not None:
+            # Створення клієнта — не запит до API: слот пробного запиту віддаємо самому виклику
+            self.breaker.release()
+        return client
+
+    def _unavailable(self) -> GeminiUnavailable:
+        return GeminiUnavailable(
+            "Gemini тимчасово недоступна після серії помилок "
+            f"(повторна спроба через {self.breaker.retry_after()} с)"
+        )
+
+    def model_name(self) -> str:
+        if self.model:
+            return self.model
+        # Без назви в конфігурації клієнт створюється лише заради неї; помилку
+        # створення враховує запобіжник (_create_client)
+        return str(getattr(self.client(), 'model_name', 'gemini'))
+
+    def generate_full_mnemonics(self, text: str) -> Dict[str, Any]:
+        return self._cached_call('generate_full_mnemonics', text, '', {})
+
+    def improve_text(self, text: str, language: str = 'uk') -> str:
+        return self._cached_call('improve_text', text, language, {'language': language})
+
+    def _cached_call(self, method: str, text: str, language: str, kwargs: Dict[str, Any]) -> Any:
+        key = gemini_cache_key(method, self.model_name(), language, text)
+        entry, _ = self.cache.get(key)
+        if entry is not None:
+            age = time.time() - entry['stored_at']
+            if age < self.ttl_seconds:
+                return entry['value']
+            if age < self.ttl_seconds + self.stale_seconds:
+                with self._lock:
+                    self.stale_hits += 1
+                self._schedule_refresh(key, method, text, kwargs)
+                return entry['value']
+            # Задавнений запис не повертаємо і прибираємо з обох рівнів
+            self.cache.delete(key)
+
+        return self._call_and_store(key, method, text, kwargs)
+
+    def _admit(self) -> None:
+        # Спершу запобіжник: коли він розімкнений, бюджет квоти не витрачається
+        if self.breaker is not None and not self.breaker.allow():
+            raise self._unavailable()
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            if self.breaker is not None:
+                self.breaker.release()
+            raise GeminiQuotaExceeded(
+                "Вичерпано квоту запитів до Gemini, спробуйте пізніше "
+                f"(через {self.rate_limiter.stats()['retry_after']} с)"
+            )
+
+    def _call_and_store(self, key: str, method: str, text: str, kwargs: Dict[str, Any]) -> Any:
+        self._admit()
+        try:
+            value = getattr(self.client(), method)(text, **kwargs)
+        except Exception as e:
+            if self.breaker is not None:
+                self.breaker.record_failure(e)
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self.cache.put(key, {'stored_at': time.time(), 'value': value})
+        return value
+
+    def _schedule_refresh(self, key: str, method: str, text: str, kwargs: Dict[str, Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._refresh_pool().submit(self._refresh, key, method, text, kwargs)
+
+    def _refresh(self, key: str, method: str, text: str, kwargs: Dict[str, Any]) -> None:
+        try:
+            self._call_and_store(key, method, text, kwargs)
+            with self._lock:
+                self.refreshes += 1
+        except (GeminiQuotaExceeded, GeminiUnavailable):
+            # Без бюджету оновлення відкладається до наступного застарілого влучання
+            pass
+        except Exception as e:
+            # Застаріла відповідь лишається в кеші до кінця вікна stale
+            print(f"⚠️ Не вдалося оновити відповідь Gemini у фоні: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def close(self) -> None:
+        if self._refresh_executor is not None and self._refresh_pid == os.getpid():
+            self._refresh_executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'cache': dict(
+                self.cache.stats(),
+                stale_hits=self.stale_hits,
+                refreshes=self.refreshes,
+                ttl_seconds=self.ttl_seconds,
+                stale_seconds=self.stale_seconds,
+            ),
+            'rate_limit': self.rate_limiter.stats() if self.rate_limiter is not None else None,
+            'breaker': self.breaker.stats() if self.breaker is not None else None,
+        }
@@ -0,0 +1,30 @@
+"""
+Конфігурація gunicorn для продакшену.
+
+Запуск: gunicorn -c gunicorn.conf.py app:app
+
+preload_app імпортує застосунок (генератор, довідкові дані, кеші) один раз у
+головному процесі; воркери отримують його через fork і ділять сторінки пам'яті
+copy-on-write. gc.freeze() перед fork переносить ці об'єкти в постійне
+покоління, щоб збирач сміття у воркерах не торкався їх і не копіював сторінки.
+Фонові потоки (очищення сесій) запускаються вже у воркері, у post_fork.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+preload_app = True
+
+
+def pre_fork(server, worker):
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app import start_worker_tasks
+    start_worker_tasks()
@@ -0,0 +1,268 @@
+"""
+Фонові задачі для довгої обробки тексту.
+
+Запит отримує id задачі одразу, а обчислення виконується в пулі потоків.
+Стан задачі можна опитувати або слухати потоком подій (SSE). Стан пишеться
+в SQLiteJobStore — спільну для всіх воркерів базу, тож опитування може
+потрапити на будь-який воркер; сам результат записується в сховище сесій.
+Потік подій обмежений у часі: після max_seconds з'єднання закривається, і
+клієнт переходить на опитування, щоб задача не тримала потік запиту.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class Job:
+    """Одна фонова задача та її стан: queued → running → done | error"""
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.status = 'queued'
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = threading.Event()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        if include_result and self.status == 'done':
+            data['result'] = self.result
+        return data
+
+
+class SQLiteJobStore:
+    """Стани задач (без результатів) в SQLite-базі, спільній для воркерів"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs(finished_at);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+        # Як і в SQLiteSessionStore: з'єднання не переживає fork
+        self.close()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def put(self, job: Job) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, created_at, started_at, finished_at, error) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET status = excluded.status, '
+                'started_at = excluded.started_at, finished_at = excluded.finished_at, '
+                'error = excluded.error',
+                (job.id, job.status, job.created_at, job.started_at, job.finished_at, job.error),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            'SELECT status, created_at, started_at, finished_at, error FROM jobs WHERE id = ?',
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        status, created_at, started_at, finished_at, error = row
+        data = {
+            'job_id': job_id,
+            'status': status,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+        }
+        if error is not None:
+            data['error'] = error
+        return data
+
+    def delete_finished_before(self, cutoff: float) -> int:
+        with self._connection() as conn:
+            cursor = conn.execute('DELETE FROM jobs WHERE finished_at < ?', (cutoff,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class JobManager:
+    """Пул потоків для фонових задач з реєстром їхніх станів"""
+
+    def __init__(self, max_workers: int = 4, ttl_seconds: float = 900.0,
+                 store: Optional[SQLiteJobStore] = None):
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """
+        Пул потоків процесу, що виконує задачі; створюється під час першої задачі.
+        Пул, створений до fork, у дочірньому процесі без потоків — там створюється новий.
+        """
+        with self._lock:
+            if self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def submit(self, job_id: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        job = Job(job_id)
+        with self._lock:
+            self._evict_expired()
+            self._jobs[job_id] = job
+        # Запис у спільний реєстр до відповіді: наступне опитування може прийти на інший воркер
+        self._publish(job)
+        self._pool().submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs) -> None:
+        job.status = 'running'
+        job.started_at = time.time()
+        self._publish(job)
+        status = 'error'
+        try:
+            job.result = fn(*args, **kwargs)
+            status = 'done'
+        except Exception as e:
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.status = status
+            self._publish(job)
+            job.done.set()
+
+    def _publish(self, job: Job) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.put(job)
+        except sqlite3.Error as e:
+            # Воркер, що виконує задачу, знає її стан і без реєстру
+            print(f"⚠️ Не вдалося записати стан задачі {job.id}: {e}")
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if self.store is not None:
+            try:
+                self.store.delete_finished_before(cutoff)
+            except sqlite3.Error:
+                pass
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Задача, яку виконує цей процес"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Стан задачі з будь-якого воркера. Результат є лише для задач цього
+        процесу; для інших воркерів його слід брати зі сховища сесій.
+        """
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.store is None:
+            return None
+        data = self.store.get(job_id)
+        if (data is not None and data['status'] in ('queued', 'running')
+                and data['created_at'] < time.time() - self.ttl_seconds):
+            # Воркер, що виконував задачу, зупинився, не завершивши її
+            data['status'] = 'error'
+            data['error'] = 'Задачу перервано: обробник зупинився до завершення'
+        return data
+
+    def events(self, job_id: str, resolve: Callable[[str], Optional[Dict[str, Any]]],
+               heartbeat: float = 15.0, max_seconds: float = 10.0,
+               poll_interval: float = 0.5) -> Iterator[str]:
+        """
+        Потік подій SSE: зміни стану задачі, пульси і подія done. Стан дає
+        resolve(job_id). Через max_seconds потік закривається, щоб не тримати
+        потік запиту до кінця задачі; клієнт далі опитує або перепідключається.
+        """
+        job = self.get(job_id)
+        started = last_sent = time.monotonic()
+        last_status = None
+        while True:
+            state = resolve(job_id)
+            if state is None:
+                return
+            finished = state['status'] in ('done', 'error')
+            if state['status'] != last_status:
+                last_status = state['status']
+                yield (f"event: {'done' if finished else 'status'}\n"
+                       f"data: {json.dumps(state, ensure_ascii=False)}\n\n")
+                last_sent = time.monotonic()
+                if finished:
+                    return
+            if time.monotonic() - started >= max_seconds:
+                yield f"retry: {int(poll_interval * 2000)}\n\n"
+                return
+            if time.monotonic() - last_sent >= heartbeat:
+                # Пульс, щоб проксі не закрив «тихе» з'єднання
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            # Задачу цього процесу будить завершення, задачу іншого воркера — опитування реєстру
+            if job is not None:
+                job.done.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+
+    def close(self) -> None:
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in ('queued', 'running', 'done', 'error')}
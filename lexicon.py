@@ -0,0 +1,294 @@
+"""
+Компактний словник слів на диску з індексом за префіксами.
+
+Формат файлу (little-endian):
+    заголовок   MLEX, версія формату, кількість слів n, кількість літер m, розмір блоку
+    зміщення    (n + 1) × uint32 — початок кожного слова в блоці
+    літери      m × (uint32 код символу, uint32 перший індекс, uint32 кінець)
+    блок        слова в UTF-8 без роздільників, відсортовані за байтами
+
+Файл відкривається через mmap, тож сторінки словника спільні для всіх
+воркерів і не копіюються в пам'ять кожного процесу. Порядок UTF-8 байтів
+збігається з порядком кодів символів, тому пошук за префіксом — бінарний
+пошук просто по байтах у mmap, O(log n) без декодування.
+
+Побудова (--reverse — словник рим: слова записуються задом наперед, і пошук
+за префіксом стає пошуком за закінченням):
+    python lexicon.py build words.txt data/lexicon.bin
+    python lexicon.py build --reverse words.txt data/rhymes.bin
+Перевірка:
+    python lexicon.py lookup data/lexicon.bin мнемо
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b'MLEX'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sIIIQ')
+_LETTER = struct.Struct('<III')
+
+
+def normalize_word(word: str) -> str:
+    """Слово у вигляді, в якому воно зберігається: NFC, нижній регістр, без пробілів по краях"""
+    return unicodedata.normalize('NFC', word.strip()).lower()
+
+
+def encode_lexicon(words: Iterable[str]) -> bytes:
+    """Бінарне представлення словника: унікальні нормалізовані слова, відсортовані за байтами"""
+    encoded = sorted({normalize_word(word).encode('utf-8') for word in words} - {b''})
+
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    blob = b''.join(encoded)
+
+    letters: List[Tuple[int, int, int]] = []
+    for i, word in enumerate(encoded):
+        code = ord(word.decode('utf-8')[0])
+        if letters and letters[-1][0] == code:
+            letters[-1] = (code, letters[-1][1], i + 1)
+        else:
+            letters.append((code, i, i + 1))
+
+    parts = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), len(letters), len(blob)),
+        struct.pack(f'<{len(offsets)}I', *offsets),
+    ]
+    parts.extend(_LETTER.pack(*letter) for letter in letters)
+    parts.append(blob)
+    return b''.join(parts)
+
+
+def build_lexicon(words: Iterable[str], path: str) -> int:
+    """Запис словника у файл атомарно (os.replace); повертає кількість слів"""
+    data = encode_lexicon(words)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return _HEADER.unpack_from(data)[2]
+
+
+class Lexicon:
+    """Відсортований словник поверх mmap-файлу (або буфера в пам'яті)"""
+
+    def __init__(self, buffer, source: Optional[str] = None):
+        if sys.byteorder != 'little':
+            raise RuntimeError("Формат словника розрахований на little-endian платформи")
+        self.source = source
+        self._buffer = buffer
+        magic, version, count, letter_count, blob_size = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Невідомий формат словника: {source or 'буфер'}")
+
+        view = memoryview(buffer)
+        offsets_start = _HEADER.size
+        letters_start = offsets_start + 4 * (count + 1)
+        blob_start = letters_start + _LETTER.size * letter_count
+        self._count = count
+        self._offsets = view[offsets_start:letters_start].cast('I')
+        self._blob = view[blob_start:blob_start + blob_size]
+        # Таблиця літер невелика (десятки записів), тож її можна тримати в словнику
+        self._letters = {}
+        for i in range(letter_count):
+            code, start, end = _LETTER.unpack_from(buffer, letters_start + i * _LETTER.size)
+            self._letters[chr(code)] = (start, end)
+
+    @classmethod
+    def open(cls, path: str) -> 'Lexicon':
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, source=path)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> 'Lexicon':
+        """Словник у пам'яті процесу — для невеликих вбудованих наборів слів"""
+        return cls(encode_lexicon(words))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key(self, i: int) -> bytes:
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def word(self, i: int) -> str:
+        return self._key(i).decode('utf-8')
+
+    def _lower_bound(self, key: bytes, lo: int, hi: int) -> int:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __contains__(self, word: str) -> bool:
+        key = normalize_word(word).encode('utf-8')
+        i = self._lower_bound(key, 0, self._count)
+        return i < self._count and self._key(i) == key
+
+    def prefix_range(self, prefix: str, within: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """
+        Діапазон індексів [lo, hi) слів, що починаються з prefix. within —
+        уже відомий діапазон коротшого префікса, в якому досить шукати.
+        """
+        prefix = normalize_word(prefix)
+        if not prefix:
+            return 0, self._count
+        if within is not None:
+            lo, hi = within
+        else:
+            lo, hi = self._letters.get(prefix[0], (0, 0))
+            if len(prefix) == 1:
+                return lo, hi
+        if lo == hi:
+            return lo, hi
+        key = prefix.encode('utf-8')
+        # 0xFF не трапляється в UTF-8, тож key + 0xFF більше за будь-яке продовження префікса
+        return self._lower_bound(key, lo, hi), self._lower_bound(key + b'\xff', lo, hi)
+
+    def count_prefix(self, prefix: str) -> int:
+        lo, hi = self.prefix_range(prefix)
+        return hi - lo
+
+    def has_prefix(self, prefix: str) -> bool:
+        lo, hi = self.prefix_range(prefix)
+        return hi > lo
+
+    def with_prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        lo, hi = self.prefix_range(prefix)
+        return [self.word(i) for i in range(lo, min(hi, lo + limit))]
+
+    def sample_with_prefix(self, prefix: str, k: int, rng) -> List[str]:
+        """k випадкових слів із префіксом; rng — random.Random або модуль random"""
+        lo, hi = self.prefix_range(prefix)
+        if hi <= lo:
+            return []
+        return [self.word(i) for i in rng.sample(range(lo, hi), min(k, hi - lo))]
+
+    def nearest(self, word: str, min_common: int = 2) -> Optional[str]:
+        """
+        Інше слово словника з найдовшим спільним початком (щонайменше min_common
+        символів). Сусіди в сортованому порядку — найкращі кандидати, тож
+        достатньо одного бінарного пошуку.
+        """
+        word = normalize_word(word)
+        key = word.encode('utf-8')
+        i = self._lower_bound(key, 0, self._count)
+        best, best_common = None, min_common - 1
+        for j in (i - 1, i, i + 1):
+            if 0 <= j < self._count:
+                candidate = self.word(j)
+                if candidate == word:
+                    continue
+                common = len(os.path.commonprefix([candidate, word]))
+                if common > best_common:
+                    best, best_common = candidate, common
+        return best
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._blob.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+class LexiconFile:
+    """
+    Словник із файлу з гарячою заміною: новий файл, записаний через os.replace
+    (build_lexicon так і робить), підхоплюється без перезапуску. Зміна файлу
+    перевіряється не частіше ніж раз на check_interval секунд; читачі, що вже
+    отримали старий Lexicon, дочитують його без перешкод.
+    """
+
+    def __init__(self, path: str, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lexicon: Optional[Lexicon] = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def current(self) -> Lexicon:
+        now = time.monotonic()
+        if self._lexicon is not None and now - self._checked_at < self.check_interval:
+            return self._lexicon
+        with self._lock:
+            if self._lexicon is None or now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                signature = self._file_signature()
+                if signature != self._signature:
+                    # Старий mmap не закриваємо: його ще можуть читати інші потоки,
+                    # він звільниться, щойно зникнуть посилання
+                    self._lexicon = Lexicon.open(self.path)
+                    self._signature = signature
+        return self._lexicon
+
+    def reload(self) -> Lexicon:
+        """Примусове перечитування файлу"""
+        with self._lock:
+            self._checked_at = 0.0
+            self._signature = None
+        return self.current()
+
+
+def read_word_list(path: str) -> Iterable[str]:
+    """Слова з текстового файлу: по одному в рядку, рядки з # пропускаються"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line.split()[0]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Словник для генератора мнемонік")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="побудувати бінарний словник зі списку слів")
+    build.add_argument('source', help="текстовий файл: одне слово в рядку")
+    build.add_argument('output', help="шлях до бінарного словника")
+    build.add_argument('--reverse', action='store_true', help="записати слова задом наперед (словник рим)")
+
+    lookup = commands.add_parser('lookup', help="слова з префіксом")
+    lookup.add_argument('lexicon')
+    lookup.add_argument('prefix')
+    lookup.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        words = read_word_list(args.source)
+        if args.reverse:
+            words = (word[::-1] for word in words)
+        count = build_lexicon(words, args.output)
+        print(f"✅ Записано слів: {count} → {args.output}")
+    else:
+        lexicon = Lexicon.open(args.lexicon)
+        print(f"Слів із префіксом «{args.prefix}»: {lexicon.count_prefix(args.prefix)}")
+        for word in lexicon.with_prefix(args.prefix, args.limit):
+            print(f"  {word}")
+
+
+if __name__ == '__main__':
+    main()
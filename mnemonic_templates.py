@@ -0,0 +1,143 @@
+"""
+Шаблони тексту мнемонік і статичні таблиці генератора.
+
+Шаблон у синтаксисі str.format один раз при імпорті перевіряється
+(Template): дозволені лише іменовані поля без специфікаторів. Рендер — це
+зв'язаний str.format джерела, тож виклик коштує стільки ж, скільки
+str.format на місці. Списки шаблонів і таблиці не будуються на кожен
+виклик генератора.
+"""
+
+import string
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Tuple
+
+
+class Template:
+    """Шаблон str.format з перевіреними полями; render — зв'язаний str.format"""
+
+    __slots__ = ('source', 'fields', 'render')
+
+    def __init__(self, source: str):
+        self.source = source
+        fields = []
+        for _, field, spec, conversion in string.Formatter().parse(source):
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Непідтримуване поле шаблону {{{field}}}: {source!r}")
+            if field not in fields:
+                fields.append(field)
+        self.fields: Tuple[str, ...] = tuple(fields)
+        # Зайві ключі ігноруються, як і в str.format
+        self.render: Callable[..., str] = source.format
+
+    def __call__(self, **values: Any) -> str:
+        return self.render(**values)
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+
+def compile_templates(sources: Iterable[str]) -> Tuple[Template, ...]:
+    return tuple(Template(source) for source in sources)
+
+
+# Палац пам'яті: місця в порядку маршруту
+LOCI_LOCATIONS: Tuple[str, ...] = (
+    "вхідні двері", "вікно в вітальні", "обідній стіл", "комп'ютерний стіл",
+    "книжкова шафа", "кухонна плита", "ванна кімната", "балкон",
+    "спальне ліжко", "телевізор", "холодильник", "дзеркало",
+    "диван", "полиця з книгами", "робочий стіл", "підвіконня",
+    "камін", "світильник", "килим", "стільниця",
+)
+
+VISUAL_TEMPLATES = compile_templates((
+    "Уявіть {phrase} у вигляді {image}",
+    "{phrase} нагадує {association}",
+    "Порівняйте {phrase} з {comparison}",
+    "Зобразіть {phrase} як {visual}",
+    "Я бачу {phrase} як {image}",
+    "Уявіть, що {phrase} це {association}",
+))
+
+VISUAL_IMAGES: Tuple[str, ...] = (
+    "яскравого сонця", "великої гори", "швидкої річки",
+    "квітучого дерева", "мудрої сови", "сильного ведмедя",
+    "швидкого поїзда", "високого будинку", "глибокого моря",
+    "яскравої зірки", "теплого вогню", "свіжого вітру",
+    "метелика", "золотого льву", "діамантового кристалу",
+)
+
+VISUAL_COLORS: Tuple[str, ...] = (
+    "червоного", "синього", "зеленого", "жовтого", "фіолетового",
+    "помаранчевого", "рожевого", "білого", "чорного", "золотого",
+    "срібного", "бірюзового", "малинового",
+)
+
+NUMBER_IMAGES: Mapping[int, str] = MappingProxyType({
+    1: "стовп", 2: "лебідь", 3: "тризуб", 4: "човен", 5: "гачок",
+    6: "вишня", 7: "коса", 8: "очки", 9: "куля", 10: "пальці",
+    11: "близнюки", 12: "годинник", 13: "чорт", 14: "кілт", 15: "пенал",
+    20: "гуска", 30: "трійка", 40: "сорок", 50: "полтинник", 100: "сотня",
+})
+
+EMOJI_MAP: Mapping[str, str] = MappingProxyType({
+    'час': '⏰', 'знання': '📚', 'успіх': '🏆', 'дерево': '🌳',
+    'вода': '💧', 'вогонь': '🔥', 'гора': '⛰️', 'ліс': '🌲',
+    'книга': '📖', 'світло': '💡', 'розум': '🧠', 'серце': '❤️',
+})
+
+CONNECTION_TEMPLATES = compile_templates((
+    "{word1} приводить до {word2}",
+    "{word1} трансформується в {word2}",
+    "{word1} дружить з {word2}",
+    "{word1} створює {word2}",
+    "{word1} знаходить {word2}",
+    "{word1} зв'язується з {word2}",
+    "{word1} перетворюється на {word2}",
+    "{word1} нагадує про {word2}",
+))
+
+STORY_INTROS: Tuple[str, ...] = (
+    "Уявіть собі неймовірну пригоду, де ",
+    "Колись давно в чарівному світі ",
+    "Одного разу трапилася дивовижна історія: ",
+    "У світі знань та пам'яті існує таємниця: ",
+    "Представте себе у місці, де ",
+    "В древні часи сталося чудо: ",
+)
+
+STORY_CONNECTORS: Tuple[str, ...] = (
+    " потім ", " аж раптом ", " несподівано ", " і тоді ",
+    " одночасно ", " через деякий час ", " між тим ", " далі ",
+    " вдруге ", " врешті решт ", " в результаті ",
+)
+
+MEMORY_TIPS: Tuple[str, ...] = (
+    "📚 Вивчайте матеріал дрібними порціями по 25-30 хвилин (техніка Помодоро)",
+    "🔄 Повторюйте інформацію через зростаючі інтервали: 1 день, 3 дні, тиждень, місяць",
+    "🎨 Використовуйте візуалізацію та кольорові маркери для виділення ключових моментів",
+    "🔗 Створюйте асоціації з уже відомою інформацією - це ваш найкращий інструмент",
+    "🗣️ Навчайте інших - це найкращий спосіб запам'ятати матеріал",
+    "🎵 Створюйте ритмічні або мелодійні мнемоніки - музика дуже допомагає",
+    "📍 Використовуйте метод локуса (палац пам'яті) для складних послідовностей",
+    "💤 Спіть достатньо - 7-9 годин для консолідації пам'яті",
+    "🧠 Тренуйте пам'ять регулярно, як м'яз - це робить її сильнішою",
+    "🎯 Фокусуйтеся на одному завданні за раз - багатозадачність руйнує пам'ять",
+    "✍️ Конспектуйте своїми словами - письмо активує різні області мозку",
+    "🕰️ Використовуйте техніку Помодоро: 25 хв навчання, 5 хв відпочинку",
+    "🧩 Розбивайте складну інформацію на дрібні логічні частини",
+    "🎭 Використовуйте емоції - емоційно забарвлена інформація краще запам'ятовується",
+    "🏃 Займайтесь спортом - фізична активність дуже покращує мозкову діяльність",
+    "🌳 Гуляйте на свіжому повітрі - кисень необхідний для мозку",
+    "🍎 Вживайте здорову їжу: горіхи, ягоди, рибу для підтримки мозку",
+    "💧 Пийте достатньо води - навіть 2% дегідратація погіршує концентрацію",
+    "🎯 Встановлюйте чіткі цілі запам'ятовування",
+    "🔊 Вимовляйте інформацію вголос - це удвічі ефективніше за мовчазне читання",
+    "🧘 Практикуйте медитацію для поліпшення концентрації та уваги",
+    "📖 Читайте активно - задавайте питання тексту, передбачайте продовження",
+    "🎪 Грайте в словесні ігри - кросворди, Scrabble покращують словниковий запас",
+    "👥 Займайтесь груповим навчанням - обговорення матеріалу дуже ефективне",
+    "⏱️ Тестуйте себе регулярно - тестування краще вправ для фіксації знань",
+)
@@ -0,0 +1,209 @@
+"""
+Підрахунок n-грам без проміжних списків рядків.
+
+NgramCounter — точний режим: токени інтернуються в цілі ідентифікатори,
+n-грами зберігаються як кортежі ідентифікаторів.
+TopKNgramCounter — наближений режим для дуже великих текстів: count-min sketch
+фіксованого розміру плюс купа з k найчастіших кандидатів; n-грами надходять
+партіями з обмеженого буфера точних лічильників.
+"""
+
+import heapq
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+
+class NgramCounter:
+    """Точний лічильник n-грам на інтернованих ідентифікаторах токенів"""
+
+    def __init__(self, min_n: int = 2, max_n: int = 4):
+        self.min_n = min_n
+        self.max_n = max_n
+        self.vocab: Dict[str, int] = {}
+        self.words: List[str] = []
+        self.counts: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _intern(self, tokens: Iterable[str]) -> List[int]:
+        vocab = self.vocab
+        ids = []
+        for token in tokens:
+            token_id = vocab.get(token)
+            if token_id is None:
+                token_id = vocab[token] = len(self.words)
+                self.words.append(token)
+            ids.append(token_id)
+        return ids
+
+    def add_sequence(self, tokens: List[str]) -> None:
+        """Додавання всіх n-грам однієї послідовності (речення)"""
+        ids = self._intern(tokens)
+        for n in range(self.min_n, self.max_n + 1):
+            if len(ids) >= n:
+                # zip віддає кортежі ліниво — без списку всіх n-грам
+                self.counts.update(zip(*(ids[k:] for k in range(n))))
+
+    def merge(self, other: 'NgramCounter') -> None:
+        """Додавання лічильника, побудованого в іншому процесі чи фрагменті"""
+        remap = self._intern(other.words)
+        for key, count in other.counts.items():
+            self.counts[tuple(remap[token_id] for token_id in key)] += count
+
+    def phrase(self, key: Tuple[int, ...]) -> str:
+        return ' '.join(self.words[token_id] for token_id in key)
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        """Найчастіші фрази; за рівної частоти перевага довшим, далі — першим у тексті"""
+        ranked = heapq.nlargest(
+            limit,
+            self.counts.items(),
+            key=lambda item: (item[1], len(item[0])),
+        )
+        return [(self.phrase(key), count) for key, count in ranked]
+
+
+class TopKNgramCounter(NgramCounter):
+    """
+    Наближений лічильник: пам'ять обмежена шириною скетча, розміром купи
+    та буфером точних лічильників між скиданнями в скетч.
+
+    Частоти оцінюються зверху (count-min), тому рідкісні n-грами можуть
+    отримати завищену оцінку, але найчастіші фрази визначаються надійно.
+    """
+
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, min_n: int = 2, max_n: int = 4, k: int = 1000,
+                 width: int = 1 << 16, depth: int = 4, flush_size: int = 1 << 15):
+        super().__init__(min_n, max_n)
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.flush_size = flush_size
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+        # Хеші слів не залежать від PYTHONHASHSEED, тому скетчі різних
+        # процесів можна зливати
+        self.token_hashes: List[int] = []
+        self.candidates: Dict[Tuple[int, ...], int] = {}
+        self.first_seen: Dict[Tuple[int, ...], int] = {}
+        # Рівно один запис на кандидата; значення в купі може відставати від
+        # candidates і оновлюється, лише коли запис опиняється на вершині
+        self.heap: List[Tuple[int, int, Tuple[int, ...]]] = []
+        self.seen_total = 0
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _intern(self, tokens: Iterable[str]) -> List[int]:
+        ids = super()._intern(tokens)
+        for word in self.words[len(self.token_hashes):]:
+            self.token_hashes.append(zlib.crc32(word.encode('utf-8')))
+        return ids
+
+    def _hash(self, key: Tuple[int, ...]) -> int:
+        # hash() кортежу цілих, на відміну від рядків, не залежить від PYTHONHASHSEED
+        return hash(tuple(map(self.token_hashes.__getitem__, key))) & self._MASK
+
+    def _slots(self, h: int) -> List[int]:
+        # Подвійне хешування: рядки незалежні, бо крок береться зі старшої половини хешу
+        low, step, width = h & 0xFFFFFFFF, (h >> 32) | 1, self.width
+        return [(low + row * step) % width for row in range(self.depth)]
+
+    def _estimate(self, key: Tuple[int, ...]) -> int:
+        return min(row[slot] for row, slot in zip(self.rows, self._slots(self._hash(key))))
+
+    def _evict_below(self, estimate: int) -> bool:
+        """Витіснення найслабшого кандидата, якщо його оцінка нижча за estimate"""
+        heap, candidates = self.heap, self.candidates
+        while True:
+            value, order, weakest = heap[0]
+            current = candidates[weakest]
+            if current == value:
+                break
+            heapq.heapreplace(heap, (current, order, weakest))
+        if estimate <= value:
+            return False
+        heapq.heappop(heap)
+        del candidates[weakest]
+        del self.first_seen[weakest]
+        return True
+
+    def _rebuild_heap(self) -> None:
+        self.heap = [(value, -self.first_seen[key], key) for key, value in self.candidates.items()]
+        heapq.heapify(self.heap)
+
+    def add_sequence(self, tokens: List[str]) -> None:
+        # Точні лічильники накопичуються в обмеженому буфері (як у NgramCounter)
+        # і скидаються в скетч партіями: повтори всередині партії — одне оновлення
+        super().add_sequence(tokens)
+        if len(self.counts) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Перенесення буфера точних лічильників у скетч і купу кандидатів"""
+        pending, self.counts = self.counts, Counter()
+        rows, width, depth_steps = self.rows, self.width, range(self.depth)
+        token_hash, mask = self.token_hashes.__getitem__, self._MASK
+        candidates, first_seen, heap, k = self.candidates, self.first_seen, self.heap, self.k
+        for key, count in pending.items():
+            h = hash(tuple(map(token_hash, key))) & mask
+            low, step = h & 0xFFFFFFFF, (h >> 32) | 1
+            slots = [(low + row * step) % width for row in depth_steps]
+            # Консервативне оновлення: піднімаємо лише комірки, менші за нову оцінку
+            estimate = min([row[slot] for row, slot in zip(rows, slots)]) + count
+            for row, slot in zip(rows, slots):
+                if row[slot] < estimate:
+                    row[slot] = estimate
+
+            self.seen_total += 1
+            if key in candidates:
+                candidates[key] = estimate
+                continue
+            # Значення в купі не більші за поточні, тож нижча оцінка не пройде
+            if len(candidates) >= k and (estimate <= heap[0][0] or not self._evict_below(estimate)):
+                continue
+            heapq.heappush(heap, (estimate, -self.seen_total, key))
+            candidates[key] = estimate
+            first_seen[key] = self.seen_total
+
+    def merge(self, other: 'NgramCounter') -> None:
+        remap = self._intern(other.words)
+        if not isinstance(other, TopKNgramCounter):
+            for key, count in other.counts.items():
+                self.counts[tuple(remap[token_id] for token_id in key)] += count
+            self.flush()
+            return
+
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Скетчі різного розміру не можна злити")
+        self.flush()
+        other.flush()
+        for own_row, other_row in zip(self.rows, other.rows):
+            for slot, value in enumerate(other_row):
+                if value:
+                    own_row[slot] += value
+
+        # Кандидати обох частин переоцінюються за спільним скетчем
+        pool = dict(self.first_seen)
+        for key, order in other.first_seen.items():
+            pool.setdefault(tuple(remap[token_id] for token_id in key), self.seen_total + order)
+        self.seen_total += other.seen_total
+
+        estimates = {key: self._estimate(key) for key in pool}
+        keep = heapq.nlargest(self.k, pool, key=lambda key: (estimates[key], -pool[key]))
+        self.candidates = {key: estimates[key] for key in keep}
+        self.first_seen = {key: pool[key] for key in keep}
+        self._rebuild_heap()
+
+    def top(self, limit: int) -> List[Tuple[str, int]]:
+        self.flush()
+        ranked = heapq.nlargest(
+            limit,
+            self.candidates.items(),
+            key=lambda item: (item[1], len(item[0]), -self.first_seen[item[0]]),
+        )
+        return [(self.phrase(key), count) for key, count in ranked]
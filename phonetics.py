@@ -0,0 +1,246 @@
+"""
+Пошук слів, схожих за звучанням.
+
+Кожне слово зводиться до фонетичного ключа в дусі Soundex/Metaphone:
+дзвінкі й глухі пари об'єднуються, голосні (крім першої літери), м'який
+знак і апостроф відкидаються, повтори схлопуються. Слова з однаковим
+ключем звучать схоже; сусідні ключі (відстань редагування 1–2) шукаються
+в BK-деревах, розбитих за першим звуком і довжиною ключа: співзвуччя має
+починатися так само, а дерева лишаються малими. Дерева будуються наперед
+через build_trees() (ai_model.preload() — у головному процесі до fork, щоб
+воркери ділили їх copy-on-write); частина, якої ще немає, будується при
+першому зверненні. Відповіді для повторюваних слів кешуються (LRU).
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lexicon import Lexicon, normalize_word
+
+# Класи звуків: літери одного класу вважаються співзвучними
+_SOUND_CLASSES = {
+    'б': 'P', 'п': 'P',
+    'д': 'T', 'т': 'T',
+    'з': 'S', 'с': 'S', 'ц': 'S',
+    'ж': 'X', 'ш': 'X', 'ч': 'X', 'щ': 'X',
+    'г': 'K', 'ґ': 'K', 'к': 'K', 'х': 'K',
+    'в': 'F', 'ф': 'F',
+    'л': 'L', 'м': 'M', 'н': 'N', 'р': 'R',
+    # Йотовані голосні звучать з «й»
+    'й': 'J', 'ї': 'J', 'є': 'J', 'ю': 'J', 'я': 'J',
+}
+_VOWELS = frozenset('аеиіоу')
+
+
+def phonetic_key(word: str) -> str:
+    """
+    Фонетичний ключ слова: «функція» → «FNKSJ», «панда» → «PNT».
+    Початковий голосний зберігається як «A», решта голосних лише розділяють
+    приголосні (тож «папа» → «PP», а «ппа» → «P»).
+    """
+    word = normalize_word(word)
+    key: List[str] = []
+    last = None
+    for i, char in enumerate(word):
+        if char in _VOWELS:
+            if i == 0:
+                key.append('A')
+            last = None
+            continue
+        code = _SOUND_CLASSES.get(char)
+        if code is not None and code != last:
+            key.append(code)
+        if code is not None:
+            last = code
+    return ''.join(key)
+
+
+_SYLLABLE_VOWELS = frozenset('аеєиіїоуюя')
+
+
+def syllables(word: str) -> List[str]:
+    """
+    Спрощений поділ на склади: кожен склад має один голосний, одна приголосна
+    між голосними відходить до наступного складу, з кількох — перша лишається
+    в попередньому («економічна» → е-ко-но-міч-на). М'який знак і апостроф
+    лишаються при попередній літері.
+    """
+    word = normalize_word(word)
+    vowels = [i for i, char in enumerate(word) if char in _SYLLABLE_VOWELS]
+    if len(vowels) < 2:
+        return [word] if word else []
+    parts: List[str] = []
+    start = 0
+    for current, following in zip(vowels, vowels[1:]):
+        consonants = following - current - 1
+        cut = current + 1 if consonants <= 1 else current + 2
+        while cut < following and word[cut] in "ь'’":
+            cut += 1
+        parts.append(word[start:cut])
+        start = cut
+    parts.append(word[start:])
+    return parts
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Відстань Левенштейна бітово-паралельним алгоритмом Маєрса (Hyyrö):
+    один прохід по b з цілочисельними операціями замість таблиці len(a) × len(b).
+    """
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+
+class BKTree:
+    """BK-дерево фонетичних ключів для пошуку сусідів за відстанню редагування"""
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self._root: Optional[Tuple[str, Dict[int, tuple]]] = None
+        self.size = 0
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> None:
+        if self._root is None:
+            self._root = (key, {})
+            self.size = 1
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(key, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (key, {})
+                self.size += 1
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int, max_nodes: int = 500) -> List[Tuple[int, str]]:
+        """
+        Ключі на відстані не більше max_distance, відсортовані за відстанню.
+        max_nodes обмежує кількість відвіданих вузлів — і час пошуку.
+        """
+        if self._root is None:
+            return []
+        found: List[Tuple[int, str]] = []
+        stack = [self._root]
+        visited = 0
+        while stack and visited < max_nodes:
+            node_key, children = stack.pop()
+            visited += 1
+            distance = edit_distance(key, node_key)
+            if distance <= max_distance:
+                found.append((distance, node_key))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class PhoneticIndex:
+    """Індекс ключ → слова словника з BK-деревом ключів і LRU-кешем відповідей"""
+
+    def __init__(self, words: Iterable[str], cache_size: int = 4096, max_words_per_key: int = 32):
+        # Словник, з якого побудовано індекс (якщо побудовано зі словника)
+        self.lexicon: Optional[Lexicon] = None
+        buckets: Dict[str, List[str]] = {}
+        for word in words:
+            key = phonetic_key(word)
+            if len(key) >= 2:
+                bucket = buckets.setdefault(key, [])
+                if len(bucket) < max_words_per_key:
+                    bucket.append(word)
+        self._by_key: Dict[str, Tuple[str, ...]] = {key: tuple(bucket) for key, bucket in buckets.items()}
+        self._partitions: Dict[Tuple[str, int], List[str]] = {}
+        for key in self._by_key:
+            self._partitions.setdefault((key[0], len(key)), []).append(key)
+        self._trees: Dict[Tuple[str, int], BKTree] = {}
+        self._tree_lock = threading.Lock()
+        self.sound_alikes = lru_cache(maxsize=cache_size)(self._sound_alikes)
+
+    @classmethod
+    def from_lexicon(cls, lexicon: Lexicon, **kwargs) -> 'PhoneticIndex':
+        index = cls((lexicon.word(i) for i in range(len(lexicon))), **kwargs)
+        index.lexicon = lexicon
+        return index
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def _tree(self, partition: Tuple[str, int]) -> Optional[BKTree]:
+        tree = self._trees.get(partition)
+        if tree is None and partition in self._partitions:
+            with self._tree_lock:
+                tree = self._trees.get(partition)
+                if tree is None:
+                    tree = self._trees[partition] = BKTree(self._partitions[partition])
+        return tree
+
+    def build_trees(self) -> int:
+        """Побудова BK-дерев усіх частин наперед; повертає кількість дерев"""
+        for partition in self._partitions:
+            self._tree(partition)
+        return len(self._trees)
+
+    def _sound_alikes(self, word: str, limit: int = 3, max_distance: int = 1) -> Tuple[str, ...]:
+        """
+        Співзвучні слова: спершу з тим самим ключем, потім із найближчими.
+        Форми того самого слова («функція», «функції») не вважаються парою.
+        """
+        word = normalize_word(word)
+        key = phonetic_key(word)
+        if len(key) < 2:
+            return ()
+
+        stem = word[:4] if len(word) > 4 else word
+        result = [candidate for candidate in self._by_key.get(key, ())
+                  if candidate != word and not candidate.startswith(stem)][:limit]
+        if len(result) >= limit:
+            return tuple(result)
+
+        # Точних збігів замало — добираємо слова з найближчими ключами
+        neighbours: List[Tuple[int, str]] = []
+        for length in range(len(key) - max_distance, len(key) + max_distance + 1):
+            tree = self._tree((key[0], length))
+            if tree is not None:
+                neighbours.extend(item for item in tree.search(key, max_distance) if item[0] > 0)
+        neighbours.sort()
+        for _, candidate_key in neighbours:
+            for candidate in self._by_key[candidate_key]:
+                if not candidate.startswith(stem):
+                    result.append(candidate)
+                    if len(result) >= limit:
+                        return tuple(result)
+        return tuple(result)
+
+    def stats(self) -> Dict[str, int]:
+        info = self.sound_alikes.cache_info()
+        return {'keys': len(self._by_key), 'trees_built': len(self._trees), 'cache_hits': info.hits,
+                'cache_misses': info.misses, 'cache_size': info.currsize}
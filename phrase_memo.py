@@ -0,0 +1,67 @@
+"""
+Спільний для всіх запитів процесу кеш результатів технік для окремих фраз.
+
+Ті самі фрази з навчальних програм трапляються тисячі разів на день, а
+більшість технік рахує результат для кожної фрази незалежно. Ключ — техніка,
+фраза (і додаткові параметри на кшталт позиції чи зерна) та версія
+генератора; найдавніше використані записи витісняються.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class PhraseMemo:
+    """Потокобезпечний LRU-кеш результатів технік за фразою зі статистикою влучань"""
+
+    def __init__(self, max_entries: int = 50000, version: str = ''):
+        self.max_entries = max_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: 'OrderedDict[Tuple[Hashable, ...], Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """
+        Збережений результат для key або compute(). Обчислення йде поза
+        блокуванням: два одночасні промахи можуть порахувати те саме двічі,
+        але запити з різними фразами не чекають один на одного.
+        """
+        key = (self.version,) + key
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
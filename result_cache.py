@@ -0,0 +1,261 @@
+"""
+Кеш результатів обробки тексту з адресацією за вмістом.
+
+Ключ — хеш нормалізованого тексту, режиму і версії генератора. Перший рівень —
+LRU у пам'яті процесу з обмеженням за розміром, другий (опційний) — каталог
+на диску, спільний для всіх воркерів, з обмеженням розміру і віку файлів.
+
+Обидва рівні зберігають серіалізований JSON, тож get() щоразу повертає нову
+копію значення: зміни у викликача не псують кеш і не видні іншим запитам.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Нормалізація тексту для ключа кешу: Unicode NFC і стиснуті пробіли"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def content_key(text: str, mode: str, version: str) -> str:
+    """Ключ кешу для тексту, режиму обробки і версії генератора"""
+    digest = hashlib.sha256()
+    for part in (version, mode, normalize_text(text)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def content_seed(text: str) -> int:
+    """Зерно генератора мнемонік з вмісту тексту: однаковий текст — однаковий результат"""
+    digest = hashlib.sha256(normalize_text(text).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class LRUCache:
+    """Потокобезпечний LRU-кеш з обмеженням сумарного розміру значень у байтах"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._items: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._items[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+
+class DiskCache:
+    """
+    Каталог зі стиснутими JSON-файлами; запис атомарний, тож безпечний для кількох воркерів.
+
+    Якщо задано max_bytes або max_age, після кожних записаних max_bytes / 10
+    байт (або sweep_interval секунд) каталог прочісується: видаляються файли,
+    старші за max_age, а потім найдавніше використані, доки розмір не стане
+    меншим за 90% max_bytes. Читання оновлює час зміни файлу.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None,
+                 max_age: Optional[float] = None, sweep_interval: float = 3600.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.sweep_interval = sweep_interval
+        self.swept_files = 0
+        self._written = 0
+        self._last_sweep = time.monotonic()
+        self._sweep_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = gzip.decompress(f.read())
+        except (FileNotFoundError, OSError, EOFError):
+            return None
+        if self.max_bytes:
+            # Час зміни — час останнього використання для витіснення найдавніших
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                compressed = gzip.compress(data, compresslevel=5)
+                f.write(compressed)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._maybe_sweep(len(compressed))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _maybe_sweep(self, written: int) -> None:
+        if not self.max_bytes and not self.max_age:
+            return
+        with self._sweep_lock:
+            self._written += written
+            due = (self.max_bytes and self._written >= self.max_bytes // 10) or \
+                time.monotonic() - self._last_sweep >= self.sweep_interval
+            if not due:
+                return
+            self._written = 0
+            self._last_sweep = time.monotonic()
+        self.sweep()
+
+    def sweep(self) -> int:
+        """Видалення задавнених і найдавніше використаних файлів; повертає кількість видалених"""
+        now = time.time()
+        files: List[Tuple[float, int, str]] = []
+        removed = 0
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                    removed += self._remove(entry.path)
+                else:
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        if self.max_bytes:
+            total = sum(size for _, size, _ in files)
+            target = self.max_bytes * 0.9
+            if total > self.max_bytes:
+                files.sort()
+                for _, size, path in files:
+                    if total <= target:
+                        break
+                    removed += self._remove(path)
+                    total -= size
+        with self._sweep_lock:
+            self.swept_files += removed
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            # Файл уже прибрав інший воркер
+            return 0
+
+
+class ResultCache:
+    """Дворівневий кеш результатів (пам'ять → диск) з лічильниками влучань"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None,
+                 disk_max_bytes: Optional[int] = None, disk_max_age: Optional[float] = None):
+        self.memory = LRUCache(max_bytes)
+        self.disk = DiskCache(disk_dir, disk_max_bytes, disk_max_age) if disk_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str, record: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Повертає (значення, рівень кешу) або (None, None); record=False — без лічильників"""
+        data = self.memory.get(key)
+        if data is not None:
+            if record:
+                self._count(True)
+            return json.loads(data), 'memory'
+
+        if self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                try:
+                    value = json.loads(data)
+                except ValueError:
+                    value = None
+                if value is not None:
+                    self.memory.put(key, data, len(data))
+                    if record:
+                        self._count(True)
+                    return value, 'disk'
+
+        if record:
+            self._count(False)
+        return None, None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.memory.put(key, data, len(data))
+        if self.disk is not None:
+            self.disk.put(key, data)
+
+    def delete(self, key: str) -> None:
+        self.memory.pop(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self.memory),
+            'memory_bytes': self.memory.current_bytes,
+            'disk_swept': self.disk.swept_files if self.disk is not None else 0,
+        }
@@ -0,0 +1,112 @@
+"""
+Пошук рим за закінченням слова.
+
+Індекс — словник lexicon.py, у якому слова записані задом наперед: слова з
+однаковим закінченням стоять у ньому поруч, і діапазон для закінчення
+знаходиться одним бінарним пошуком. Рими ранжуються за довжиною спільного
+закінчення: діапазони для дедалі довших закінчень слова вкладені один в
+один, тож найкращі рими — у найвужчому непорожньому. Результати для слова
+кешуються, тож повторні запити не торкаються словника.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+from lexicon import Lexicon, normalize_word
+
+VOWELS = frozenset('аеєиіїоуюя')
+
+
+def rhyme_ending(word: str) -> str:
+    """
+    Римована частина слова: від передостаннього голосного до кінця
+    («функція» → «ія», «економіка» → «іка»). У словах з одним голосним —
+    від нього до кінця.
+    """
+    word = normalize_word(word)
+    vowel_positions = [i for i, char in enumerate(word) if char in VOWELS]
+    if not vowel_positions:
+        return word
+    start = vowel_positions[-2] if len(vowel_positions) >= 2 else vowel_positions[-1]
+    return word[start:]
+
+
+class RhymeIndex:
+    """Рими зі словника-дзеркала (слова задом наперед) з кешем результатів за словом"""
+
+    def __init__(self, reversed_lexicon: Lexicon, cache_size: int = 4096):
+        self.lexicon = reversed_lexicon
+        self.cache_size = cache_size
+        self._results: 'OrderedDict[Tuple[str, int], Tuple[str, ...]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], **kwargs) -> 'RhymeIndex':
+        return cls(Lexicon.from_words(word[::-1] for word in words), **kwargs)
+
+    def _ranked(self, reversed_word: str, ending: str, limit: int) -> List[str]:
+        """
+        До limit слів із закінченням ending, упорядкованих за довжиною спільного
+        закінчення з reversed_word (перевернуті, як у словнику). Усередині рівня
+        однакової довжини — найближчі за порядком словника.
+        """
+        # Вкладені діапазони: ranges[j] — слова, що закінчуються на останні len(ending) + j літер
+        ranges = [self.lexicon.prefix_range(ending[::-1])]
+        for k in range(len(ending) + 1, len(reversed_word) + 1):
+            lo, hi = self.lexicon.prefix_range(reversed_word[:k], ranges[-1])
+            if lo == hi:
+                break
+            ranges.append((lo, hi))
+
+        found: List[str] = []
+        inner_lo = inner_hi = None
+        for lo, hi in reversed(ranges):
+            if inner_lo is None:
+                inner_lo = inner_hi = lo
+            # Нові слова рівня — по обидва боки вужчого діапазону, від найближчих
+            left, right = inner_lo - 1, inner_hi
+            while len(found) < limit and (left >= lo or right < hi):
+                if right < hi and (left < lo or right - inner_hi <= inner_lo - 1 - left):
+                    candidate, right = self.lexicon.word(right), right + 1
+                else:
+                    candidate, left = self.lexicon.word(left), left - 1
+                if candidate != reversed_word:
+                    found.append(candidate[::-1])
+            if len(found) >= limit:
+                break
+            inner_lo, inner_hi = lo, hi
+        return found
+
+    def rhymes(self, word: str, limit: int = 3) -> List[str]:
+        """Слова, що римуються з word; першими — зі спільним довшим закінченням"""
+        word = normalize_word(word)
+        key = (word, limit)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return list(cached)
+
+        ending = rhyme_ending(word)
+        # Якщо на повне закінчення рим немає, пробуємо коротше — від останнього голосного
+        endings = [ending]
+        last_vowel = max((i for i, char in enumerate(word) if char in VOWELS), default=-1)
+        if 0 <= last_vowel and len(word) - last_vowel >= 2 and word[last_vowel:] != ending:
+            endings.append(word[last_vowel:])
+
+        found: List[str] = []
+        for current in endings:
+            found = self._ranked(word[::-1], current, limit)
+            if found:
+                break
+
+        with self._lock:
+            self._results[key] = tuple(found)
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return found
+
+    def cache_info(self) -> dict:
+        with self._lock:
+            return {'words': len(self._results), 'max_words': self.cache_size}
@@ -0,0 +1,756 @@
+"""
+Сховища результатів сесій.
+
+SQLiteSessionStore — основне сховище: одна база в режимі WAL, компактні
+стиснуті JSON-блоби, індекси за id і часом створення, пакетні вставки.
+JsonFileSessionStore — попередній формат (файл session_<id>.json на сесію).
+WriteBehindSessionStore — обгортка, що записує сесії у фоновому потоці пакетами.
+SessionEvictor — фоновий потік, що видаляє сесії за TTL і загальним розміром
+(у кожному воркері, але очищує лише той, що тримає файлове блокування).
+
+Міграція старих файлів у базу:
+    python session_store.py migrate static/user_data static/user_data/sessions.db
+Повторний запис сесій, які фоновий запис не зміг зберегти:
+    python session_store.py replay static/user_data/sessions.deadletter.jsonl static/user_data/sessions.db
+"""
+
+import argparse
+import bisect
+import json
+import os
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_SESSION_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+
+_CROCKFORD_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+
+
+def new_session_id() -> str:
+    """
+    Id сесії у форматі ULID: 48 біт часу в мілісекундах + 80 випадкових біт,
+    26 символів base32 Крокфорда. Id впорядковуються за часом створення,
+    а ймовірність колізії практично нульова.
+    """
+    value = (int(time.time() * 1000) << 80) | int.from_bytes(secrets.token_bytes(10), 'big')
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD_ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+
+def is_valid_session_id(session_id: str) -> bool:
+    """Id сесії потрапляє в шляхи і запити, тому дозволяємо лише безпечні символи"""
+    return bool(_SESSION_ID_RE.match(session_id or ''))
+
+
+def session_timestamp(data: Dict[str, Any], default: Optional[float] = None) -> float:
+    """Час створення сесії (Unix time) з поля timestamp результату"""
+    try:
+        return datetime.fromisoformat(data['timestamp']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return default if default is not None else datetime.now().timestamp()
+
+
+def serialize_session(data: Dict[str, Any]) -> str:
+    """Компактний JSON без відступів"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_session(data: Dict[str, Any]) -> bytes:
+    """Компактний JSON без відступів, стиснутий zlib"""
+    return zlib.compress(serialize_session(data).encode('utf-8'), 6)
+
+
+def decode_session(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+class SessionStore:
+    """Інтерфейс сховища сесій"""
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        self.save_many([(session_id, data)])
+
+    def save_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        raise NotImplementedError
+
+    def save_serialized(self, items: Iterable[Tuple[str, str, float]]) -> None:
+        """Запис уже серіалізованих сесій: трійки (id, JSON, час створення)"""
+        self.save_many((session_id, json.loads(raw)) for session_id, raw, _ in items)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def list_sessions(self, since: Optional[float] = None, until: Optional[float] = None,
+                      limit: int = 100) -> List[Tuple[str, float]]:
+        """Пари (id, час створення) у порядку створення"""
+        raise NotImplementedError
+
+    def total_size(self) -> int:
+        """Сумарний розмір збережених сесій у байтах"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonFileSessionStore(SessionStore):
+    """
+    Попередній формат: окремий JSON-файл на кожну сесію.
+
+    Час створення — час зміни файлу. list_sessions() працює за індексом
+    (час, id), відсортованим за часом: він будується одним обходом каталогу
+    без читання файлів і перебудовується, лише коли змінився сам каталог
+    (файли додали або видалили інші процеси). Власні save/delete оновлюють
+    індекс на місці.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._index: List[Tuple[float, str]] = []
+        self._index_sizes: Dict[str, Tuple[float, int]] = {}
+        self._index_version: Optional[int] = None
+        self._index_lock = threading.Lock()
+
+    def _path(self, session_id: str) -> str:
+        if not is_valid_session_id(session_id):
+            raise ValueError(f"Некоректний id сесії: {session_id!r}")
+        return os.path.join(self.directory, f"session_{session_id}.json")
+
+    def save_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        for session_id, data in items:
+            path = self._path(session_id)
+
+            def write():
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                stat = os.stat(path)
+                return stat.st_mtime, stat.st_size
+
+            self._indexed_change(session_id, write)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_session_id(session_id):
+            return None
+        try:
+            with open(self._path(session_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        deleted = 0
+        for session_id in session_ids:
+            try:
+                path = self._path(session_id)
+            except ValueError:
+                continue
+
+            def remove():
+                nonlocal deleted
+                try:
+                    os.remove(path)
+                    deleted += 1
+                except FileNotFoundError:
+                    pass
+
+            self._indexed_change(session_id, remove)
+        return deleted
+
+    def iter_files(self) -> Iterable[Tuple[str, str]]:
+        """Пари (id, шлях) для всіх файлів сесій у каталозі"""
+        for session_id, entry in self._iter_entries():
+            yield session_id, entry.path
+
+    def _iter_entries(self) -> Iterable[Tuple[str, os.DirEntry]]:
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_file() and name.startswith('session_') and name.endswith('.json'):
+                    yield name[len('session_'):-len('.json')], entry
+
+    def _refresh_index(self) -> None:
+        """Перебудова індексу, якщо каталог змінився після останнього обходу"""
+        version = os.stat(self.directory).st_mtime_ns
+        if version == self._index_version:
+            return
+        sizes = {}
+        for session_id, entry in self._iter_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            sizes[session_id] = (stat.st_mtime, stat.st_size)
+        self._index_sizes = sizes
+        self._index = sorted((created, session_id) for session_id, (created, _) in sizes.items())
+        self._index_version = version
+
+    def _indexed_change(self, session_id: str, change) -> None:
+        """
+        Зміна файлу сесії з оновленням індексу на місці. change() повертає
+        (час, розмір) записаного файлу або None, якщо файл видалено. Версія
+        індексу просувається, лише якщо до зміни вона була актуальною: тоді
+        чужих змін каталогу між обходами не було.
+        """
+        with self._index_lock:
+            before = os.stat(self.directory).st_mtime_ns
+            entry = change()
+            if self._index_version is None:
+                return
+            old = self._index_sizes.pop(session_id, None)
+            if old is not None:
+                position = bisect.bisect_left(self._index, (old[0], session_id))
+                if position < len(self._index) and self._index[position] == (old[0], session_id):
+                    del self._index[position]
+            if entry is not None:
+                self._index_sizes[session_id] = entry
+                bisect.insort(self._index, (entry[0], session_id))
+            if before == self._index_version:
+                self._index_version = os.stat(self.directory).st_mtime_ns
+
+    def list_sessions(self, since: Optional[float] = None, until: Optional[float] = None,
+                      limit: int = 100) -> List[Tuple[str, float]]:
+        with self._index_lock:
+            self._refresh_index()
+            start = 0 if since is None else bisect.bisect_left(self._index, (since, ''))
+            sessions = []
+            for created, session_id in self._index[start:]:
+                if len(sessions) >= limit or (until is not None and created >= until):
+                    break
+                sessions.append((session_id, created))
+        return sessions
+
+    def total_size(self) -> int:
+        with self._index_lock:
+            self._refresh_index()
+            return sum(size for _, size in self._index_sizes.values())
+
+
+class SQLiteSessionStore(SessionStore):
+    """Сесії в одній SQLite-базі (WAL) зі стиснутими блобами та індексом за часом"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            size INTEGER NOT NULL,
+            data BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at);
+
+        -- Загальний розмір підтримується тригерами, щоб не сумувати всю таблицю
+        CREATE TABLE IF NOT EXISTS session_stats (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_size INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO session_stats (id, total_size)
+            SELECT 1, COALESCE(SUM(size), 0) FROM sessions;
+        CREATE TRIGGER IF NOT EXISTS sessions_size_insert AFTER INSERT ON sessions BEGIN
+            UPDATE session_stats SET total_size = total_size + NEW.size WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sessions_size_update AFTER UPDATE OF size ON sessions BEGIN
+            UPDATE session_stats SET total_size = total_size - OLD.size + NEW.size WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS sessions_size_delete AFTER DELETE ON sessions BEGIN
+            UPDATE session_stats SET total_size = total_size - OLD.size WHERE id = 1;
+        END;
+    """
+
+    def __init__(self, path: str, legacy_dir: Optional[str] = None):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Сесії, збережені до переходу на базу, читаються зі старих файлів
+        self.legacy = JsonFileSessionStore(legacy_dir) if legacy_dir else None
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+        # З'єднання не повинно пережити fork (gunicorn preload_app): закриваємо
+        # його одразу, а в дочірньому процесі скидаємо з'єднання потоків
+        self.close()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Окреме з'єднання на потік: sqlite3 не дозволяє ділити їх між потоками
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def save_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self._save_rows(
+            (session_id, encode_session(data), session_timestamp(data)) for session_id, data in items
+        )
+
+    def save_serialized(self, items: Iterable[Tuple[str, str, float]]) -> None:
+        # JSON уже компактний — лишається стиснути, без повторної серіалізації
+        self._save_rows(
+            (session_id, zlib.compress(raw.encode('utf-8'), 6), created) for session_id, raw, created in items
+        )
+
+    def _save_rows(self, items: Iterable[Tuple[str, bytes, float]]) -> None:
+        rows = []
+        for session_id, blob, created in items:
+            if not is_valid_session_id(session_id):
+                raise ValueError(f"Некоректний id сесії: {session_id!r}")
+            rows.append((session_id, created, len(blob), blob))
+        if not rows:
+            return
+        with self._connection() as conn:
+            # Upsert замість INSERT OR REPLACE: REPLACE не викликає тригер видалення
+            conn.executemany(
+                'INSERT INTO sessions (id, created_at, size, data) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET created_at = excluded.created_at, '
+                'size = excluded.size, data = excluded.data',
+                rows,
+            )
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_session_id(session_id):
+            return None
+        row = self._connection().execute(
+            'SELECT data FROM sessions WHERE id = ?', (session_id,)
+        ).fetchone()
+        if row is not None:
+            return decode_session(row[0])
+        if self.legacy is not None:
+            return self.legacy.load(session_id)
+        return None
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        session_ids = list(session_ids)
+        ids = [(session_id,) for session_id in session_ids]
+        with self._connection() as conn:
+            cursor = conn.executemany('DELETE FROM sessions WHERE id = ?', ids)
+        deleted = cursor.rowcount
+        if self.legacy is not None:
+            # Старі сесії (8-символьні id) живуть лише у файлах і теж видаляються
+            deleted += self.legacy.delete_many(session_ids)
+        return deleted
+
+    def list_sessions(self, since: Optional[float] = None, until: Optional[float] = None,
+                      limit: int = 100) -> List[Tuple[str, float]]:
+        query = 'SELECT id, created_at FROM sessions WHERE created_at >= ? AND created_at < ? ' \
+                'ORDER BY created_at LIMIT ?'
+        params = (
+            since if since is not None else float('-inf'),
+            until if until is not None else float('inf'),
+            limit,
+        )
+        sessions = [tuple(row) for row in self._connection().execute(query, params)]
+        if self.legacy is not None:
+            # Файли старого формату в тому ж порядку за часом, щоб очищення їх не пропускало
+            sessions = sorted(sessions + self.legacy.list_sessions(since, until, limit),
+                              key=lambda item: item[1])[:limit]
+        return sessions
+
+    def total_size(self) -> int:
+        row = self._connection().execute('SELECT total_size FROM session_stats WHERE id = 1').fetchone()
+        total = row[0] if row else 0
+        if self.legacy is not None:
+            total += self.legacy.total_size()
+        return total
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class WriteBehindSessionStore(SessionStore):
+    """
+    Відкладений запис: save() один раз серіалізує сесію в JSON (це й знімок:
+    подальші зміни словника викликачем не потрапляють у запис) і ставить її в
+    чергу, а фоновий потік записує сесії пакетами. Доки запис не завершено,
+    load() розбирає JSON із пам'яті. close() дописує все, що залишилось у черзі.
+
+    Пакет, який не вдалося записати, повторюється max_retries разів із
+    подвоєнням паузи, після чого сесії дописуються рядками JSON у файл
+    dead_letter_path (python session_store.py replay ... повертає їх у
+    сховище). Якщо в пам'яті вже max_pending незаписаних сесій, save()
+    пише напряму в backend.
+    """
+
+    def __init__(self, backend: SessionStore, batch_size: int = 100, flush_interval: float = 0.05,
+                 max_pending: int = 10000, max_retries: int = 3, retry_delay: float = 0.5,
+                 dead_letter_path: Optional[str] = None):
+        self.backend = backend
+        self.dead_letter_path = dead_letter_path
+        self.dead_lettered = 0
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._closed = False
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._pending_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        """
+        Потік запису належить процесу, що його запустив, і стартує з першим
+        зверненням, а не в конструкторі: під gunicorn з preload_app сховище
+        створюється в головному процесі. Після fork потоків батька в дочірньому
+        процесі немає, тож він запускає власний потік із порожньою чергою.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pending = {}
+            self._pending_lock = threading.Lock()
+            self._queue: 'queue.Queue[Optional[str]]' = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='session-write-behind', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def save_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        if self._closed:
+            self.backend.save_many(items)
+            return
+        self._ensure_started()
+        for session_id, data in items:
+            if not is_valid_session_id(session_id):
+                raise ValueError(f"Некоректний id сесії: {session_id!r}")
+            # Серіалізація — єдина робота в потоці запиту; рядок незмінний і слугує знімком
+            snapshot = (serialize_session(data), session_timestamp(data))
+            with self._pending_lock:
+                overflow = (len(self._pending) >= self.max_pending
+                            and session_id not in self._pending)
+                if not overflow:
+                    self._pending[session_id] = snapshot
+            if overflow:
+                # Запис відстає (або backend недоступний): не накопичуємо далі в пам'яті
+                self.backend.save_serialized([(session_id,) + snapshot])
+            else:
+                self._queue.put(session_id)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self._ensure_started()
+        with self._pending_lock:
+            snapshot = self._pending.get(session_id)
+        if snapshot is not None:
+            return json.loads(snapshot[0])
+        return self.backend.load(session_id)
+
+    def delete_many(self, session_ids: Iterable[str]) -> int:
+        session_ids = list(session_ids)
+        self.flush()
+        return self.backend.delete_many(session_ids)
+
+    def list_sessions(self, since: Optional[float] = None, until: Optional[float] = None,
+                      limit: int = 100) -> List[Tuple[str, float]]:
+        self.flush()
+        return self.backend.list_sessions(since, until, limit)
+
+    def total_size(self) -> int:
+        return self.backend.total_size()
+
+    def pending_count(self) -> int:
+        with self._pending_lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """Очікування, доки всі поставлені в чергу сесії будуть записані"""
+        if not self._closed and self._pid == os.getpid():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        if self._pid == os.getpid():
+            self._queue.put(None)
+            self._thread.join()
+        self.backend.close()
+
+    def _run(self) -> None:
+        while True:
+            session_id = self._queue.get()
+            if session_id is None:
+                self._queue.task_done()
+                return
+            ids = [session_id]
+            # Збираємо пакет: все, що вже в черзі, або що надійде за flush_interval
+            while len(ids) < self.batch_size:
+                try:
+                    next_id = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if next_id is None:
+                    self._queue.put(None)
+                    self._queue.task_done()
+                    break
+                ids.append(next_id)
+            self._write_batch(ids)
+
+    def _write_batch(self, ids: List[str]) -> None:
+        with self._pending_lock:
+            batch = {session_id: self._pending[session_id]
+                     for session_id in ids if session_id in self._pending}
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self.backend.save_serialized(
+                        (session_id, raw, created) for session_id, (raw, created) in batch.items()
+                    )
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        # Без меж незаписані сесії накопичувались би в пам'яті
+                        self._dead_letter(batch, e)
+                        break
+                    # Сесії поки залишаються в пам'яті, тож читання продовжує працювати
+                    print(f"⚠️ Не вдалося записати {len(batch)} сесій, повтор: {e}")
+                    time.sleep(self.retry_delay * 2 ** attempt)
+            with self._pending_lock:
+                for session_id, data in batch.items():
+                    # Сесію могли перезаписати, поки пакет зберігався
+                    if self._pending.get(session_id) is data:
+                        del self._pending[session_id]
+        finally:
+            for _ in ids:
+                self._queue.task_done()
+
+    def _dead_letter(self, batch: Dict[str, Tuple[str, float]], error: Exception) -> None:
+        """Сесії, які так і не вдалося записати, — рядками JSON у файл для повторного імпорту"""
+        if self.dead_letter_path:
+            try:
+                with open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                    for session_id, (raw, _) in batch.items():
+                        f.write(f'{{"id":{json.dumps(session_id)},"data":{raw}}}\n')
+                self.dead_lettered += len(batch)
+                print(f"⚠️ Не вдалося записати {len(batch)} сесій ({error}), "
+                      f"їх збережено в {self.dead_letter_path}")
+                return
+            except OSError as e:
+                error = e
+        print(f"⚠️ Не вдалося записати {len(batch)} сесій, їх відкинуто: {error}")
+
+
+class SessionEvictor:
+    """
+    Фоновий потік, що періодично видаляє сесії, старші за ttl_seconds, а потім
+    найстаріші сесії, доки загальний розмір не стане меншим за max_total_bytes.
+    Видалення йде пакетами в порядку створення за індексом часу сховища.
+
+    start() запускає потік у процесі, що його викликав, і не повинен
+    викликатися до fork (gunicorn preload_app): потік головного процесу не
+    переходить у воркери. Якщо задано lock_path, потік є в кожному воркері,
+    але очищує лише той, хто тримає ексклюзивне файлове блокування; коли
+    цей воркер завершується, блокування переходить до іншого.
+    """
+
+    def __init__(self, store: SessionStore, ttl_seconds: Optional[float] = None,
+                 max_total_bytes: Optional[int] = None, interval: float = 300.0,
+                 batch_size: int = 500, lock_path: Optional[str] = None):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_total_bytes = max_total_bytes
+        self.interval = interval
+        self.batch_size = batch_size
+        self.lock_path = lock_path if fcntl is not None else None
+        self.evicted_total = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._lock_fd: Optional[int] = None
+
+    def run_once(self) -> int:
+        """Один прохід очищення; повертає кількість видалених сесій"""
+        evicted = 0
+        if self.ttl_seconds:
+            cutoff = time.time() - self.ttl_seconds
+            while True:
+                batch = self.store.list_sessions(until=cutoff, limit=self.batch_size)
+                if not batch:
+                    break
+                evicted += self.store.delete_many(session_id for session_id, _ in batch)
+                if len(batch) < self.batch_size:
+                    break
+
+        if self.max_total_bytes:
+            while self.store.total_size() > self.max_total_bytes:
+                batch = self.store.list_sessions(limit=self.batch_size)
+                if not batch:
+                    break
+                evicted += self.store.delete_many(session_id for session_id, _ in batch)
+
+        self.evicted_total += evicted
+        return evicted
+
+    def start(self) -> 'SessionEvictor':
+        """Запуск потоку в поточному процесі; повторні виклики нічого не роблять"""
+        if self._pid == os.getpid():
+            return self
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # Після fork блокування батька (якщо було) дочірньому процесу не належить
+                self._lock_fd = None
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, name='session-evictor', daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self._thread = None
+        self._pid = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def is_designated(self) -> bool:
+        """Чи очищує цей процес: без lock_path — завжди, інакше — власник блокування"""
+        if not self.lock_path:
+            return True
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        # Блокування тримається до завершення процесу
+        self._lock_fd = fd
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                if self.is_designated():
+                    self.run_once()
+            except Exception as e:
+                print(f"⚠️ Помилка очищення сесій: {e}")
+
+
+def create_session_store(backend: str, path: str, legacy_dir: Optional[str] = None) -> SessionStore:
+    """Сховище за назвою бекенду: 'sqlite' (шлях до бази) або 'json' (каталог)"""
+    if backend == 'sqlite':
+        return SQLiteSessionStore(path, legacy_dir=legacy_dir)
+    if backend == 'json':
+        return JsonFileSessionStore(path)
+    raise ValueError(f"Невідомий бекенд сховища сесій: {backend}")
+
+
+def migrate_json_sessions(source_dir: str, store: SessionStore, batch_size: int = 500,
+                          remove: bool = False) -> int:
+    """Імпорт файлів session_<id>.json у сховище пакетами; повертає кількість сесій"""
+    legacy = JsonFileSessionStore(source_dir)
+    migrated = 0
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    batch_paths: List[str] = []
+
+    def flush():
+        nonlocal migrated
+        store.save_many(batch)
+        migrated += len(batch)
+        if remove:
+            for path in batch_paths:
+                os.remove(path)
+        batch.clear()
+        batch_paths.clear()
+
+    for session_id, path in legacy.iter_files():
+        if not is_valid_session_id(session_id):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Пропускаємо {path}: {e}")
+            continue
+        # Для сесій без коректного timestamp беремо час зміни файлу
+        data.setdefault('timestamp', datetime.fromtimestamp(os.path.getmtime(path)).isoformat())
+        batch.append((session_id, data))
+        batch_paths.append(path)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return migrated
+
+
+def replay_dead_letter(path: str, store: SessionStore, batch_size: int = 500) -> int:
+    """Повторний запис сесій із файлу WriteBehindSessionStore.dead_letter_path"""
+    replayed = 0
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            batch.append((record['id'], record['data']))
+            if len(batch) >= batch_size:
+                store.save_many(batch)
+                replayed += len(batch)
+                batch.clear()
+    if batch:
+        store.save_many(batch)
+        replayed += len(batch)
+    return replayed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Керування сховищем сесій')
+    commands = parser.add_subparsers(dest='command', required=True)
+    migrate = commands.add_parser('migrate', help='Імпорт JSON-файлів сесій у SQLite')
+    migrate.add_argument('source_dir', help='Каталог з файлами session_<id>.json')
+    migrate.add_argument('database', help='Шлях до SQLite-бази')
+    migrate.add_argument('--batch-size', type=int, default=500)
+    migrate.add_argument('--remove', action='store_true', help='Видаляти імпортовані файли')
+    replay = commands.add_parser('replay', help='Повторний запис сесій з файлу dead-letter')
+    replay.add_argument('dead_letter', help='Файл із рядками JSON незаписаних сесій')
+    replay.add_argument('database', help='Шлях до SQLite-бази')
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        store = SQLiteSessionStore(args.database)
+        count = migrate_json_sessions(args.source_dir, store, args.batch_size, args.remove)
+        store.close()
+        print(f"✅ Імпортовано сесій: {count}")
+    elif args.command == 'replay':
+        store = SQLiteSessionStore(args.database)
+        count = replay_dead_letter(args.dead_letter, store)
+        store.close()
+        print(f"✅ Повторно записано сесій: {count}")
+
+
+if __name__ == '__main__':
+    main()
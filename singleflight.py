@@ -0,0 +1,118 @@
+"""
+Об'єднання однакових одночасних обчислень (single-flight).
+
+Усередині процесу перший запит із ключем стає «ведучим», решта чекають на
+його подію і отримують той самий результат (або ту саму помилку). Між
+воркерами ведучі синхронізуються через файлові блокування (fcntl) у
+спільному каталозі: поки один воркер рахує, інші чекають і потім беруть
+результат зі спільного кешу. Там, де fcntl недоступний, працює лише
+об'єднання всередині процесу.
+"""
+
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class _Call:
+    """Одне обчислення, на яке можуть чекати кілька потоків"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Виконує fn один раз для всіх одночасних викликів з однаковим ключем"""
+
+    def __init__(self, lock_dir: Optional[str] = None, lock_timeout: float = 60.0,
+                 lock_shards: int = 4096):
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.lock_timeout = lock_timeout
+        self.lock_shards = lock_shards
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Повертає (результат, чи був він отриманий від іншого запиту)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            with self._process_lock(key):
+                call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def _lock_path(self, key: str) -> str:
+        # Фіксована кількість файлів: блокування не накопичуються з кожним новим ключем
+        shard = zlib.crc32(key.encode('utf-8')) % self.lock_shards
+        return os.path.join(self.lock_dir, f"{shard:04x}.lock")
+
+    @contextmanager
+    def _process_lock(self, key: str) -> Iterator[None]:
+        """Блокування між воркерами; після тайм-ауту обчислюємо без нього"""
+        if not self.lock_dir:
+            yield
+            return
+
+        fd = os.open(self._lock_path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        locked = False
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(0.05)
+            yield
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'in_flight': in_flight,
+            'cross_process': bool(self.lock_dir),
+        }
@@ -0,0 +1,75 @@
+"""
+Застосунок для тестів: дані в тимчасовому каталозі, клієнт Gemini без мережі.
+
+Конфігурація app.py читається при імпорті, тож шляхи задаються через
+змінні середовища до першого load_app(). Відносні шляхи застосунку
+(static/user_data) теж потрапляють у тимчасовий каталог.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class FakeGeminiClient:
+    """Клієнт Gemini з керованою затримкою та помилкою"""
+
+    model_name = 'fake-model'
+    delay = 0.0
+    error = None
+    calls = 0
+    _lock = threading.Lock()
+
+    def _call(self):
+        with FakeGeminiClient._lock:
+            FakeGeminiClient.calls += 1
+        time.sleep(FakeGeminiClient.delay)
+        if FakeGeminiClient.error is not None:
+            raise RuntimeError(FakeGeminiClient.error)
+
+    def generate_full_mnemonics(self, text):
+        self._call()
+        return {'analysis': {'sentence_count': 1}, 'acronyms': ['А'], 'tips': ['порада'], 'study_plan': 'план'}
+
+    def improve_text(self, text, language='uk'):
+        self._call()
+        return text.upper()
+
+    @classmethod
+    def reset(cls):
+        cls.delay, cls.error, cls.calls = 0.0, None, 0
+
+
+def load_app():
+    """Модуль app, імпортований один раз на процес тестів"""
+    if 'app' in sys.modules:
+        return sys.modules['app']
+    data_dir = tempfile.mkdtemp(prefix='mnemo-tests-')
+    os.chdir(data_dir)
+    paths = {
+        'SESSION_DB_PATH': 'sessions.db',
+        'JOB_DB_PATH': 'jobs.db',
+        'GEMINI_CACHE_DIR': 'gemini_cache',
+        'SINGLE_FLIGHT_LOCK_DIR': 'locks',
+    }
+    for name, value in paths.items():
+        os.environ.setdefault(name, os.path.join(data_dir, value))
+    settings = {
+        'DEEP_MODE_DEADLINE': '0.5',
+        'DEEP_MODE_WORKERS': '2',
+        'JOB_SSE_MAX_SECONDS': '1',
+        'SESSION_EVICTION_INTERVAL': '3600',
+    }
+    for name, value in settings.items():
+        os.environ.setdefault(name, value)
+    gemini_client = types.ModuleType('gemini_client')
+    gemini_client.get_gemini_client = FakeGeminiClient
+    sys.modules.setdefault('gemini_client', gemini_client)
+    import app
+    return app
@@ -0,0 +1,110 @@
+"""
+Пошук акронімів: бюджет вузлів і затримка.
+
+Бюджет рахує відвідані вузли й звернення до словника, тож кількість
+звернень до словника не може його перевищити. Затримка перевіряється на
+вбудованому словнику й на синтетичному великому: 99-й перцентиль холодного
+пошуку (найкращий з трьох прогонів) має вкладатися в 5 мс.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import random
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from acronyms import MAX_PHRASES, AcronymSearch
+from ai_model import lexicon
+from lexicon import Lexicon
+
+BUDGET_MS = 5.0
+
+PHRASE_WORDS = (
+    "економічна функція підприємства соціальна відповідальність інноваційний розвиток "
+    "ресурсне забезпечення стратегічне планування конкурентоспроможність ринку етичне "
+    "ставлення працівників довкілля матеріальні людські фінансові ресурси довгострокові "
+    "цілі компанії аналіз витрат облік капітал оборот прибуток ризик управління якість"
+).split()
+
+
+def make_phrases(rng: random.Random, count: int):
+    return [' '.join(rng.sample(PHRASE_WORDS, rng.randint(1, 3))) for _ in range(count)]
+
+
+def synthetic_lexicon(size: int) -> Lexicon:
+    """Великий словник зі складів: багато живих префіксів — найважчий випадок для перебору"""
+    rng = random.Random(size)
+    consonants, vowels = 'бвгджзклмнпрстфхцчш', 'аеиіоуя'
+    words = set()
+    while len(words) < size:
+        word = ''.join(rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(2, 5)))
+        words.add(word)
+    return Lexicon.from_words(words)
+
+
+class CountingLexicon:
+    """Обгортка словника, що рахує звернення до індексу префіксів"""
+
+    def __init__(self, lexicon: Lexicon):
+        self._lexicon = lexicon
+        self.lookups = 0
+
+    def __len__(self):
+        return len(self._lexicon)
+
+    def __contains__(self, word):
+        return word in self._lexicon
+
+    def prefix_range(self, prefix, within=None):
+        self.lookups += 1
+        return self._lexicon.prefix_range(prefix, within)
+
+
+def p99_ms(search: AcronymSearch, sets) -> float:
+    timings = []
+    for phrases in sets:
+        began = time.perf_counter()
+        search.search(phrases)
+        timings.append((time.perf_counter() - began) * 1000)
+    timings.sort()
+    return timings[int(len(timings) * 0.99) - 1]
+
+
+class AcronymSearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.large = synthetic_lexicon(100_000)
+
+    def test_lookups_stay_within_node_budget(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            counting = CountingLexicon(self.large)
+            search = AcronymSearch(counting, max_nodes=100)
+            search.search(make_phrases(rng, 12))
+            self.assertLessEqual(counting.lookups, 100)
+
+    def test_permutes_at_most_max_phrases(self):
+        found = AcronymSearch(lexicon()).search(make_phrases(random.Random(2), 12))
+        self.assertEqual(len(found['acronym']), MAX_PHRASES)
+        self.assertEqual(len(set(found['order'])), MAX_PHRASES)
+
+    def test_cold_search_p99_within_budget(self):
+        for name, lex in (('вбудований', lexicon()), ('великий', self.large)):
+            for count in (7, 12):
+                rng = random.Random(count)
+                sets = [make_phrases(rng, count) for _ in range(200)]
+                with self.subTest(lexicon=name, phrases=count):
+                    # Кожен набір шукається без кешу; найкращий з трьох прогонів відсіює
+                    # затримки, спричинені іншими процесами машини
+                    search = AcronymSearch(lex, cache_size=0)
+                    p99_ms(search, sets[:20])
+                    self.assertLessEqual(min(p99_ms(search, sets) for _ in range(3)), BUDGET_MS)
+
+
+if __name__ == '__main__':
+    unittest.main()
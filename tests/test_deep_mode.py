@@ -0,0 +1,63 @@
+"""
+Спекулятивний глибокий режим: локальний результат повертається на дедлайні,
+навіть коли всі потоки Gemini зайняті покинутими викликами.
+
+Запуск: python -m unittest discover tests
+"""
+
+import time
+import unittest
+
+from app_support import FakeGeminiClient, load_app
+
+TEXT = "Економічна функція підприємства виражає його роль у задоволенні потреб суспільства. "
+
+
+class DeepModeRaceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app()
+
+    def setUp(self):
+        FakeGeminiClient.reset()
+
+    def tearDown(self):
+        # Покинуті виклики Gemini мають завершитися до наступного тесту
+        FakeGeminiClient.delay = 0.0
+        for _ in range(app_slots(self.app)):
+            self.app.gemini_slots.acquire(timeout=10)
+        for _ in range(app_slots(self.app)):
+            self.app.gemini_slots.release()
+
+    def test_gemini_wins_before_deadline(self):
+        payload, mode, winner = self.app._race_deep_payload(TEXT + "перемога")
+        self.assertEqual(mode, 'deep')
+        self.assertEqual(winner['path'], 'gemini')
+        self.assertEqual(payload['ai_full']['study_plan'], 'план')
+
+    def test_local_result_is_not_queued_behind_abandoned_gemini_calls(self):
+        FakeGeminiClient.delay = 3.0
+        deadline = self.app.app.config['DEEP_MODE_DEADLINE']
+        reasons = []
+        for i in range(app_slots(self.app) + 2):
+            started = time.perf_counter()
+            payload, mode, winner = self.app._race_deep_payload(f"{TEXT} варіант {i}")
+            elapsed = time.perf_counter() - started
+            reasons.append(winner['reason'])
+            self.assertEqual(mode, 'normal')
+            self.assertIn('mnemonics', payload)
+            # Локальна генерація коротка: відповідь не чекає на завершення Gemini
+            self.assertLess(elapsed, deadline + 1.0)
+        self.assertEqual(reasons[:app_slots(self.app)], ['timeout'] * app_slots(self.app))
+        # Усі місця зайняті покинутими викликами — Gemini більше не викликається
+        self.assertEqual(reasons[app_slots(self.app):], ['busy', 'busy'])
+        self.assertEqual(FakeGeminiClient.calls, app_slots(self.app))
+
+
+def app_slots(app):
+    return app.app.config['DEEP_MODE_MAX_INFLIGHT']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Відтворюваність генерації мнемонік: те саме зерно і ті самі фрази дають
+той самий результат, акроніми включно.
+
+Кожна генерація йде в окремому процесі з іншим PYTHONHASHSEED, тож кеш
+акронімів і memo технік не можуть сховати розбіжність, а порядок обходу
+множин не впливає на результат. Друга генерація бачить годинник, що йде в
+тисячу разів швидше, — як на перевантаженій машині: обмеження перебору за
+часом дало б інший акронім.
+
+Запуск: python -m unittest discover tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Фрази, для яких найкращий акронім змінюється залежно від того, як далеко
+# зайшов перебір: будь-яке обмеження за часом дало б різні результати
+PHRASES = [
+    "цілі прибуток облік", "забезпечення стратегічне якість", "оборот",
+    "економічна", "конкурентоспроможність", "ризик",
+]
+TOPICS = ["економіка", "управління"]
+
+GENERATE = """
+import json, sys, time
+phrases, topics, seed, clock_speed = json.loads(sys.argv[1])
+if clock_speed != 1:
+    for name in ('perf_counter', 'monotonic', 'time'):
+        clock = getattr(time, name)
+        setattr(time, name, lambda clock=clock, start=clock(): start + (clock() - start) * clock_speed)
+from ai_model import MnemonicGenerator
+result = MnemonicGenerator(seed=seed).generate_mnemonics(phrases, topics)
+print(json.dumps(result, ensure_ascii=False, sort_keys=True))
+"""
+
+
+def generate(seed: int, hash_seed: str, clock_speed: float = 1) -> dict:
+    """Усі техніки для PHRASES, згенеровані в окремому процесі"""
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+    output = subprocess.run(
+        [sys.executable, '-c', GENERATE, json.dumps([PHRASES, TOPICS, seed, clock_speed])],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    # Модулі можуть друкувати повідомлення при старті — результат у останньому рядку
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class DeterminismTest(unittest.TestCase):
+
+    def test_same_seed_gives_same_result(self):
+        first = generate(seed=42, hash_seed='1')
+        second = generate(seed=42, hash_seed='2', clock_speed=1000)
+
+        self.assertTrue(first['acronyms'], 'акронім має бути знайдений')
+        self.assertEqual(first['acronyms'], second['acronyms'])
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Доступ до Gemini: відро токенів (серія запитів, поповнення, час до
+наступного токена), відмова за вичерпаної квоти без мережевого виклику і
+стани запобіжника closed → open → half_open.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_service import CircuitBreaker, GeminiQuotaExceeded, GeminiService, GeminiUnavailable, TokenBucket
+from result_cache import ResultCache
+
+
+class CountingClient:
+    """Клієнт Gemini, що лише рахує виклики"""
+
+    model_name = 'gemini-test'
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def improve_text(self, text, language='uk'):
+        self.calls += 1
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return text.upper()
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_burst_then_reject_then_refill(self):
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        stats = bucket.stats()
+        self.assertEqual((stats['admitted'], stats['rejected']), (2, 1))
+        self.assertGreater(stats['retry_after'], 0)
+        self.assertLessEqual(stats['retry_after'], 1.0)
+
+        # Минуло півтори секунди: один токен, але не більше за capacity
+        bucket.updated -= 1.5
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        bucket.updated -= 3600
+        self.assertEqual(bucket.available(), 2)
+
+
+class GeminiRateLimitTest(unittest.TestCase):
+
+    def test_exhausted_quota_skips_the_client(self):
+        client = CountingClient()
+        created = []
+
+        def factory():
+            created.append(client)
+            return client
+
+        service = GeminiService(factory, ResultCache(), rate_limiter=TokenBucket(60, capacity=1))
+
+        self.assertEqual(service.improve_text('перший'), 'ПЕРШИЙ')
+        with self.assertRaises(GeminiQuotaExceeded):
+            service.improve_text('другий')
+        # Повтор тексту — з кешу, квота не потрібна
+        self.assertEqual(service.improve_text('перший'), 'ПЕРШИЙ')
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(len(created), 1)
+        self.assertEqual(service.stats()['rate_limit']['rejected'], 1)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_state_machine(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=30)
+
+        breaker.record_failure(RuntimeError('перша'))
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.record_failure(RuntimeError('друга'))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.short_circuited, 1)
+        self.assertGreater(breaker.retry_after(), 0)
+
+        # Після паузи — один пробний запит; його помилка знову розмикає запобіжник
+        breaker.opened_at -= 30
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.record_failure(RuntimeError('проба'))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.trips, 2)
+
+        breaker.opened_at -= 30
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.stats()['state'], CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_open_breaker_skips_the_client(self):
+        client = CountingClient()
+        client.error = 'мережа недоступна'
+        service = GeminiService(lambda: client, ResultCache(),
+                                breaker=CircuitBreaker(failure_threshold=2, cooldown_seconds=30))
+
+        for text in ('перший', 'другий'):
+            with self.assertRaises(RuntimeError):
+                service.improve_text(text)
+        with self.assertRaises(GeminiUnavailable):
+            service.improve_text('третій')
+
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(service.stats()['breaker']['short_circuited'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
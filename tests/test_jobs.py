@@ -0,0 +1,129 @@
+"""
+Фонові задачі: стани queued → running → done | error у спільному реєстрі,
+видимі іншому воркеру, потік подій SSE до події done і асинхронний режим
+/api/process_text з опитуванням /api/jobs/<id>.
+
+Запуск: python -m unittest discover tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobs import JobManager, SQLiteJobStore
+
+
+def sse_events(stream):
+    """Пари (подія, дані) з тексту потоку SSE"""
+    events = []
+    for block in stream.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class JobManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix='mnemo-jobs-')
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'jobs.db')
+        self.manager = JobManager(max_workers=2, store=SQLiteJobStore(self.path))
+        self.addCleanup(self.manager.close)
+
+    def test_states_are_shared_through_the_store(self):
+        release = threading.Event()
+        job = self.manager.submit('01JKKKKKKKKKKKKKKKKKKKKKKK', lambda: release.wait(5) and {'готово': True})
+        other_worker = JobManager(store=SQLiteJobStore(self.path))
+        self.addCleanup(other_worker.close)
+
+        self.assertIn(other_worker.state(job.id)['status'], ('queued', 'running'))
+        release.set()
+        self.assertTrue(job.done.wait(5))
+
+        self.assertEqual(self.manager.state(job.id)['result'], {'готово': True})
+        # Іншому воркеру відомий лише стан; результат він бере зі сховища сесій
+        shared = other_worker.state(job.id)
+        self.assertEqual(shared['status'], 'done')
+        self.assertNotIn('result', shared)
+
+    def test_failed_job_reports_error(self):
+        def fail():
+            raise RuntimeError('збій обробки')
+
+        job = self.manager.submit('01JMMMMMMMMMMMMMMMMMMMMMMM', fail)
+        job.done.wait(5)
+
+        state = self.manager.state(job.id)
+        self.assertEqual((state['status'], state['error']), ('error', 'збій обробки'))
+
+    def test_events_end_with_done(self):
+        release = threading.Event()
+        job = self.manager.submit('01JNNNNNNNNNNNNNNNNNNNNNNN', lambda: release.wait(5) and 'результат')
+        threading.Timer(0.1, release.set).start()
+
+        stream = ''.join(self.manager.events(job.id, self.manager.state, max_seconds=5, poll_interval=0.01))
+
+        events = sse_events(stream)
+        self.assertEqual(events[-1][0], 'done')
+        self.assertEqual(events[-1][1]['result'], 'результат')
+        self.assertTrue(all(name == 'status' for name, _ in events[:-1]))
+
+    def test_abandoned_job_becomes_an_error(self):
+        job_id = '01JPPPPPPPPPPPPPPPPPPPPPPP'
+        self.manager.submit(job_id, lambda: None).done.wait(5)
+        with self.manager.store._connection() as conn:
+            conn.execute("UPDATE jobs SET status = 'running', created_at = ? WHERE id = ?",
+                         (time.time() - 3600, job_id))
+
+        other_worker = JobManager(ttl_seconds=60, store=SQLiteJobStore(self.path))
+        self.addCleanup(other_worker.close)
+        self.assertEqual(other_worker.state(job_id)['status'], 'error')
+
+
+class AsyncApiTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from app_support import load_app
+        cls.client = load_app().app.test_client()
+
+    def test_async_request_is_polled_until_done(self):
+        response = self.client.post('/api/process_text', json={
+            'text': "Інноваційний розвиток підприємства у фоновій задачі.", 'mode': 'normal', 'async': True,
+        })
+        self.assertEqual(response.status_code, 202)
+        job = response.get_json()
+        self.assertTrue(job['success'])
+
+        deadline = time.time() + 10
+        state = self.client.get(job['poll_url']).get_json()
+        while state['status'] != 'done' and time.time() < deadline:
+            time.sleep(0.05)
+            state = self.client.get(job['poll_url']).get_json()
+
+        self.assertEqual(state['status'], 'done')
+        self.assertEqual(state['result']['session_id'], job['job_id'])
+        self.assertTrue(self.client.get(f"/api/result/{job['job_id']}").get_json()['success'])
+
+        response = self.client.get(job['events_url'])
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = sse_events(response.get_data(as_text=True))
+        self.assertEqual([name for name, _ in events], ['done'])
+        self.assertEqual(events[-1][1]['result']['session_id'], job['job_id'])
+
+    def test_unknown_job_is_404(self):
+        self.assertEqual(self.client.get('/api/jobs/01JQQQQQQQQQQQQQQQQQQQQQQQ').status_code, 404)
+        self.assertEqual(self.client.get('/api/jobs/01JQQQQQQQQQQQQQQQQQQQQQQQ/events').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Ледача генерація однієї техніки для збереженої сесії: техніка дописується в
+сесію, а помилка генерації повертається як JSON, а не як сторінка 500.
+
+Запуск: python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+from app_support import load_app
+
+TEXT = "Ресурсне забезпечення підприємства включає матеріальні, людські та фінансові ресурси. "
+
+
+class LazyTechniqueTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app()
+        cls.client = cls.app.app.test_client()
+
+    def create_session(self, text):
+        response = self.client.post('/api/process_text', json={
+            'text': text, 'mode': 'normal', 'techniques': ['acronyms'],
+        }).get_json()
+        self.assertTrue(response['success'])
+        return response['session_id']
+
+    def test_generated_technique_is_saved_in_session(self):
+        session_id = self.create_session(TEXT)
+
+        first = self.client.get(f'/api/mnemonics/{session_id}/rhymes').get_json()
+        second = self.client.get(f'/api/mnemonics/{session_id}/rhymes').get_json()
+
+        self.assertTrue(first['success'])
+        self.assertFalse(first['cached'])
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['data'], first['data'])
+
+    def test_generation_error_is_returned_as_json(self):
+        session_id = self.create_session(TEXT + "помилка")
+
+        with mock.patch.object(self.app.MnemonicGenerator, 'generate_mnemonics',
+                               side_effect=RuntimeError('збій генератора')):
+            response = self.client.get(f'/api/mnemonics/{session_id}/stories')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json(), {'success': False, 'error': 'збій генератора'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Словник слів з індексом за префіксами: пошук за префіксом збігається з
+перебором, файл відкривається через mmap і підміняється без перезапуску.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexicon import Lexicon, LexiconFile, build_lexicon
+
+WORDS = ['Мнемоніка', 'мнемонічний', 'мнема', 'пам\'ять', 'память', 'план', 'планування',
+         'підприємство', 'ґанок', 'єдність', 'zebra', 'економіка', 'ефект', 'мнемоніка']
+
+
+class LexiconTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lexicon = Lexicon.from_words(WORDS)
+        self.expected = sorted({word.lower() for word in WORDS}, key=lambda word: word.encode('utf-8'))
+
+    def test_words_are_unique_and_byte_sorted(self):
+        self.assertEqual(len(self.lexicon), len(self.expected))
+        self.assertEqual([self.lexicon.word(i) for i in range(len(self.lexicon))], self.expected)
+        self.assertIn('МНЕМОНІКА ', self.lexicon)
+        self.assertNotIn('мнемо', self.lexicon)
+
+    def test_prefix_ranges_match_brute_force(self):
+        for prefix in ('', 'м', 'мнем', 'мнемоні', 'пла', 'п', 'ґ', 'є', 'z', 'я', 'мнемонікаа'):
+            with self.subTest(prefix=prefix):
+                lo, hi = self.lexicon.prefix_range(prefix)
+                self.assertEqual([self.lexicon.word(i) for i in range(lo, hi)],
+                                 [word for word in self.expected if word.startswith(prefix)])
+
+    def test_narrowing_within_a_known_range(self):
+        outer = self.lexicon.prefix_range('мн')
+        inner = self.lexicon.prefix_range('мнемон', outer)
+        self.assertEqual(inner, self.lexicon.prefix_range('мнемон'))
+        self.assertEqual(self.lexicon.with_prefix('мнемон'), ['мнемоніка', 'мнемонічний'])
+        self.assertEqual(self.lexicon.nearest('мнемонічна'), 'мнемонічний')
+
+    def test_sample_stays_within_prefix(self):
+        sample = self.lexicon.sample_with_prefix('п', 10, random.Random(1))
+        self.assertEqual(sorted(sample), sorted(word for word in self.expected if word.startswith('п')))
+
+
+class LexiconFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-lexicon-')
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'lexicon.bin')
+
+    def test_mmap_file_matches_memory_lexicon(self):
+        self.assertEqual(build_lexicon(WORDS, self.path), len(Lexicon.from_words(WORDS)))
+        lexicon = Lexicon.open(self.path)
+        self.addCleanup(lexicon.close)
+
+        self.assertEqual(lexicon.with_prefix('пла'), ['план', 'планування'])
+        self.assertEqual(lexicon.prefix_range('е'), Lexicon.from_words(WORDS).prefix_range('е'))
+
+    def test_rebuilt_file_is_picked_up(self):
+        build_lexicon(['старе'], self.path)
+        current = LexiconFile(self.path, check_interval=0)
+        self.assertIn('старе', current.current())
+
+        build_lexicon(['нове', 'слово'], self.path)
+        self.assertEqual(len(current.reload()), 2)
+        self.assertIn('нове', current.current())
+
+    def test_rejects_foreign_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            Lexicon.open(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
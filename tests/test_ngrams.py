@@ -0,0 +1,98 @@
+"""
+Лічильники n-грам: точний режим збігається з наївним підрахунком рядків,
+наближений знаходить ті самі найчастіші фрази, а TextProcessor у наближеному
+режимі дає ті самі ключові слова й фрази, що й у точному.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import random
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ngrams import NgramCounter, TopKNgramCounter
+from utils import TextProcessor
+
+VOCABULARY = (
+    "економічна функція підприємства соціальна відповідальність інноваційний розвиток "
+    "ресурсне забезпечення стратегічне планування ринок цілі компанії аналіз витрат облік"
+).split()
+
+
+def sentences(seed: int, count: int):
+    """Речення з кількома частими фразами на тлі випадкових слів"""
+    rng = random.Random(seed)
+    frequent = [["економічна", "функція"], ["стратегічне", "планування", "компанії"]]
+    result = []
+    for _ in range(count):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(3, 10))]
+        if rng.random() < 0.6:
+            position = rng.randint(0, len(words))
+            words[position:position] = rng.choice(frequent)
+        result.append(words)
+    return result
+
+
+def naive_counts(corpus, min_n=2, max_n=4):
+    counts = Counter()
+    for words in corpus:
+        for n in range(min_n, max_n + 1):
+            for i in range(len(words) - n + 1):
+                counts[' '.join(words[i:i + n])] += 1
+    return counts
+
+
+class NgramCounterTest(unittest.TestCase):
+
+    def test_exact_counts_match_naive_strings(self):
+        corpus = sentences(1, 500)
+        counter = NgramCounter()
+        for words in corpus:
+            counter.add_sequence(words)
+
+        counted = Counter({counter.phrase(key): count for key, count in counter.counts.items()})
+        self.assertEqual(counted, naive_counts(corpus))
+
+    def test_merged_parts_equal_one_counter(self):
+        corpus = sentences(2, 400)
+        whole, first, second = NgramCounter(), NgramCounter(), NgramCounter()
+        for i, words in enumerate(corpus):
+            whole.add_sequence(words)
+            (first if i < 200 else second).add_sequence(words)
+        first.merge(second)
+        self.assertEqual(first.top(20), whole.top(20))
+
+    def test_approximate_top_matches_exact(self):
+        corpus = sentences(3, 3000)
+        exact = NgramCounter()
+        # Маленькі буфер і кількість кандидатів — скетч і витіснення справді працюють
+        approximate = TopKNgramCounter(k=50, width=1 << 12, flush_size=256)
+        for words in corpus:
+            exact.add_sequence(words)
+            approximate.add_sequence(words)
+
+        exact_top = [phrase for phrase, _ in exact.top(3)]
+        self.assertEqual([phrase for phrase, _ in approximate.top(3)], exact_top)
+        for phrase, count in approximate.top(3):
+            # Count-min оцінює зверху, але для частих фраз похибка мала
+            self.assertGreaterEqual(count, dict(exact.top(3))[phrase])
+            self.assertLessEqual(count, dict(exact.top(3))[phrase] * 1.05)
+
+
+class ApproximateModeTest(unittest.TestCase):
+
+    def test_processor_modes_agree_on_frequent_terms(self):
+        text = '. '.join(' '.join(words) for words in sentences(4, 2000)) + '.'
+        exact = TextProcessor().process(text)
+        approximate = TextProcessor(ngram_mode='approximate', ngram_top_k=200).process(text)
+
+        self.assertEqual(approximate['key_words'], exact['key_words'])
+        self.assertEqual(approximate['key_phrases'][:3], exact['key_phrases'][:3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Фонетичні мнемоніки: поділ на склади, побудова BK-дерев наперед і
+результат техніки без тексту-заглушки.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_model import MnemonicGenerator, phonetic_index
+from lexicon import Lexicon
+from phonetics import PhoneticIndex, syllables
+
+
+class SyllablesTest(unittest.TestCase):
+
+    def test_splits_between_vowels(self):
+        self.assertEqual(syllables('економічна'), ['е', 'ко', 'но', 'міч', 'на'])
+        self.assertEqual(syllables('стратегічне'), ['стра', 'те', 'гіч', 'не'])
+        self.assertEqual(syllables('кіт'), ['кіт'])
+
+
+class PhoneticIndexTest(unittest.TestCase):
+
+    def test_build_trees_builds_every_partition(self):
+        lexicon = Lexicon.from_words(['панда', 'банда', 'бант', 'парта', 'карта', 'ворота', 'вітер'])
+        index = PhoneticIndex.from_lexicon(lexicon)
+        self.assertEqual(index.stats()['trees_built'], 0)
+        built = index.build_trees()
+        self.assertGreater(built, 0)
+        self.assertEqual(index.stats()['trees_built'], built)
+
+
+class PhoneticTechniqueTest(unittest.TestCase):
+
+    def test_every_phrase_gets_an_item_without_placeholder(self):
+        phrases = ['економічна функція', 'водна рука', 'стратегічне планування']
+        items = MnemonicGenerator(seed=1)._generate_phonetic_mnemonics(phrases)
+
+        self.assertEqual(len(items), len(phrases))
+        for item in items:
+            self.assertNotIn('звучить як \'звучить', item['mnemonic'])
+            if item['sound_alike'] is None:
+                self.assertIn('-'.join(item['syllables']), item['mnemonic'])
+            else:
+                self.assertIn(item['sound_alike'], phonetic_index().sound_alikes(item['word']))
+
+
+if __name__ == '__main__':
+    unittest.main()
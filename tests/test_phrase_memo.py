@@ -0,0 +1,77 @@
+"""
+Спільний кеш результатів технік за фразою: витіснення найдавніше
+використаних записів, статистика влучань, версія генератора в ключі, і
+однаковий результат генератора із зерном з кешу та без нього.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_model import MnemonicGenerator
+from phrase_memo import PhraseMemo
+
+PHRASES = ["стратегічне планування", "ресурсне забезпечення", "аналіз витрат"]
+TOPICS = ["економіка"]
+
+
+class PhraseMemoTest(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        memo = PhraseMemo(max_entries=2)
+        computed = []
+
+        def compute(value):
+            return lambda: computed.append(value) or value
+
+        memo.get_or_compute(('acronym', 'а'), compute('а'))
+        memo.get_or_compute(('acronym', 'б'), compute('б'))
+        memo.get_or_compute(('acronym', 'а'), compute('а'))
+        memo.get_or_compute(('acronym', 'в'), compute('в'))
+        memo.get_or_compute(('acronym', 'б'), compute('б'))
+
+        self.assertEqual(computed, ['а', 'б', 'в', 'б'])
+        stats = memo.stats()
+        self.assertEqual((stats['entries'], stats['evictions']), (2, 2))
+        self.assertEqual((stats['hits'], stats['misses'], stats['hit_rate']), (1, 4, 0.2))
+
+    def test_version_is_part_of_the_key(self):
+        memo = PhraseMemo(version='1.0')
+        memo.get_or_compute(('rhyme', 'фраза'), lambda: 'стара версія')
+
+        memo.version = '2.0'
+        self.assertEqual(memo.get_or_compute(('rhyme', 'фраза'), lambda: 'нова версія'), 'нова версія')
+        self.assertEqual(memo.stats()['hits'], 0)
+
+
+class GeneratorMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        MnemonicGenerator.memo.clear()
+        self.addCleanup(MnemonicGenerator.memo.clear)
+
+    def test_memo_hit_matches_fresh_generation(self):
+        fresh = MnemonicGenerator(seed=5).generate_mnemonics(PHRASES, TOPICS)
+        hits = MnemonicGenerator.memo.hits
+
+        cached = MnemonicGenerator(seed=5).generate_mnemonics(PHRASES, TOPICS)
+        self.assertGreater(MnemonicGenerator.memo.hits, hits)
+        self.assertEqual(cached, fresh)
+
+        MnemonicGenerator.memo.clear()
+        self.assertEqual(MnemonicGenerator(seed=5).generate_mnemonics(PHRASES, TOPICS), fresh)
+
+    def test_changing_a_result_does_not_change_the_memo(self):
+        first = MnemonicGenerator(seed=5).generate_mnemonics(PHRASES, TOPICS, ['loci_method'])
+        first['loci_method'][0]['змінено'] = True
+
+        second = MnemonicGenerator(seed=5).generate_mnemonics(PHRASES, TOPICS, ['loci_method'])
+        self.assertNotIn('змінено', second['loci_method'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
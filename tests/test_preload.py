@@ -0,0 +1,70 @@
+"""
+Підготовка до fork (gunicorn preload_app): імпорт застосунку будує спільні
+дані, але не запускає потоків; пули потоків створюються заново у воркері.
+
+Імпорт перевіряється в окремому процесі: у процесі тестів застосунок уже
+міг обробляти запити.
+
+Запуск: python -m unittest discover tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_APP = """
+import json, sys, threading
+sys.path.insert(0, sys.argv[1])
+from app_support import load_app
+import ai_model
+app = load_app()
+print(json.dumps({
+    'threads': sorted(thread.name for thread in threading.enumerate()),
+    'acronym_search': ai_model._acronym_search is not None,
+}))
+"""
+
+
+class PreloadTest(unittest.TestCase):
+
+    def test_import_builds_shared_data_without_threads(self):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_APP, os.path.join(ROOT, 'tests')],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        state = json.loads(output.strip().splitlines()[-1])
+        self.assertEqual(state['threads'], ['MainThread'])
+        self.assertTrue(state['acronym_search'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'потрібен fork')
+    def test_job_pool_is_recreated_after_fork(self):
+        sys.path.insert(0, ROOT)
+        from jobs import JobManager
+
+        manager = JobManager(max_workers=1)
+        self.addCleanup(manager.close)
+        # Пул батька вже має потік — дочірній процес його не успадковує
+        self.assertEqual(manager.submit('батько', lambda: 1).done.wait(5), True)
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                job = manager.submit('дитина', lambda: 2)
+                ok = job.done.wait(5) and job.result == 2
+                os.write(write_fd, b'1' if ok else b'0')
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        self.assertEqual(result, b'1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Кеш результатів і кеш відповідей Gemini: ключ за вмістом, копії й
+витіснення в пам'яті, спільний і обмежений дисковий рівень, повторний
+запит до API з кешу і влучання в кеш Gemini без створення клієнта.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_service import CircuitBreaker, GeminiService, gemini_cache_key
+from result_cache import DiskCache, LRUCache, ResultCache, content_key
+
+
+class ContentKeyTest(unittest.TestCase):
+
+    def test_key_ignores_whitespace_but_not_mode_or_version(self):
+        key = content_key("Економічна  функція\n підприємства", 'normal', '2.7')
+
+        self.assertEqual(content_key(" Економічна функція підприємства ", 'normal', '2.7'), key)
+        self.assertNotEqual(content_key("Економічна функція підприємства", 'deep', '2.7'), key)
+        self.assertNotEqual(content_key("Економічна функція підприємства", 'normal', '2.8'), key)
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-cache-')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_memory_hit_is_a_copy(self):
+        cache = ResultCache(max_bytes=1024 * 1024)
+        cache.put('ключ', {'payload': {'mnemonics': {'acronyms': ['А']}}})
+
+        first, tier = cache.get('ключ')
+        self.assertEqual(tier, 'memory')
+        first['payload']['mnemonics']['acronyms'].append('змінено')
+
+        second, _ = cache.get('ключ')
+        self.assertEqual(second['payload']['mnemonics']['acronyms'], ['А'])
+
+    def test_memory_evicts_least_recently_used_by_bytes(self):
+        lru = LRUCache(max_bytes=30)
+        lru.put('а', b'x' * 10, 10)
+        lru.put('б', b'x' * 10, 10)
+        lru.put('в', b'x' * 10, 10)
+        lru.get('а')
+        lru.put('г', b'x' * 10, 10)
+
+        self.assertIsNone(lru.get('б'))
+        self.assertIsNotNone(lru.get('а'))
+        self.assertEqual(lru.current_bytes, 30)
+        # Значення, більше за весь кеш, не витісняє решту
+        lru.put('великий', b'x' * 40, 40)
+        self.assertEqual(len(lru), 3)
+
+    def test_disk_tier_is_shared_between_workers(self):
+        first = ResultCache(disk_dir=self.directory)
+        second = ResultCache(disk_dir=self.directory)
+        first.put('ключ', {'payload': 'значення'})
+
+        value, tier = second.get('ключ')
+        self.assertEqual((value, tier), ({'payload': 'значення'}, 'disk'))
+        self.assertEqual(second.get('ключ')[1], 'memory')
+        self.assertEqual(second.stats()['hits'], 2)
+
+    def test_disk_sweep_keeps_recently_used_files_under_the_cap(self):
+        disk = DiskCache(self.directory, max_bytes=10 ** 9)
+        for i in range(10):
+            disk.put(f"{i:02d}ключ", os.urandom(1000))
+            # Різний час використання: перший файл найдавніший
+            used = time.time() - 1000 + i
+            os.utime(disk._path(f"{i:02d}ключ"), (used, used))
+        file_size = os.path.getsize(disk._path('00ключ'))
+        disk.get('00ключ')
+
+        disk.max_bytes = file_size * 5
+        removed = disk.sweep()
+
+        self.assertEqual(removed, 6)
+        kept = [i for i in range(10) if disk.get(f"{i:02d}ключ") is not None]
+        self.assertEqual(kept, [0, 7, 8, 9])
+
+    def test_writes_trigger_sweep_of_expired_files(self):
+        cache = ResultCache(disk_dir=self.directory, disk_max_bytes=100_000, disk_max_age=60)
+        cache.put('старий', {'value': 'x'})
+        old = time.time() - 120
+        os.utime(cache.disk._path('старий'), (old, old))
+
+        for i in range(20):
+            cache.put(f"новий{i}", {'value': os.urandom(1000).hex()})
+
+        self.assertIsNone(cache.disk.get('старий'))
+        self.assertEqual(cache.stats()['disk_swept'], 1)
+
+
+class ApiResultCacheTest(unittest.TestCase):
+
+    def test_repeated_request_is_served_from_cache(self):
+        from app_support import load_app
+        client = load_app().app.test_client()
+        body = {'text': "Кешований текст про стратегічне планування підприємства.", 'mode': 'normal'}
+
+        first = client.post('/api/process_text', json=body).get_json()
+        body['text'] = "  Кешований текст про стратегічне   планування підприємства. "
+        second = client.post('/api/process_text', json=body).get_json()
+
+        self.assertFalse(first['meta']['cache']['hit'])
+        self.assertTrue(second['meta']['cache']['hit'])
+        self.assertEqual(second['meta']['cache']['tier'], 'memory')
+        self.assertNotEqual(second['session_id'], first['session_id'])
+        self.assertEqual(second['data']['mnemonics'], first['data']['mnemonics'])
+
+
+class GeminiCacheHitTest(unittest.TestCase):
+
+    def test_cache_hit_needs_no_client(self):
+        def broken_factory():
+            raise RuntimeError('немає GEMINI_API_KEY')
+
+        breaker = CircuitBreaker(failure_threshold=1)
+        service = GeminiService(broken_factory, ResultCache(), breaker=breaker, model='gemini-test')
+        service.cache.put(
+            gemini_cache_key('generate_full_mnemonics', 'gemini-test', '', 'текст'),
+            {'stored_at': time.time(), 'value': {'study_plan': 'з кешу'}},
+        )
+
+        self.assertEqual(service.generate_full_mnemonics('текст'), {'study_plan': 'з кешу'})
+        self.assertIsNone(service._client)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
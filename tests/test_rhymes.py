@@ -0,0 +1,40 @@
+"""
+Пошук рим: кандидати ранжуються за довжиною спільного закінчення ще до
+обрізання, тож найкращі рими не губляться серед багатьох слів із тим самим
+коротким закінченням.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rhymes import RhymeIndex
+
+
+def filler_words(ending, count):
+    """Слова з тим самим коротким закінченням, що в порядку словника оточують рими"""
+    consonants = 'бвгджзклмнпрстфхцчш'
+    return [f"{a}{b}о{ending}" for a in consonants for b in consonants][:count]
+
+
+class RhymeRankingTest(unittest.TestCase):
+
+    def test_longest_shared_ending_comes_first(self):
+        words = filler_words('ія', 300) + ['функція', 'пункція', 'санкція', 'акція', 'станція']
+        index = RhymeIndex.from_words(words)
+
+        # Спільні закінчення: «ункція», «нкція», «кція» — а ще 300 слів лише на «ія»
+        self.assertEqual(index.rhymes('функція', limit=3), ['пункція', 'санкція', 'акція'])
+
+    def test_falls_back_to_last_vowel_ending(self):
+        index = RhymeIndex.from_words(filler_words('ан', 5) + ['план'])
+        self.assertEqual(len(index.rhymes('план', limit=3)), 3)
+        self.assertEqual(index.rhymes('план', limit=3), index.rhymes('план', limit=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
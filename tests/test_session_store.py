@@ -0,0 +1,204 @@
+"""
+Сховища сесій і очищення: SQLite-сховище (збереження, розмір за тригерами,
+вибірка за часом, міграція файлів), індекс JSON-каталогу за часом зміни
+файлів, старі сесії (8-символьні id) у SQLite-сховищі, єдиний воркер, що
+очищує, і відкладений запис (знімок у JSON, dead-letter після невдалих повторів).
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_store
+from session_store import (JsonFileSessionStore, SessionEvictor, SessionStore, SQLiteSessionStore,
+                           WriteBehindSessionStore, migrate_json_sessions, replay_dead_letter)
+
+
+def write_aged(store, session_id, age):
+    """Сесія з часом зміни файлу age секунд тому"""
+    store.save(session_id, {'id': session_id})
+    created = time.time() - age
+    os.utime(store._path(session_id), (created, created))
+
+
+class SQLiteSessionStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-sessions-')
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = SQLiteSessionStore(os.path.join(self.directory, 'sessions.db'))
+        self.addCleanup(self.store.close)
+
+    def blob_sizes(self):
+        return self.store._connection().execute('SELECT COALESCE(SUM(size), 0) FROM sessions').fetchone()[0]
+
+    def test_roundtrip_and_invalid_ids(self):
+        data = {'timestamp': '2024-05-01T10:00:00', 'text': 'Економічна функція', 'mnemonics': {'acronyms': ['ЕФ']}}
+        self.store.save('01JCCCCCCCCCCCCCCCCCCCCCCC', data)
+
+        self.assertEqual(self.store.load('01JCCCCCCCCCCCCCCCCCCCCCCC'), data)
+        self.assertIsNone(self.store.load('../sessions'))
+        with self.assertRaises(ValueError):
+            self.store.save('../sessions', data)
+
+    def test_total_size_follows_updates_and_deletes(self):
+        self.store.save('01JDDDDDDDDDDDDDDDDDDDDDDD', {'text': 'коротко'})
+        self.store.save('01JEEEEEEEEEEEEEEEEEEEEEEE', {'text': 'x' * 1000})
+        self.store.save('01JDDDDDDDDDDDDDDDDDDDDDDD', {'text': os.urandom(500).hex()})
+        self.assertEqual(self.store.total_size(), self.blob_sizes())
+
+        self.assertEqual(self.store.delete_many(['01JEEEEEEEEEEEEEEEEEEEEEEE', '01JFFFFFFFFFFFFFFFFFFFFFFF']), 1)
+        self.assertEqual(self.store.total_size(), self.blob_sizes())
+        self.assertGreater(self.store.total_size(), 0)
+
+    def test_lists_sessions_by_time_range(self):
+        for session_id, day in (('01JGGGGGGGGGGGGGGGGGGGGGGG', 3), ('01JHHHHHHHHHHHHHHHHHHHHHHH', 1),
+                                ('01JJJJJJJJJJJJJJJJJJJJJJJJ', 2)):
+            self.store.save(session_id, {'timestamp': f'2024-05-0{day}T10:00:00'})
+
+        since = datetime.fromisoformat('2024-05-02T00:00:00').timestamp()
+        listed = self.store.list_sessions(since=since)
+        self.assertEqual([session_id for session_id, _ in listed],
+                         ['01JJJJJJJJJJJJJJJJJJJJJJJJ', '01JGGGGGGGGGGGGGGGGGGGGGGG'])
+        self.assertEqual(self.store.list_sessions(limit=1)[0][0], '01JHHHHHHHHHHHHHHHHHHHHHHH')
+
+    def test_migrates_json_files(self):
+        legacy_dir = os.path.join(self.directory, 'legacy')
+        legacy = JsonFileSessionStore(legacy_dir)
+        legacy.save('a1b2c3d4', {'timestamp': '2024-05-01T10:00:00', 'text': 'перша'})
+        legacy.save('b2c3d4e5', {'text': 'без часу'})
+
+        self.assertEqual(migrate_json_sessions(legacy_dir, self.store, batch_size=1, remove=True), 2)
+
+        self.assertEqual(self.store.load('a1b2c3d4')['text'], 'перша')
+        self.assertIn('timestamp', self.store.load('b2c3d4e5'))
+        self.assertEqual(list(legacy.iter_files()), [])
+
+
+class JsonSessionIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-sessions-')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_lists_by_mtime_without_reading_files(self):
+        store = JsonFileSessionStore(self.directory)
+        for session_id, age in (('b2c3d4e5', 30), ('a1b2c3d4', 300), ('c3d4e5f6', 3)):
+            write_aged(store, session_id, age)
+
+        with mock.patch.object(session_store.json, 'load', side_effect=AssertionError('файл прочитано')):
+            listed = store.list_sessions(until=time.time() - 10)
+            self.assertEqual([session_id for session_id, _ in listed], ['a1b2c3d4', 'b2c3d4e5'])
+            self.assertEqual(store.list_sessions(limit=1)[0][0], 'a1b2c3d4')
+
+    def test_index_sees_files_of_other_processes(self):
+        store = JsonFileSessionStore(self.directory)
+        write_aged(store, 'a1b2c3d4', 100)
+        self.assertEqual(len(store.list_sessions()), 1)
+
+        # Інший воркер додає сесію у той самий каталог
+        write_aged(JsonFileSessionStore(self.directory), 'b2c3d4e5', 200)
+        self.assertEqual([session_id for session_id, _ in store.list_sessions()], ['b2c3d4e5', 'a1b2c3d4'])
+
+        store.delete_many(['b2c3d4e5'])
+        self.assertEqual([session_id for session_id, _ in store.list_sessions()], ['a1b2c3d4'])
+        self.assertEqual(store.total_size(), os.path.getsize(store._path('a1b2c3d4')))
+
+
+class LegacySessionEvictionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-sessions-')
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = SQLiteSessionStore(os.path.join(self.directory, 'sessions.db'), legacy_dir=self.directory)
+        self.addCleanup(self.store.close)
+
+    def test_expired_legacy_sessions_are_evicted(self):
+        write_aged(self.store.legacy, 'a1b2c3d4', 3600)
+        write_aged(self.store.legacy, 'b2c3d4e5', 10)
+        self.store.save('01JAAAAAAAAAAAAAAAAAAAAAAA', {'timestamp': '2000-01-01T00:00:00'})
+
+        evicted = SessionEvictor(self.store, ttl_seconds=600).run_once()
+
+        self.assertEqual(evicted, 2)
+        self.assertIsNone(self.store.load('a1b2c3d4'))
+        self.assertIsNone(self.store.load('01JAAAAAAAAAAAAAAAAAAAAAAA'))
+        self.assertIsNotNone(self.store.load('b2c3d4e5'))
+
+
+@unittest.skipIf(session_store.fcntl is None, 'файлові блокування недоступні')
+class DesignatedEvictorTest(unittest.TestCase):
+
+    def test_only_lock_holder_evicts(self):
+        directory = tempfile.mkdtemp(prefix='mnemo-sessions-')
+        self.addCleanup(shutil.rmtree, directory)
+        lock_path = os.path.join(directory, 'evictor.lock')
+        store = JsonFileSessionStore(directory)
+        first = SessionEvictor(store, ttl_seconds=60, lock_path=lock_path)
+        second = SessionEvictor(store, ttl_seconds=60, lock_path=lock_path)
+
+        self.assertTrue(first.is_designated())
+        self.assertFalse(second.is_designated())
+        # Воркер-власник завершився — блокування переходить до іншого
+        first.stop()
+        self.assertTrue(second.is_designated())
+        second.stop()
+
+
+class FailingStore(SessionStore):
+    """Сховище, запис у яке завжди падає"""
+
+    def save_many(self, items):
+        raise OSError('диск недоступний')
+
+    def load(self, session_id):
+        return None
+
+
+class WriteBehindTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='mnemo-sessions-')
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_queued_session_is_a_snapshot(self):
+        backend = SQLiteSessionStore(os.path.join(self.directory, 'sessions.db'))
+        store = WriteBehindSessionStore(backend)
+        self.addCleanup(store.close)
+        data = {'timestamp': '2024-05-01T10:00:00', 'mnemonics': {'acronyms': ['А']}}
+
+        store.save('01JBBBBBBBBBBBBBBBBBBBBBBB', data)
+        data['mnemonics']['acronyms'].append('змінено після save')
+        self.assertEqual(store.load('01JBBBBBBBBBBBBBBBBBBBBBBB')['mnemonics']['acronyms'], ['А'])
+
+        store.flush()
+        self.assertEqual(backend.load('01JBBBBBBBBBBBBBBBBBBBBBBB')['mnemonics']['acronyms'], ['А'])
+        self.assertEqual(backend.list_sessions()[0][1], datetime.fromisoformat('2024-05-01T10:00:00').timestamp())
+
+    def test_failed_batch_goes_to_dead_letter_and_replays(self):
+        dead_letter = os.path.join(self.directory, 'sessions.deadletter.jsonl')
+        store = WriteBehindSessionStore(FailingStore(), max_retries=1, retry_delay=0,
+                                        dead_letter_path=dead_letter)
+        store.save('a1b2c3d4', {'timestamp': '2024-05-01T10:00:00', 'text': 'лапки " і \\ у тексті'})
+        store.flush()
+
+        self.assertEqual(store.dead_lettered, 1)
+        self.assertEqual(store.pending_count(), 0)
+
+        target = SQLiteSessionStore(os.path.join(self.directory, 'sessions.db'))
+        self.addCleanup(target.close)
+        self.assertEqual(replay_dead_letter(dead_letter, target), 1)
+        self.assertEqual(target.load('a1b2c3d4')['text'], 'лапки " і \\ у тексті')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Об'єднання однакових обчислень: один виклик на ключ у процесі, блокування
+між воркерами лише зі спільним кешем і короткий кеш fallback-результату
+глибокого режиму, який бачать воркери, що чекали на блокуванні.
+
+Запуск: python -m unittest discover tests
+"""
+
+import threading
+import time
+import unittest
+
+from app_support import FakeGeminiClient, load_app
+from singleflight import SingleFlight
+
+TEXT = "Соціальна відповідальність вимагає етичного ставлення до працівників і довкілля. "
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_computation(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'результат'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('ключ', compute)))
+                   for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [('результат', False)] + [('результат', True)] * 3)
+
+
+class DeepFallbackCacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app()
+
+    def setUp(self):
+        FakeGeminiClient.reset()
+        FakeGeminiClient.error = 'збій Gemini'
+
+    def tearDown(self):
+        FakeGeminiClient.reset()
+
+    def test_cross_process_locks_need_shared_cache(self):
+        self.assertIsNone(self.app.app.config['RESULT_CACHE_DIR'])
+        self.assertIsNone(self.app.single_flight.lock_dir)
+
+    def test_follower_reuses_fallback_until_it_expires(self):
+        key = self.app.content_key(TEXT, 'deep', self.app.GENERATOR_VERSION)
+        entry, tier, deep_path = self.app._compute_and_store(key, TEXT, 'deep')
+        self.assertEqual(entry['mode'], 'normal')
+        self.assertEqual(deep_path['path'], 'local')
+        calls = FakeGeminiClient.calls
+
+        # Воркер, що чекав на блокуванні, бере fallback з кешу, а не рахує знову
+        follower, follower_tier, _ = self.app._compute_and_store(key, TEXT, 'deep')
+        self.assertEqual(follower_tier, 'memory')
+        self.assertEqual(follower['payload'], entry['payload'])
+        self.assertEqual(FakeGeminiClient.calls, calls)
+
+        # Після TTL fallback прострочений — наступний запит знову пробує Gemini
+        cached, _ = self.app.result_cache.get(key, record=False)
+        cached['expires_at'] = time.time() - 1
+        self.app.result_cache.put(key, cached)
+        self.assertEqual(self.app._cache_get(key, record=False), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
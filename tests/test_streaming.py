@@ -0,0 +1,61 @@
+"""
+Потокова обробка тексту (NDJSON): частини результату приходять окремими
+рядками в порядку генерації, зібраний результат збігається зі звичайною
+обробкою, а повторний запит віддає ті самі рядки з кешу.
+
+Запуск: python -m unittest discover tests
+"""
+
+import json
+import unittest
+
+from app_support import load_app
+
+TEXT = ("Стратегічне планування підприємства визначає цілі компанії. "
+        "Аналіз витрат допомагає оцінити ресурсне забезпечення.")
+
+
+class NdjsonStreamTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = load_app()
+        cls.client = cls.app.app.test_client()
+
+    def stream(self, body):
+        response = self.client.post('/api/process_text_stream', json=body)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    def test_parts_arrive_in_order_and_match_full_result(self):
+        body = {'text': TEXT, 'techniques': ['acronyms', 'rhymes'], 'seed': 11}
+        records = self.stream(body)
+
+        self.assertEqual([record['type'] for record in records],
+                         ['processed_data', 'mnemonics', 'mnemonics', 'summary', 'ai_memory', 'done'])
+        self.assertEqual([record.get('technique') for record in records[1:3]], ['acronyms', 'rhymes'])
+
+        expected = self.app._local_payload(TEXT, ['acronyms', 'rhymes'], 11)
+        self.assertEqual(records[0]['data'], expected['processed_data'])
+        self.assertEqual({record['technique']: record['data'] for record in records[1:3]}, expected['mnemonics'])
+        self.assertEqual(records[3]['data'], expected['summary'])
+        self.assertEqual(records[4]['data'], expected['ai_memory'])
+
+        done = records[-1]
+        self.assertFalse(done['meta']['cache']['hit'])
+        session = self.client.get(f"/api/result/{done['session_id']}").get_json()['data']
+        self.assertEqual(session['mnemonics'], expected['mnemonics'])
+
+        # Повтор — ті самі рядки з кешу і нова сесія
+        repeated = self.stream(body)
+        self.assertEqual(repeated[:-1], records[:-1])
+        self.assertTrue(repeated[-1]['meta']['cache']['hit'])
+        self.assertNotEqual(repeated[-1]['session_id'], done['session_id'])
+
+    def test_short_text_is_rejected_without_stream(self):
+        response = self.client.post('/api/process_text_stream', json={'text': 'коротко'})
+        self.assertEqual(response.get_json()['success'], False)
+
+
+if __name__ == '__main__':
+    unittest.main()
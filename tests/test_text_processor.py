@@ -0,0 +1,66 @@
+"""
+Обробка текстів: паралельний map-reduce по блоках речень дає той самий
+результат, що й послідовний process(), а індекс речень знаходить слова і
+фрази лише в межах одного речення.
+
+Запуск: python -m unittest discover tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import TextProcessor
+
+TEXT = (
+    "Економічна функція підприємства полягає у створенні доданої вартості. "
+    "Соціальна функція підприємства забезпечує зайнятість населення! "
+    "Інноваційний розвиток компанії потребує ресурсного забезпечення. "
+    "Чи можливе стратегічне планування без аналізу витрат? "
+    "Ресурсне забезпечення підприємства включає матеріальні та фінансові ресурси. "
+) * 40
+
+
+class ParallelProcessingTest(unittest.TestCase):
+
+    def test_parallel_result_matches_sequential(self):
+        sequential = TextProcessor().process(TEXT)
+
+        processor = TextProcessor(parallel_workers=2, parallel_threshold=1000)
+        self.addCleanup(processor.close)
+        # Маленькі блоки — текст ділиться між кількома процесами
+        parallel = processor.process_parallel(TEXT, block_size=500)
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(processor.process(TEXT), sequential)
+
+
+class SentenceIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TextProcessor().index_text(
+            "Економічна функція підприємства важлива. Соціальна функція держави! Функція економічна теж."
+        )
+
+    def test_token_lookup(self):
+        self.assertEqual(self.index.positions('функція'), [(0, 1), (1, 1), (2, 0)])
+        self.assertEqual(self.index.sentences_with('Функція'), [0, 1, 2])
+        self.assertEqual(self.index.first('держави'), (1, 2))
+        self.assertIsNone(self.index.first('ринок'))
+        self.assertIn('соціальна', self.index)
+
+    def test_phrase_does_not_cross_sentences(self):
+        self.assertEqual(self.index.find_phrase('Соціальна функція'), [(1, 0)])
+        self.assertEqual(self.index.find_phrase('функція економічна'), [(2, 0)])
+        # «важлива» і «соціальна» стоять поруч лише через межу речень
+        self.assertEqual(self.index.find_phrase('важлива соціальна'), [])
+
+    def test_document_sentence_tokens(self):
+        doc = TextProcessor().tokenize("Перше речення тут. Друге речення!")
+        self.assertEqual(doc.sentence_tokens(1), ['друге', 'речення'])
+
+
+if __name__ == '__main__':
+    unittest.main()
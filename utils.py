@@ -2,14 +2,154 @@
 Утиліти для обробки тексту та підготовки даних
 """
 
+import multiprocessing
 import re
 import string
+import threading
+from bisect import bisect_right
 from collections import Counter
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from ngrams import NgramCounter, TopKNgramCounter
+
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r'\b\w+\b')
+_SENTENCE_TERMINATORS = '.!?'
+_BLOCK_BOUNDARY_RE = re.compile(r'[.!?]+')
+# Розмір блоку наближеного режиму: токени тримаються в пам'яті лише для одного блоку
+_APPROXIMATE_BLOCK_CHARS = 100_000
+
+
+class SentenceIndex:
+    """
+    Інвертований індекс токен → (номер речення, позиція в реченні).
+    
+    Будується під час токенізації і дає прямий пошук речень зі словом чи
+    фразою — для тем, тестів і підсвічування фрази в тексті.
+    """
+
+    def __init__(self, sentences: List[str], lower_tokens: List[str],
+                 sentence_starts: List[int], postings: Dict[str, List[int]]):
+        self.sentences = sentences
+        self.lower_tokens = lower_tokens
+        self.sentence_starts = sentence_starts
+        # Глобальні позиції токена в lower_tokens, лише для збережених речень
+        self.postings = postings
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.postings
+
+    def locate(self, global_position: int) -> Tuple[int, int]:
+        sentence = bisect_right(self.sentence_starts, global_position) - 1
+        return sentence, global_position - self.sentence_starts[sentence]
+
+    def positions(self, token: str) -> List[Tuple[int, int]]:
+        """Усі входження токена як пари (речення, позиція)"""
+        return [self.locate(p) for p in self.postings.get(token.lower(), ())]
+
+    def first(self, token: str) -> Optional[Tuple[int, int]]:
+        """Перше входження токена або None"""
+        found = self.postings.get(token.lower())
+        return self.locate(found[0]) if found else None
+
+    def sentences_with(self, token: str) -> List[int]:
+        """Номери речень, що містять токен, без повторів і за порядком"""
+        return list(dict.fromkeys(sentence for sentence, _ in self.positions(token)))
+
+    def find_phrase(self, phrase: str) -> List[Tuple[int, int]]:
+        """Входження фрази (послідовності токенів) у межах одного речення"""
+        words = _WORD_RE.findall(phrase.lower())
+        if not words:
+            return []
+        # Починаємо з найрідшого слова фрази, щоб перевіряти менше кандидатів
+        anchor = min(range(len(words)), key=lambda i: len(self.postings.get(words[i], ())))
+        matches = []
+        for position in self.postings.get(words[anchor], ()):
+            start = position - anchor
+            sentence, offset = self.locate(position)
+            if offset < anchor:
+                continue
+            end = start + len(words)
+            if sentence + 1 < len(self.sentence_starts) and end > self.sentence_starts[sentence + 1]:
+                continue
+            if self.lower_tokens[start:end] == words:
+                matches.append((sentence, offset - anchor))
+        return matches
+
+
+@dataclass
+class TokenizedDocument:
+    """Текст, розбитий на речення і токени один раз для всіх етапів аналізу"""
+    cleaned_text: str
+    sentences: List[str]
+    tokens: List[str]
+    lower_tokens: List[str]
+    # Межі [start, end) токенів кожного речення у списку lower_tokens
+    sentence_spans: List[Tuple[int, int]]
+    index: SentenceIndex
+
+    def sentence_tokens(self, index: int) -> List[str]:
+        """Токени речення у нижньому регістрі"""
+        start, end = self.sentence_spans[index]
+        return self.lower_tokens[start:end]
+
+
+class TextStats:
+    """Накопичувальна статистика тексту, яку можна доповнювати частинами"""
+
+    def __init__(self, phrase_counter: Optional[NgramCounter] = None, track_topics: bool = False):
+        self.word_freq: Counter = Counter()
+        self.phrase_counter = phrase_counter if phrase_counter is not None else NgramCounter()
+        self.words_count = 0           # слова без стоп-слів
+        self.sentences_count = 0
+        self.tokens_count = 0          # усі токени (для читабельності)
+        self.complex_words_count = 0
+        self.lower_tokens_count = 0
+        self.lower_chars_count = 0
+        # Для потокового режиму: вікно теми для першої появи кожного слова
+        self.track_topics = track_topics
+        self.topic_windows: Dict[str, str] = {}
+
+    def merge(self, other: 'TextStats') -> None:
+        """Додавання статистики наступного фрагмента тексту"""
+        self.word_freq += other.word_freq
+        self.phrase_counter.merge(other.phrase_counter)
+        self.words_count += other.words_count
+        self.sentences_count += other.sentences_count
+        self.tokens_count += other.tokens_count
+        self.complex_words_count += other.complex_words_count
+        self.lower_tokens_count += other.lower_tokens_count
+        self.lower_chars_count += other.lower_chars_count
+        for word, window in other.topic_windows.items():
+            self.topic_windows.setdefault(word, window)
+
 
 class TextProcessor:
-    def __init__(self):
-        """Ініціалізація обробника тексту"""
+    def __init__(self, ngram_mode: str = 'exact', ngram_top_k: int = 1000,
+                 parallel_threshold: Optional[int] = 1_000_000,
+                 parallel_workers: Optional[int] = None):
+        """
+        Ініціалізація обробника тексту.
+        
+        ngram_mode='approximate' рахує фрази count-min скетчем з k кандидатами —
+        для дуже великих текстів, де точний словник n-грам не вміщується в пам'ять;
+        текст тоді аналізується блоками по межах речень, без токенів усього тексту.
+        Паралельний режим вмикається явно: тексти від parallel_threshold символів
+        обробляються у parallel_workers процесах (None або 1 — послідовно). Пул
+        один на обробник і створюється при першому великому тексті.
+        """
+        if ngram_mode not in ('exact', 'approximate'):
+            raise ValueError(f"Невідомий режим n-грам: {ngram_mode}")
+        self.ngram_mode = ngram_mode
+        self.ngram_top_k = ngram_top_k
+        self.parallel_threshold = parallel_threshold
+        self.parallel_workers = parallel_workers or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
         # Стоп-слова для української мови
         self.ukrainian_stopwords = set([
             'і', 'в', 'у', 'з', 'на', 'не', 'що', 'та', 'до', 'за', 'для',
@@ -28,71 +168,280 @@ class TextProcessor:
             'спол': 1.0, # сполучник
         }
     
+    def __getstate__(self):
+        # Пул процесів не серіалізується і не потрібен у дочірніх процесах
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        del state['_executor_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        """Пул процесів, спільний для всіх потоків; створюється один раз"""
+        with self._executor_lock:
+            if self._executor is None:
+                # fork з багатопотокового процесу (воркер gunicorn) може успадкувати
+                # захоплені блокування, тому де можна — процеси від forkserver
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver') if 'forkserver' in methods else None
+                self._executor = ProcessPoolExecutor(max_workers=self.parallel_workers, mp_context=context)
+            return self._executor
+    
+    def close(self) -> None:
+        """Зупинка пулу процесів паралельного режиму"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
     def process(self, text: str) -> Dict[str, Any]:
         """Основний метод обробки тексту"""
+        if (self.parallel_threshold is not None and self.parallel_workers > 1
+                and len(text) >= self.parallel_threshold):
+            return self.process_parallel(text)
+        
+        if self.ngram_mode == 'approximate':
+            return self._process_blocks(self._split_blocks(text, _APPROXIMATE_BLOCK_CHARS))
+        
         # Очищаємо текст
         cleaned_text = self._clean_text(text)
         
-        # Токенізація без NLTK
-        sentences = self._split_sentences(cleaned_text)
-        words = self._tokenize_words(cleaned_text.lower())
+        # Токенізація без NLTK: один прохід, результат спільний для всіх етапів
+        doc = self.tokenize(cleaned_text)
         
+        # Лічильники слів, фраз і складності
+        stats = self._new_stats()
+        self._update_stats(stats, doc)
+        
+        key_words = self._extract_keywords(stats.word_freq, stats.words_count)
+        
+        # Визначаємо основні теми
+        main_topics = self._identify_topics(doc, key_words)
+        
+        return self._build_result(stats, cleaned_text, key_words, main_topics)
+    
+    def process_parallel(self, text: str, block_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Map-reduce обробка великого тексту в пулі процесів.
+        
+        Текст ділиться на блоки по межах речень; кожен процес очищає і токенізує
+        свій блок та рахує слова і n-грами, а ранжування виконується на злитих
+        лічильниках. Результат збігається з послідовним process().
+        """
+        if block_size is None:
+            block_size = max(200_000, len(text) // (self.parallel_workers * 4) + 1)
+        blocks = list(self._split_blocks(text, block_size))
+        
+        stats = self._new_stats(track_topics=True)
+        cleaned_blocks: List[str] = []
+        for block_stats, cleaned_block in self._pool().map(self._analyze_block, blocks):
+            stats.merge(block_stats)
+            cleaned_blocks.append(cleaned_block)
+        
+        key_words = self._extract_keywords(stats.word_freq, stats.words_count)
+        main_topics = self._topics_from_windows(stats.topic_windows, key_words)
+        
+        return self._build_result(stats, ''.join(cleaned_blocks).strip(), key_words, main_topics)
+    
+    def _process_blocks(self, blocks: Iterable[str]) -> Dict[str, Any]:
+        """Послідовна обробка блоків з межами речень: у пам'яті токени лише одного блоку"""
+        stats = self._new_stats(track_topics=True)
+        cleaned_blocks: List[str] = []
+        for block in blocks:
+            cleaned_block = self._clean_fragment(block)
+            cleaned_blocks.append(cleaned_block)
+            self._update_stats(stats, self.tokenize(cleaned_block))
+        
+        key_words = self._extract_keywords(stats.word_freq, stats.words_count)
+        main_topics = self._topics_from_windows(stats.topic_windows, key_words)
+        
+        return self._build_result(stats, ''.join(cleaned_blocks).strip(), key_words, main_topics)
+    
+    def _split_blocks(self, text: str, block_size: int) -> Iterator[str]:
+        """Розбиття тексту на блоки приблизно block_size символів по межах речень"""
+        start = 0
+        while start < len(text):
+            match = _BLOCK_BOUNDARY_RE.search(text, start + block_size)
+            if match is None:
+                yield text[start:]
+                return
+            yield text[start:match.end()]
+            start = match.end()
+    
+    def _analyze_block(self, block: str) -> Tuple[TextStats, str]:
+        """Етап map: статистика одного блоку (виконується в дочірньому процесі)"""
+        cleaned_block = self._clean_fragment(block)
+        stats = self._new_stats(track_topics=True)
+        self._update_stats(stats, self.tokenize(cleaned_block))
+        return stats, cleaned_block
+    
+    def process_stream(self, chunks: Iterable[str], max_pending_chars: int = 1_000_000) -> Dict[str, Any]:
+        """
+        Обробка тексту частинами (сторінки PDF, блоки файлу).
+        
+        Текст накопичується лише до кінця останнього повного речення, тому
+        пам'ять обмежена розміром частини та словником. Результат збігається
+        з process() для того самого тексту.
+        Речення довші за max_pending_chars примусово розрізаються по пробілу.
+        """
+        stats = self._new_stats(track_topics=True)
+        preview = ''
+        
+        for block in self._sentence_blocks(chunks, max_pending_chars):
+            cleaned_block = self._clean_text(block)
+            if not cleaned_block:
+                continue
+            if len(preview) < 500:
+                preview = (preview + ' ' + cleaned_block).strip()[:500]
+            self._update_stats(stats, self.tokenize(cleaned_block))
+        
+        key_words = self._extract_keywords(stats.word_freq, stats.words_count)
+        
+        main_topics = self._topics_from_windows(stats.topic_windows, key_words)
+        
+        return self._build_result(stats, preview, key_words, main_topics)
+    
+    def _sentence_blocks(self, chunks: Iterable[str], max_pending_chars: int) -> Iterator[str]:
+        """Перегрупування частин у блоки, що закінчуються на межі речення"""
+        pending = ''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            text = pending + chunk
+            
+            # Кінцева серія розділових знаків може продовжитися в наступній частині
+            end = len(text)
+            while end > 0 and text[end - 1] in _SENTENCE_TERMINATORS:
+                end -= 1
+            cut = max(text.rfind(t, 0, end) for t in _SENTENCE_TERMINATORS) + 1
+            
+            if cut == 0 and len(text) > max_pending_chars:
+                cut = text.rfind(' ') + 1
+            
+            if cut > 0:
+                yield text[:cut]
+                pending = text[cut:]
+            else:
+                pending = text
+        
+        if pending:
+            yield pending
+    
+    def _new_stats(self, track_topics: bool = False) -> TextStats:
+        if self.ngram_mode == 'approximate':
+            phrase_counter: NgramCounter = TopKNgramCounter(k=self.ngram_top_k)
+        else:
+            phrase_counter = NgramCounter()
+        return TextStats(phrase_counter, track_topics=track_topics)
+    
+    def _update_stats(self, stats: TextStats, doc: TokenizedDocument) -> None:
+        """Додавання токенізованого фрагмента до накопиченої статистики"""
         # Видаляємо стоп-слова
         filtered_words = [
-            word for word in words 
+            word for word in doc.lower_tokens
             if word not in self.ukrainian_stopwords 
             and len(word) > 2
             and word.isalpha()
         ]
-        
-        # Знаходимо ключові слова
-        key_words = self._extract_keywords(filtered_words)
+        stats.word_freq.update(filtered_words)
+        stats.words_count += len(filtered_words)
         
         # Знаходимо ключові фрази
-        key_phrases = self._extract_key_phrases(sentences)
-        
-        # Визначаємо основні теми
-        main_topics = self._identify_topics(sentences, key_words)
+        self._count_key_phrases(stats.phrase_counter, doc)
         
         # Аналіз складності
-        complexity = self._analyze_complexity(cleaned_text)
+        stats.sentences_count += len(doc.sentences)
+        stats.tokens_count += len(doc.tokens)
+        stats.complex_words_count += sum(1 for w in doc.tokens if len(w) > 6)
+        stats.lower_tokens_count += len(doc.lower_tokens)
+        stats.lower_chars_count += sum(len(w) for w in doc.lower_tokens)
+        
+        if stats.track_topics:
+            self._record_topic_windows(stats.topic_windows, doc)
+    
+    def _build_result(self, stats: TextStats, cleaned_text: str,
+                      key_words: List[Dict], main_topics: List[str]) -> Dict[str, Any]:
+        """Формування результату аналізу з накопиченої статистики"""
+        readability = self._calculate_readability(stats)
         
         return {
             'cleaned_text': cleaned_text,
-            'sentences_count': len(sentences),
-            'words_count': len(filtered_words),
+            'sentences_count': stats.sentences_count,
+            'words_count': stats.words_count,
             'key_words': key_words,
-            'key_phrases': key_phrases,
+            'key_phrases': self._extract_key_phrases(stats.phrase_counter),
             'main_topics': main_topics,
-            'complexity': complexity,
-            'readability': self._calculate_readability(cleaned_text)
+            'complexity': self._analyze_complexity(stats, readability),
+            'readability': readability
         }
     
-    def _split_sentences(self, text: str) -> List[str]:
-        """Розбиття тексту на речення без NLTK"""
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if len(s.strip()) > 5]
+    def tokenize(self, cleaned_text: str) -> TokenizedDocument:
+        """Розбиття очищеного тексту на речення і токени за один прохід"""
+        sentences: List[str] = []
+        spans: List[Tuple[int, int]] = []
+        tokens: List[str] = []
+        lower_tokens: List[str] = []
+        postings: Dict[str, List[int]] = {}
+        
+        # Роздільники речень не є символами слова, тому токени сегментів
+        # разом дають ті самі токени, що й токенізація всього тексту.
+        for segment in _SENTENCE_SPLIT_RE.split(cleaned_text):
+            segment_tokens = _WORD_RE.findall(segment)
+            tokens.extend(segment_tokens)
+            
+            start = len(lower_tokens)
+            for token in segment_tokens:
+                lower = token.lower()
+                if len(lower) == len(token):
+                    lower_tokens.append(lower)
+                else:
+                    # Рідкісні символи (напр. «İ») у нижньому регістрі
+                    # розпадаються на кілька токенів
+                    lower_tokens.extend(_WORD_RE.findall(lower))
+            
+            sentence = segment.strip()
+            if len(sentence) > 5:
+                sentences.append(sentence)
+                spans.append((start, len(lower_tokens)))
+                for position in range(start, len(lower_tokens)):
+                    token = lower_tokens[position]
+                    found = postings.get(token)
+                    if found is None:
+                        postings[token] = [position]
+                    else:
+                        found.append(position)
+        
+        return TokenizedDocument(
+            cleaned_text=cleaned_text,
+            sentences=sentences,
+            tokens=tokens,
+            lower_tokens=lower_tokens,
+            sentence_spans=spans,
+            index=SentenceIndex(sentences, lower_tokens, [start for start, _ in spans], postings),
+        )
     
-    def _tokenize_words(self, text: str) -> List[str]:
-        """Токенізація слів без NLTK"""
-        words = re.findall(r'\b\w+\b', text)
-        return words
+    def index_text(self, text: str) -> SentenceIndex:
+        """Індекс речень для довільного тексту (тести, пошук фрази в тексті)"""
+        return self.tokenize(self._clean_text(text)).index
     
     def _clean_text(self, text: str) -> str:
-
+        return self._clean_fragment(text).strip()
+    
+    def _clean_fragment(self, text: str) -> str:
+        """Очищення без обрізання пробілів, щоб фрагменти можна було склеїти"""
         text = re.sub(r'[^\w\sА-Яа-яЄєІіЇїҐґ.,!?-]', ' ', text)
         
         text = re.sub(r'\s+', ' ', text)
         
         text = re.sub(r'\b\w*\d\w*\b', '', text)
         
-        return text.strip()
+        return text
     
-    def _extract_keywords(self, words: List[str]) -> List[Dict]:
+    def _extract_keywords(self, word_freq: Counter, total_words: int) -> List[Dict]:
         """Виділення ключових слів"""
-        word_freq = Counter(words)
-        
-        total_words = len(words)
         keywords = []
         
         for word, count in word_freq.most_common(20):
@@ -131,80 +480,70 @@ class TextProcessor:
         else:
             return 'нар'
     
-    def _extract_key_phrases(self, sentences: List[str]) -> List[str]:
-        """Виділення ключових фраз"""
-        phrases: List[str] = []
-        
-        for sentence in sentences:
+    def _count_key_phrases(self, phrase_counter: NgramCounter, doc: TokenizedDocument) -> None:
+        """Підрахунок кандидатів у ключові фрази по реченнях"""
+        for index in range(len(doc.sentences)):
             # Беремо тільки буквенні, змістовні слова
-            words = self._tokenize_words(sentence.lower())
-            words = [w for w in words if w.isalpha() and len(w) > 2]
+            words = [w for w in doc.sentence_tokens(index) if w.isalpha() and len(w) > 2]
             
-            # Формуємо фрази довжиною 2‑4 слова (класичні «ключові словосполучення»)
-            for n in range(2, 5):
-                for i in range(len(words) - n + 1):
-                    phrase_words = words[i:i+n]
-                    phrase = ' '.join(phrase_words)
-                    phrases.append(phrase)
-        
-        if not phrases:
-            return []
-        
-        phrase_freq = Counter(phrases)
-        
+            # Фрази довжиною 2‑4 слова (класичні «ключові словосполучення»)
+            phrase_counter.add_sequence(words)
+    
+    def _extract_key_phrases(self, phrase_counter: NgramCounter) -> List[str]:
+        """Виділення ключових фраз"""
         # Раніше брали тільки фрази, які зустрічаються >1 раз, тому для багатьох текстів
         # список ключових фраз був порожній. Тепер беремо і одноразові, але
         # віддаємо перевагу більш довгим та частим фразам.
-        ranked = sorted(
-            phrase_freq.items(),
-            key=lambda item: (item[1], len(item[0].split())),
-            reverse=True,
-        )
-        
-        unique_phrases: List[str] = []
-        seen = set()
-        for phrase, _ in ranked:
-            # Уникаємо майже однакових фраз (наприклад, з зайвим словом на кінці)
-            base = phrase
-            if base in seen:
-                continue
-            seen.add(base)
-            unique_phrases.append(phrase)
-            if len(unique_phrases) >= 15:
-                break
-        
-        return unique_phrases
+        return [phrase for phrase, _ in phrase_counter.top(15)]
     
-    def _identify_topics(self, sentences: List[str], keywords: List[Dict]) -> List[str]:
-
+    def _identify_topics(self, doc: TokenizedDocument, keywords: List[Dict]) -> List[str]:
+        """Контекст перших входжень головних ключових слів (пошук за індексом)"""
         topics = []
         
         top_keywords = [kw['word'] for kw in keywords[:5]]
         
         for keyword in top_keywords:
-            for sentence in sentences:
-                if keyword in sentence.lower():
-                    words = sentence.split()
-                    for i, word in enumerate(words):
-                        if keyword in word.lower():
-                            start = max(0, i - 2)
-                            end = min(len(words), i + 3)
-                            topic = ' '.join(words[start:end])
-                            topics.append(topic)
-                            break
-                    break
-        
-        return list(set(topics))[:5] 
-    def _analyze_complexity(self, text: str) -> Dict[str, Any]:
+            first = doc.index.first(keyword)
+            if first is not None:
+                topic = self._topic_window(doc.sentences[first[0]], keyword)
+                if topic is not None:
+                    topics.append(topic)
+        
+        # dict.fromkeys прибирає повтори, зберігаючи порядок (set давав би випадковий)
+        return list(dict.fromkeys(topics))[:5]
+    
+    def _topics_from_windows(self, windows: Dict[str, str], keywords: List[Dict]) -> List[str]:
+        """Теми з контекстів, накопичених у потоковому чи паралельному режимі"""
+        topics = [windows[kw['word']] for kw in keywords[:5] if kw['word'] in windows]
+        return list(dict.fromkeys(topics))[:5]
+    
+    def _topic_window(self, sentence: str, keyword: str) -> Optional[str]:
+        """Два слова до і після ключового слова в реченні"""
+        words = sentence.split()
+        for i, word in enumerate(words):
+            if keyword in _WORD_RE.findall(word.lower()):
+                start = max(0, i - 2)
+                end = min(len(words), i + 3)
+                return ' '.join(words[start:end])
+        return None
+    
+    def _record_topic_windows(self, windows: Dict[str, str], doc: TokenizedDocument) -> None:
+        """Запам'ятовування контексту першої появи кожного змістовного слова"""
+        for keyword, positions in doc.index.postings.items():
+            if (keyword in windows or keyword in self.ukrainian_stopwords
+                    or len(keyword) <= 2 or not keyword.isalpha()):
+                continue
+            sentence, _ = doc.index.locate(positions[0])
+            topic = self._topic_window(doc.sentences[sentence], keyword)
+            if topic is not None:
+                windows[keyword] = topic
+    
+    def _analyze_complexity(self, stats: TextStats, readability: float) -> Dict[str, Any]:
         """Аналіз складності тексту"""
-        sentences = self._split_sentences(text)
-        words = self._tokenize_words(text.lower())
+        words_count = stats.lower_tokens_count
         
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-        avg_word_length = sum(len(w) for w in words) / len(words) if words else 0
-        
-        # Розрахунок індексу читабельності
-        readability = self._calculate_readability(text)
+        avg_sentence_length = words_count / stats.sentences_count if stats.sentences_count else 0
+        avg_word_length = stats.lower_chars_count / words_count if words_count else 0
         
         return {
             'avg_sentence_length': round(avg_sentence_length, 2),
@@ -213,19 +552,15 @@ class TextProcessor:
             'level': self._get_readability_level(readability)
         }
     
-    def _calculate_readability(self, text: str) -> float:
+    def _calculate_readability(self, stats: TextStats) -> float:
         """Розрахунок читабельності (спрощена формула)"""
-        sentences = self._split_sentences(text)
-        words = self._tokenize_words(text)
-        
-        if not sentences or not words:
+        if not stats.sentences_count or not stats.tokens_count:
             return 0
         
         # Спрощена формула для української
-        avg_sentence_len = len(words) / len(sentences)
-        complex_words = [w for w in words if len(w) > 6]
+        avg_sentence_len = stats.tokens_count / stats.sentences_count
         
-        readability = 200 - avg_sentence_len - (len(complex_words) / len(words) * 100)
+        readability = 200 - avg_sentence_len - (stats.complex_words_count / stats.tokens_count * 100)
         
         return max(0, min(100, readability))
     